@@ -0,0 +1,63 @@
+import os
+import sys
+import time
+from datetime import datetime, timezone
+
+# Run from the repository root: python -m api.load_store
+sys.path.append('src')
+from api.config import settings
+from api.services.supplier_store import SupplierStore
+from api.services.ml_service import MLService
+from data.dataset_io import read_dataset, read_dataset_chunks, dataset_path
+
+LOAD_CHUNKSIZE = 50_000
+
+def load_suppliers(store, service, data_path=None, chunksize=LOAD_CHUNKSIZE):
+    # Raw suppliers are upserted and scored chunk by chunk, so the first
+    # dashboard query already finds every supplier with a score
+    data_path = data_path or dataset_path('data/raw/suppliers_data.csv')
+    loaded = 0
+    
+    for chunk in read_dataset_chunks(data_path, chunksize):
+        categorical = {col: str for col in chunk.columns if chunk[col].dtype == 'category'}
+        records = chunk.astype(categorical).to_dict(orient='records')
+        
+        store.upsert_suppliers(records)
+        
+        predictions = service.predict_batch(records)
+        store.record_predictions([
+            dict(prediction, supplier_id=record['supplier_id'])
+            for record, prediction in zip(records, predictions)
+        ])
+        
+        loaded += len(records)
+        print(f"  {loaded} suppliers loaded and scored")
+    
+    return loaded
+
+def load_features(store, features_path=None):
+    features_path = features_path or dataset_path('data/processed/supplier_rolling_features.csv')
+    if not os.path.exists(features_path):
+        print(f"No feature snapshot at {features_path}, skipped")
+        return 0
+    
+    snapshot = read_dataset(features_path)
+    as_of = datetime.fromtimestamp(os.path.getmtime(features_path), timezone.utc)
+    records = snapshot.astype({'supplier_id': str}).to_dict(orient='records')
+    return store.record_features(records, as_of)
+
+def main(database_url=settings.DATABASE_URL, model_path=settings.MODEL_PATH):
+    start = time.perf_counter()
+    
+    store = SupplierStore(database_url, settings.DATABASE_POOL_SIZE, settings.DATABASE_MAX_OVERFLOW)
+    service = MLService(model_path, settings.LABEL_ENCODER_PATH, settings.LABEL_ENCODERS_PATH)
+    
+    suppliers = load_suppliers(store, service, chunksize=int(os.environ.get('LOAD_CHUNKSIZE', LOAD_CHUNKSIZE)))
+    features = load_features(store)
+    
+    print(f"Store {database_url}: {suppliers} suppliers, {features} feature rows "
+          f"({time.perf_counter() - start:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,16 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
+import asyncio
 import logging
+import sys
+import time
 
 from api.config import settings
 from api.routes import predictions
+from api.services.inference_executor import shutdown_inference_executor
+from api.services.ml_service import warm_up_samples
+from api.services.model_watcher import start_model_watcher, stop_model_watcher
 
 logging.basicConfig(
     level=getattr(logging, settings.LOG_LEVEL),
@@ -41,9 +47,42 @@ async def root():
         "version": settings.API_VERSION,
         "status": "running",
         "docs": "/docs",
-        "health": "/api/v1/health"
+        "health": "/api/v1/health",
+        "ready": "/api/v1/ready"
     }
 
+app.state.ready = False
+app.state.warm_up_seconds = None
+app.state.warm_up_error = None
+app.state.warm_up_attempts = 0
+
+async def warm_up_model():
+    # Runs in the background so /health answers while the model loads;
+    # /ready turns 200 only once every inference worker has a warm model.
+    # A failure (e.g. artifacts not deployed yet) is retried with backoff
+    # and reported by /ready meanwhile
+    delay = settings.WARM_UP_RETRY_DELAY
+    
+    while True:
+        app.state.warm_up_attempts += 1
+        start = time.perf_counter()
+        try:
+            await asyncio.to_thread(predictions.get_ml_service_dependency)
+            executor = predictions.get_inference_executor_dependency()
+            await executor.warm_up(warm_up_samples())
+            break
+        except Exception as e:
+            app.state.warm_up_error = str(e)
+            logger.error(f"Model warm-up failed (attempt {app.state.warm_up_attempts}), retrying in {delay:g}s: {e}")
+        
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, settings.WARM_UP_RETRY_MAX_DELAY)
+    
+    app.state.warm_up_error = None
+    app.state.warm_up_seconds = time.perf_counter() - start
+    app.state.ready = True
+    logger.info(f"Model warm, ready to serve ({app.state.warm_up_seconds:.2f}s)")
+
 @app.on_event("startup")
 async def startup_event():
     logger.info("=" * 60)
@@ -52,11 +91,30 @@ async def startup_event():
     logger.info(f"Title: {settings.API_TITLE}")
     logger.info(f"Version: {settings.API_VERSION}")
     logger.info(f"Model: {settings.MODEL_PATH}")
+    logger.info(f"Inference executor: {settings.INFERENCE_EXECUTOR} ({settings.INFERENCE_WORKERS} workers)")
     logger.info(f"Docs: http://localhost:8000/docs")
     logger.info("=" * 60)
+    
+    if settings.MODEL_RELOAD_ENABLED:
+        start_model_watcher(
+            settings.MODEL_PATH,
+            settings.LABEL_ENCODER_PATH,
+            settings.LABEL_ENCODERS_PATH,
+            settings.MODEL_RELOAD_INTERVAL
+        )
+    
+    app.state.warm_up_task = asyncio.create_task(warm_up_model())
 
 @app.on_event("shutdown")
 async def shutdown_event():
+    app.state.warm_up_task.cancel()
+    stop_model_watcher()
+    shutdown_inference_executor()
+    
+    # Only loaded if a request used the store
+    store_module = sys.modules.get('api.services.supplier_store')
+    if store_module is not None:
+        store_module.close_supplier_store()
     logger.info("API SHUTDOWN")
 
 @app.exception_handler(Exception)
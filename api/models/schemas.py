@@ -1,8 +1,9 @@
-from pydantic import BaseModel, Field
-from typing import List, Dict, Optional
-from datetime import datetime
+from pydantic import BaseModel, Field, model_validator
+from typing import Any, List, Dict, Literal, Optional
+from datetime import datetime, timezone
 
 class SupplierInput(BaseModel):
+    supplier_id: Optional[str] = None
     country: str = "Maroc"
     region: str = "EMEA"
     sector: str = "automotive"
@@ -44,13 +45,155 @@ class PredictionResponse(BaseModel):
     timestamp: datetime = Field(default_factory=datetime.now)
     model_version: str
 
+class BatchPredictionInput(BaseModel):
+    suppliers: List[SupplierInput]
+
+class BatchPredictionResponse(BaseModel):
+    predictions: List[PredictionResponse]
+    total: int
+    model_version: str
+
 class HealthResponse(BaseModel):
     status: str
     api_version: str
     model_loaded: bool
     timestamp: datetime = Field(default_factory=datetime.now)
 
+class ReadinessResponse(BaseModel):
+    status: str
+    model_version: str
+    warm_up_seconds: Optional[float] = None
+    timestamp: datetime = Field(default_factory=datetime.now)
+
+class CacheStatsResponse(BaseModel):
+    enabled: bool
+    model_version: str
+    size: int = 0
+    max_size: int = 0
+    ttl_seconds: float = 0
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    hit_rate: float = 0.0
+    timestamp: datetime = Field(default_factory=datetime.now)
+
+class SupplierEvent(BaseModel):
+    supplier_id: str
+    event_type: Literal["delivery", "incident", "profile"]
+    # Offset-aware UTC: a naive local time would be read as UTC by the windows
+    timestamp: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    # delivery
+    delay_days: Optional[float] = None
+    quantity: Optional[int] = None
+    defective_units: Optional[int] = None
+    # incident
+    incident_type: Optional[Literal["supply_chain_disruption", "cybersecurity", "labor_dispute"]] = None
+    count: Optional[int] = None
+    # profile: only the SupplierInput fields that are sent are updated
+    attributes: Optional[SupplierInput] = None
+    
+    @model_validator(mode='after')
+    def check_delivery(self):
+        # A delivery without its delay would count as on time
+        if self.event_type == 'delivery' and self.delay_days is None:
+            raise ValueError("delivery events require delay_days")
+        return self
+
+class EventBatch(BaseModel):
+    events: List[SupplierEvent]
+
+class CurrentRisk(BaseModel):
+    supplier_id: str
+    country: str
+    region: str
+    sector: str
+    family: str
+    predicted_risk_level: str
+    risk_probability: Dict[str, float]
+    confidence: float
+    risk_score: float
+    on_time_delivery_rate: float
+    quality_defect_rate: float
+    model_version: str
+    updated_at: datetime
+
+class EventIngestionResponse(BaseModel):
+    accepted: int
+    rescored: int
+    suppliers: List[CurrentRisk]
+
+class CurrentRiskList(BaseModel):
+    suppliers: List[CurrentRisk]
+    total: int
+
+class SupplierRecord(BaseModel):
+    supplier_id: str
+    supplier_name: Optional[str] = None
+    country: Optional[str] = None
+    region: Optional[str] = None
+    sector: Optional[str] = None
+    family: Optional[str] = None
+    profile: Dict[str, Any]
+    risk_level: Optional[str] = None
+    risk_score: Optional[float] = None
+    confidence: Optional[float] = None
+    model_version: Optional[str] = None
+    scored_at: Optional[datetime] = None
+    updated_at: datetime
+
+class PredictionRecord(BaseModel):
+    risk_level: str
+    risk_score: float
+    confidence: float
+    risk_probability: Dict[str, float]
+    model_version: str
+    created_at: datetime
+
+class PredictionHistory(BaseModel):
+    supplier_id: str
+    predictions: List[PredictionRecord]
+    total: int
+
+class SupplierSummary(BaseModel):
+    supplier_id: str
+    supplier_name: Optional[str] = None
+    country: Optional[str] = None
+    region: Optional[str] = None
+    sector: Optional[str] = None
+    family: Optional[str] = None
+    risk_level: Optional[str] = None
+    risk_score: Optional[float] = None
+    confidence: Optional[float] = None
+    model_version: Optional[str] = None
+    scored_at: Optional[datetime] = None
+    updated_at: datetime
+
+class SupplierPage(BaseModel):
+    suppliers: List[SupplierSummary]
+    limit: int
+    next_cursor: Optional[str] = None
+
+class AggregateGroup(BaseModel):
+    key: Dict[str, Optional[str]]
+    count: int
+    avg_risk_score: Optional[float] = None
+
+class AggregateResponse(BaseModel):
+    group_by: List[str]
+    groups: List[AggregateGroup]
+    total: int
+
+class SegmentStats(BaseModel):
+    total: int
+    risk_distribution: Dict[str, int]
+
 class StatsResponse(BaseModel):
     total_suppliers: int
     risk_distribution: Dict[str, int]
-    sectors: Dict[str, int]
\ No newline at end of file
+    sectors: Dict[str, int]
+    by_sector: Dict[str, SegmentStats] = {}
+    by_country: Dict[str, SegmentStats] = {}
+    by_region: Dict[str, SegmentStats] = {}
+    by_family: Dict[str, SegmentStats] = {}
+    last_updated: Optional[datetime] = None
\ No newline at end of file
@@ -1,18 +1,41 @@
-from fastapi import APIRouter, HTTPException, Depends
-from typing import List
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
+from typing import Dict, List, Literal, Optional
+import asyncio
 import logging
 
 from api.models.schemas import (
     SupplierInput,
     PredictionResponse,
+    BatchPredictionInput,
+    BatchPredictionResponse,
     HealthResponse,
+    ReadinessResponse,
+    CacheStatsResponse,
+    EventBatch,
+    EventIngestionResponse,
+    CurrentRisk,
+    CurrentRiskList,
+    SupplierRecord,
+    SupplierSummary,
+    SupplierPage,
+    PredictionRecord,
+    PredictionHistory,
+    AggregateGroup,
+    AggregateResponse,
     StatsResponse,
     RiskDetail,
     Recommendation
 )
-from api.services.ml_service import get_ml_service, MLService
+from api.services.ml_service import get_ml_service, MLService, resolve_supplier_id
+from api.services.inference_executor import (
+    get_inference_executor,
+    InferenceExecutor,
+    ExecutorSaturatedError
+)
+from api.services.micro_batcher import get_micro_batcher, MicroBatcher, BatcherSaturatedError
+from api.services.stats_service import get_stats_service, StatsService
+from api.services.risk_state import get_risk_state, SupplierRiskState
 from api.config import settings
-import pandas as pd
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -21,9 +44,100 @@ def get_ml_service_dependency() -> MLService:
     return get_ml_service(
         settings.MODEL_PATH,
         settings.LABEL_ENCODER_PATH,
+        settings.LABEL_ENCODERS_PATH,
+        settings.PREDICTION_CACHE_SIZE,
+        settings.PREDICTION_CACHE_TTL
+    )
+
+def get_inference_executor_dependency() -> InferenceExecutor:
+    return get_inference_executor(
+        settings.INFERENCE_EXECUTOR,
+        settings.INFERENCE_WORKERS,
+        settings.INFERENCE_MAX_QUEUE,
+        settings.MODEL_PATH,
+        settings.LABEL_ENCODER_PATH,
+        settings.LABEL_ENCODERS_PATH,
+        settings.MODEL_RELOAD_INTERVAL if settings.MODEL_RELOAD_ENABLED else 0,
+        settings.PREDICTION_CACHE_SIZE,
+        settings.PREDICTION_CACHE_TTL
+    )
+
+def get_micro_batcher_dependency(
+    executor: InferenceExecutor = Depends(get_inference_executor_dependency)
+) -> Optional[MicroBatcher]:
+    if not settings.MICRO_BATCHING_ENABLED:
+        return None
+    
+    # One batch in flight per process worker. Threads share the GIL: a single
+    # batch at a time lets the next one fill up (benchmarks/micro_batching.py)
+    return get_micro_batcher(
+        executor.predict_batch,
+        settings.MICRO_BATCH_MAX_SIZE,
+        executor.max_workers if executor.kind == "process" else 1,
+        settings.MICRO_BATCH_MAX_PENDING
+    )
+
+def get_stats_service_dependency() -> StatsService:
+    return get_stats_service(
+        settings.PROCESSED_DATA_FILE,
         settings.LABEL_ENCODERS_PATH
     )
 
+def get_risk_state_dependency() -> SupplierRiskState:
+    return get_risk_state()
+
+def get_supplier_store_dependency():
+    # SQLAlchemy is imported on first use, not with the API (benchmarks/import_time.py)
+    if not settings.STORE_ENABLED:
+        raise HTTPException(status_code=503, detail="Supplier store disabled (STORE_ENABLED=false)")
+    
+    from api.services.supplier_store import get_supplier_store
+    return get_supplier_store(
+        settings.DATABASE_URL,
+        settings.DATABASE_POOL_SIZE,
+        settings.DATABASE_MAX_OVERFLOW,
+        settings.AGGREGATE_CACHE_TTL
+    )
+
+def supplier_filters(
+    country: Optional[List[str]] = Query(None),
+    region: Optional[List[str]] = Query(None),
+    sector: Optional[List[str]] = Query(None),
+    family: Optional[List[str]] = Query(None),
+    risk_level: Optional[List[str]] = Query(None),
+    min_score: Optional[float] = None,
+    max_score: Optional[float] = None
+) -> Dict:
+    # Repeat a parameter to match several values, e.g. ?risk_level=high&risk_level=critical
+    return {
+        'country': country,
+        'region': region,
+        'sector': sector,
+        'family': family,
+        'risk_level': risk_level,
+        'min_score': min_score,
+        'max_score': max_score
+    }
+
+def saturated_exception(error: Exception) -> HTTPException:
+    logger.warning(f"Rejecting request: {error}")
+    return HTTPException(status_code=429, detail=str(error), headers={"Retry-After": "1"})
+
+def build_prediction_response(supplier_dict: Dict, prediction: Dict, model_version: str) -> PredictionResponse:
+    risk_details = [RiskDetail(**detail) for detail in prediction['risk_details']]
+    recommendations = [Recommendation(**rec) for rec in prediction['recommendations']]
+    
+    return PredictionResponse(
+        supplier_id=resolve_supplier_id(supplier_dict),
+        predicted_risk_level=prediction['predicted_risk_level'],
+        risk_probability=prediction['risk_probability'],
+        confidence=prediction['confidence'],
+        risk_score=prediction['risk_score'],
+        risk_details=risk_details,
+        recommendations=recommendations,
+        model_version=model_version
+    )
+
 @router.get(
     "/health",
     response_model=HealthResponse,
@@ -37,6 +151,47 @@ async def health_check(ml_service: MLService = Depends(get_ml_service_dependency
         model_loaded=ml_service.is_loaded()
     )
 
+@router.get(
+    "/ready",
+    response_model=ReadinessResponse,
+    tags=["Health"],
+    summary="Readiness probe",
+    responses={503: {"description": "Model still loading, warming up or failing to load"}}
+)
+async def readiness_check(request: Request):
+    # /health says the process is alive, /ready that it has a warm model
+    if not getattr(request.app.state, "ready", False):
+        error = getattr(request.app.state, "warm_up_error", None)
+        if error is not None:
+            attempts = request.app.state.warm_up_attempts
+            raise HTTPException(status_code=503, detail=f"Model warm-up failed ({attempts} attempts, retrying): {error}")
+        raise HTTPException(status_code=503, detail="Model is warming up")
+    
+    ml_service = get_ml_service_dependency()
+    
+    return ReadinessResponse(
+        status="ready",
+        model_version=ml_service.get_model_version(),
+        warm_up_seconds=request.app.state.warm_up_seconds
+    )
+
+@router.get(
+    "/cache",
+    response_model=CacheStatsResponse,
+    tags=["Health"],
+    summary="Prediction cache counters"
+)
+async def cache_statistics(ml_service: MLService = Depends(get_ml_service_dependency)):
+    # Counters of this process's service; with the process executor every
+    # worker keeps its own cache
+    stats = ml_service.cache_stats()
+    
+    return CacheStatsResponse(
+        enabled=stats is not None,
+        model_version=ml_service.get_model_version(),
+        **(stats or {})
+    )
+
 @router.post(
     "/predict",
     response_model=PredictionResponse,
@@ -45,45 +200,247 @@ async def health_check(ml_service: MLService = Depends(get_ml_service_dependency
 )
 async def predict_risk(
     supplier: SupplierInput,
-    ml_service: MLService = Depends(get_ml_service_dependency)
+    ml_service: MLService = Depends(get_ml_service_dependency),
+    executor: InferenceExecutor = Depends(get_inference_executor_dependency),
+    batcher: Optional[MicroBatcher] = Depends(get_micro_batcher_dependency)
 ):
     try:
         supplier_dict = supplier.dict()
         
-        prediction = ml_service.predict(supplier_dict)
+        if batcher is not None:
+            prediction = await batcher.submit(supplier_dict)
+        else:
+            prediction = await executor.predict(supplier_dict)
         
-        risk_details = [RiskDetail(**detail) for detail in prediction['risk_details']]
-        recommendations = [Recommendation(**rec) for rec in prediction['recommendations']]
-        
-        return PredictionResponse(
-            supplier_id=f"SUP_{hash(str(supplier_dict)) % 10000:04d}",
-            predicted_risk_level=prediction['predicted_risk_level'],
-            risk_probability=prediction['risk_probability'],
-            confidence=prediction['confidence'],
-            risk_score=prediction['risk_score'],
-            risk_details=risk_details,
-            recommendations=recommendations,
-            model_version=ml_service.get_model_version()
-        )
+        # The version comes from the service that actually scored the request
+        return build_prediction_response(supplier_dict, prediction, prediction['model_version'])
         
+    except (ExecutorSaturatedError, BatcherSaturatedError) as e:
+        raise saturated_exception(e)
     except Exception as e:
         logger.error(f"Prediction error: {e}")
         raise HTTPException(status_code=500, detail=f"Prediction error: {str(e)}")
 
+@router.post(
+    "/predict/batch",
+    response_model=BatchPredictionResponse,
+    tags=["Predictions"],
+    summary="Predict risk for a batch of suppliers"
+)
+async def predict_risk_batch(
+    batch: BatchPredictionInput,
+    ml_service: MLService = Depends(get_ml_service_dependency),
+    executor: InferenceExecutor = Depends(get_inference_executor_dependency)
+):
+    if len(batch.suppliers) > settings.MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch too large: {len(batch.suppliers)} suppliers (max {settings.MAX_BATCH_SIZE})"
+        )
+    
+    try:
+        suppliers_dicts = [supplier.dict() for supplier in batch.suppliers]
+        
+        predictions = await executor.predict_batch(suppliers_dicts)
+        model_version = predictions[0]['model_version'] if predictions else ml_service.get_model_version()
+        
+        return BatchPredictionResponse(
+            predictions=[
+                build_prediction_response(supplier_dict, prediction, model_version)
+                for supplier_dict, prediction in zip(suppliers_dicts, predictions)
+            ],
+            total=len(predictions),
+            model_version=model_version
+        )
+        
+    except ExecutorSaturatedError as e:
+        raise saturated_exception(e)
+    except Exception as e:
+        logger.error(f"Batch prediction error: {e}")
+        raise HTTPException(status_code=500, detail=f"Batch prediction error: {str(e)}")
+
+@router.post(
+    "/events",
+    response_model=EventIngestionResponse,
+    tags=["Events"],
+    summary="Ingest supplier events and rescore the suppliers they touch"
+)
+async def ingest_events(
+    batch: EventBatch,
+    state: SupplierRiskState = Depends(get_risk_state_dependency),
+    executor: InferenceExecutor = Depends(get_inference_executor_dependency)
+):
+    if len(batch.events) > settings.MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Too many events: {len(batch.events)} (max {settings.MAX_BATCH_SIZE})"
+        )
+    
+    events = [
+        dict(event.dict(), attributes=event.attributes.dict(exclude_unset=True) if event.attributes else None)
+        for event in batch.events
+    ]
+    
+    store = get_supplier_store_dependency() if settings.STORE_ENABLED else None
+    
+    try:
+        # Suppliers seen for the first time start from their stored profile
+        if store is not None:
+            unknown = state.unknown([event['supplier_id'] for event in events])
+            if unknown:
+                state.seed(await asyncio.to_thread(store.get_profiles, unknown))
+        
+        # Rejected before anything is applied: a retried batch must not count
+        # its deliveries and incidents twice. There is no await between this
+        # check and predict_batch claiming its slot, so the check holds
+        if executor.is_saturated():
+            raise ExecutorSaturatedError(
+                f"Inference queue full ({executor.pending}/{executor.capacity} requests in flight)"
+            )
+        
+        supplier_ids = state.apply(events)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except ExecutorSaturatedError as e:
+        raise saturated_exception(e)
+    
+    try:
+        # Every supplier touched by the batch is scored once, in one model call
+        inputs, revisions = state.scoring_inputs(supplier_ids)
+        predictions = await executor.predict_batch(inputs)
+        rows = state.record_scores(supplier_ids, inputs, revisions, predictions)
+        
+        if store is not None:
+            await asyncio.to_thread(persist_scores, store, state.profile_rows(supplier_ids), rows)
+        
+        return EventIngestionResponse(
+            accepted=len(events),
+            rescored=len(supplier_ids),
+            suppliers=[CurrentRisk(**row) for row in rows]
+        )
+        
+    except Exception as e:
+        # The events are applied at this point: never answer with a retryable status
+        logger.error(f"Event ingestion error: {e}")
+        raise HTTPException(status_code=500, detail=f"Event ingestion error: {str(e)}")
+
+def persist_scores(store, profiles: List[Dict], rows: List[Dict]):
+    store.upsert_suppliers(profiles)
+    store.record_predictions(rows)
+
+@router.get(
+    "/risk/current",
+    response_model=CurrentRiskList,
+    tags=["Events"],
+    summary="Current risk of the suppliers fed by events"
+)
+async def current_risk(
+    risk_level: Optional[str] = None,
+    limit: int = Query(settings.SUPPLIER_PAGE_SIZE, ge=1, le=settings.SUPPLIER_PAGE_MAX),
+    state: SupplierRiskState = Depends(get_risk_state_dependency)
+):
+    # Precomputed scores: reading them never runs the model
+    rows = state.rows(risk_level)
+    return CurrentRiskList(suppliers=[CurrentRisk(**row) for row in rows[:limit]], total=len(rows))
+
+@router.get(
+    "/risk/current/{supplier_id}",
+    response_model=CurrentRisk,
+    tags=["Events"],
+    summary="Current risk of one supplier"
+)
+async def current_supplier_risk(supplier_id: str, state: SupplierRiskState = Depends(get_risk_state_dependency)):
+    row = state.get(supplier_id)
+    if row is None:
+        raise HTTPException(status_code=404, detail=f"No events received for supplier {supplier_id}")
+    return CurrentRisk(**row)
+
+@router.get(
+    "/suppliers",
+    response_model=SupplierPage,
+    tags=["Suppliers"],
+    summary="Filtered, sorted page of stored suppliers"
+)
+async def list_suppliers(
+    sort: str = "supplier_id",
+    order: Literal["asc", "desc"] = "asc",
+    limit: int = Query(settings.SUPPLIER_PAGE_SIZE, ge=1, le=settings.SUPPLIER_PAGE_MAX),
+    cursor: Optional[str] = None,
+    filters: Dict = Depends(supplier_filters),
+    store=Depends(get_supplier_store_dependency)
+):
+    # Pass next_cursor back as cursor, with the same sort and order, for the next page
+    try:
+        rows, next_cursor = await asyncio.to_thread(store.list_suppliers, filters, sort, order == "desc", limit, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return SupplierPage(
+        suppliers=[SupplierSummary(**row) for row in rows],
+        limit=limit,
+        next_cursor=next_cursor
+    )
+
+@router.get(
+    "/aggregates",
+    response_model=AggregateResponse,
+    tags=["Suppliers"],
+    summary="Supplier counts per segment and risk level, computed server-side"
+)
+async def supplier_aggregates(
+    group_by: List[str] = Query(["risk_level"]),
+    filters: Dict = Depends(supplier_filters),
+    store=Depends(get_supplier_store_dependency)
+):
+    try:
+        groups = await asyncio.to_thread(store.aggregate, group_by, filters)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return AggregateResponse(
+        group_by=group_by,
+        groups=[AggregateGroup(**group) for group in groups],
+        total=sum(group['count'] for group in groups)
+    )
+
+@router.get(
+    "/suppliers/{supplier_id}",
+    response_model=SupplierRecord,
+    tags=["Suppliers"],
+    summary="Stored supplier profile and latest score"
+)
+async def get_supplier(supplier_id: str, store=Depends(get_supplier_store_dependency)):
+    row = await asyncio.to_thread(store.get_supplier, supplier_id)
+    if row is None:
+        raise HTTPException(status_code=404, detail=f"Unknown supplier {supplier_id}")
+    return SupplierRecord(**row)
+
+@router.get(
+    "/suppliers/{supplier_id}/predictions",
+    response_model=PredictionHistory,
+    tags=["Suppliers"],
+    summary="Prediction history of a supplier, newest first"
+)
+async def get_supplier_predictions(
+    supplier_id: str,
+    limit: int = Query(settings.SUPPLIER_PAGE_SIZE, ge=1, le=settings.SUPPLIER_PAGE_MAX),
+    store=Depends(get_supplier_store_dependency)
+):
+    rows = await asyncio.to_thread(store.prediction_history, supplier_id, limit)
+    return PredictionHistory(
+        supplier_id=supplier_id,
+        predictions=[PredictionRecord(**row) for row in rows],
+        total=len(rows)
+    )
+
 @router.get(
     "/stats",
     response_model=StatsResponse,
     tags=["Statistics"],
     summary="Get dataset statistics"
 )
-async def get_statistics():
+async def get_statistics(stats_service: StatsService = Depends(get_stats_service_dependency)):
     try:
-        df = pd.read_csv('data/processed/suppliers_processed.csv')
-        
-        return StatsResponse(
-            total_suppliers=len(df),
-            risk_distribution=df['risk_level'].value_counts().to_dict(),
-            sectors={}
-        )
+        return StatsResponse(**stats_service.get_stats())
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
@@ -0,0 +1,126 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, List
+import logging
+
+from api.services.ml_service import get_ml_service
+from api.services.model_watcher import start_model_watcher
+
+logger = logging.getLogger(__name__)
+
+EXECUTOR_KINDS = ("thread", "process", "none")
+
+class ExecutorSaturatedError(Exception):
+    pass
+
+# Per-worker service: threads share the process singleton, each process loads its own.
+# It is looked up on every call so hot-reloaded models are picked up
+_worker_paths = None
+
+def _init_worker(model_path: str, label_encoder_path: str, label_encoders_path: str, reload_interval: float,
+                 cache_size: int, cache_ttl: float):
+    global _worker_paths
+    _worker_paths = (model_path, label_encoder_path, label_encoders_path)
+    get_ml_service(*_worker_paths, cache_size, cache_ttl)
+    
+    if reload_interval > 0:
+        start_model_watcher(*_worker_paths, reload_interval)
+
+def _worker_predict(supplier_data: Dict) -> Dict:
+    return get_ml_service(*_worker_paths).predict(supplier_data)
+
+def _worker_predict_batch(suppliers_data: List[Dict]) -> List[Dict]:
+    return get_ml_service(*_worker_paths).predict_batch(suppliers_data)
+
+def _worker_warm_up(samples: List[Dict]):
+    get_ml_service(*_worker_paths).warm_up(samples)
+
+class InferenceExecutor:
+    
+    def __init__(self, kind: str, max_workers: int, max_queue_depth: int,
+                 model_path: str, label_encoder_path: str, label_encoders_path: str,
+                 reload_interval: float = 0, cache_size: int = 0, cache_ttl: float = 0):
+        if kind not in EXECUTOR_KINDS:
+            raise ValueError(f"Unknown inference executor '{kind}', expected one of {EXECUTOR_KINDS}")
+        
+        self.kind = kind
+        self.max_workers = max_workers
+        self.capacity = max_workers + max_queue_depth
+        self.pending = 0
+        
+        initargs = (model_path, label_encoder_path, label_encoders_path, reload_interval, cache_size, cache_ttl)
+        
+        if kind == "process":
+            self._executor = ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=initargs)
+        elif kind == "thread":
+            self._executor = ThreadPoolExecutor(
+                max_workers=max_workers,
+                thread_name_prefix="inference",
+                initializer=_init_worker,
+                initargs=initargs
+            )
+        else:
+            self._executor = None
+            _init_worker(*initargs)
+        
+        logger.info(f"Inference executor: {kind} (workers={max_workers}, capacity={self.capacity})")
+    
+    def is_saturated(self) -> bool:
+        return self.pending >= self.capacity
+    
+    async def _submit(self, fn, *args):
+        # Without a dedicated pool (kind "none") calls go to the event loop's
+        # default thread pool: inference never runs on the loop itself.
+        # pending is only touched from the event loop thread, no lock needed
+        if self.is_saturated():
+            raise ExecutorSaturatedError(f"Inference queue full ({self.pending}/{self.capacity} requests in flight)")
+        
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, fn, *args)
+        finally:
+            self.pending -= 1
+    
+    async def predict(self, supplier_data: Dict) -> Dict:
+        return await self._submit(_worker_predict, supplier_data)
+    
+    async def predict_batch(self, suppliers_data: List[Dict]) -> List[Dict]:
+        return await self._submit(_worker_predict_batch, suppliers_data)
+    
+    async def warm_up(self, samples: List[Dict]):
+        # One task per worker starts every thread/process and warms its model;
+        # kind "none" warms the process service on the default thread pool
+        loop = asyncio.get_running_loop()
+        n_tasks = self.max_workers if self._executor is not None else 1
+        await asyncio.gather(*(
+            loop.run_in_executor(self._executor, _worker_warm_up, samples)
+            for _ in range(n_tasks)
+        ))
+    
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+_inference_executor_instance = None
+
+def get_inference_executor(kind: str, max_workers: int, max_queue_depth: int,
+                           model_path: str, label_encoder_path: str, label_encoders_path: str,
+                           reload_interval: float = 0, cache_size: int = 0, cache_ttl: float = 0) -> InferenceExecutor:
+    global _inference_executor_instance
+    
+    if _inference_executor_instance is None:
+        _inference_executor_instance = InferenceExecutor(
+            kind, max_workers, max_queue_depth,
+            model_path, label_encoder_path, label_encoders_path,
+            reload_interval, cache_size, cache_ttl
+        )
+    
+    return _inference_executor_instance
+
+def shutdown_inference_executor():
+    global _inference_executor_instance
+    
+    if _inference_executor_instance is not None:
+        _inference_executor_instance.shutdown()
+        _inference_executor_instance = None
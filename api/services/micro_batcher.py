@@ -0,0 +1,103 @@
+import asyncio
+from typing import Any, Awaitable, Callable, List
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Errors a single bad input can cause (e.g. an unknown category). Anything
+# else (full queue, broken pool) concerns the whole batch
+ITEM_ERRORS = (ValueError, KeyError, TypeError)
+
+class BatcherSaturatedError(Exception):
+    pass
+
+class MicroBatcher:
+    # Requests are dispatched as soon as one of max_in_flight batch slots (the
+    # inference workers) is free, so an idle API adds no wait. While every slot
+    # is busy, arriving requests queue up and leave together, up to
+    # max_batch_size per batch, when the next slot frees up.
+    # At most max_pending requests wait; beyond that submit() rejects
+    
+    def __init__(self, batch_fn: Callable[[List[Any]], Awaitable[List[Any]]],
+                 max_batch_size: int = 64, max_in_flight: int = 4, max_pending: int = 256):
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.max_in_flight = max_in_flight
+        self.max_pending = max_pending
+        
+        self._pending = []
+        self._in_flight = 0
+        self._tasks = set()
+        
+        self.batches = 0
+        self.items = 0
+    
+    async def submit(self, item: Any) -> Any:
+        # Only touched from the event loop thread, no lock needed
+        if len(self._pending) >= self.max_pending:
+            raise BatcherSaturatedError(f"Micro-batch queue full ({len(self._pending)} requests waiting)")
+        
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((item, future))
+        self._dispatch()
+        
+        return await future
+    
+    def average_batch_size(self) -> float:
+        return self.items / self.batches if self.batches else 0.0
+    
+    def _dispatch(self):
+        while self._pending and self._in_flight < self.max_in_flight:
+            batch = self._pending[:self.max_batch_size]
+            self._pending = self._pending[self.max_batch_size:]
+            
+            self._in_flight += 1
+            task = asyncio.ensure_future(self._run_slot(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+    
+    async def _run_slot(self, batch):
+        try:
+            await self._run(batch)
+        finally:
+            self._in_flight -= 1
+            self._dispatch()
+    
+    async def _run(self, batch):
+        self.batches += 1
+        self.items += len(batch)
+        
+        items = [item for item, _ in batch]
+        
+        try:
+            results = await self.batch_fn(items)
+        except Exception as e:
+            if len(batch) == 1 or not isinstance(e, ITEM_ERRORS):
+                # Retrying item by item would only multiply the submissions
+                for _, future in batch:
+                    self._set_exception(future, e)
+                return
+            
+            # One bad item must not fail its neighbours: retry them one by one
+            logger.warning(f"Micro-batch of {len(batch)} failed ({e}), retrying items individually")
+            await asyncio.gather(*[self._run([entry]) for entry in batch])
+            return
+        
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+    
+    def _set_exception(self, future, error: Exception):
+        if not future.done():
+            future.set_exception(error)
+
+_micro_batcher_instance = None
+
+def get_micro_batcher(batch_fn: Callable[[List[Any]], Awaitable[List[Any]]],
+                      max_batch_size: int, max_in_flight: int, max_pending: int) -> MicroBatcher:
+    global _micro_batcher_instance
+    
+    if _micro_batcher_instance is None:
+        _micro_batcher_instance = MicroBatcher(batch_fn, max_batch_size, max_in_flight, max_pending)
+    
+    return _micro_batcher_instance
@@ -1,93 +1,275 @@
-import joblib
-import pandas as pd
+import hashlib
 import numpy as np
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 import logging
 import sys
+import threading
+import warnings
 
+# pandas, joblib and the training code are imported only by the paths that need
+# them: serving a compiled model never loads them (see benchmarks/import_time.py)
 sys.path.append('src')
-from features.feature_engineering import FeatureEngineer
+from features.feature_plan import FeaturePlan
+from models.compiled_model import CompiledModel
+from api.services.prediction_cache import PredictionCache, payload_key, canonical_payload
+from api.models.schemas import SupplierInput
 
 logger = logging.getLogger(__name__)
 
+# Sectors drive different certification branches, warm both
+WARM_UP_SECTORS = ("automotive", "aeronautic")
+
+def predict_with_proba(model, X, n_classes: int):
+    # One pass over the model: the label is the argmax of the probabilities
+    if hasattr(model, 'predict_proba'):
+        probabilities = model.predict_proba(X)
+        predictions = model.classes_[probabilities.argmax(axis=1)]
+        return predictions, probabilities
+    
+    # Models without predict_proba: one-hot probabilities from the hard labels
+    predictions = np.asarray(model.predict(X))
+    probabilities = np.zeros((len(predictions), n_classes))
+    probabilities[np.arange(len(predictions)), predictions] = 1.0
+    return predictions, probabilities
+
+def warm_up_samples() -> List[Dict]:
+    # Synthetic suppliers built from the request schema defaults
+    return [SupplierInput(sector=sector).dict() for sector in WARM_UP_SECTORS]
+
+def resolve_supplier_id(supplier_data: Dict) -> str:
+    # The caller's ID when given, otherwise a 64-bit BLAKE2 digest of the profile:
+    # identical in every worker and across restarts, unlike hash()
+    if supplier_data.get('supplier_id'):
+        return str(supplier_data['supplier_id'])
+    
+    digest = hashlib.blake2b(canonical_payload(supplier_data).encode(), digest_size=8)
+    return f"SUP_{digest.hexdigest()}"
+
+def artifact_signature(files: List[Path]) -> Tuple:
+    stats = [path.stat() for path in files]
+    return tuple((str(path), stat.st_mtime_ns, stat.st_size) for path, stat in zip(files, stats))
+
+def artifact_hash(files: List[Path]) -> str:
+    digest = hashlib.sha256()
+    for path in files:
+        digest.update(path.name.encode())
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+    return digest.hexdigest()[:12]
+
 class MLService:
     
-    def __init__(self, model_path: str, label_encoder_path: str, label_encoders_path: str):
+    def __init__(self, model_path: str, label_encoder_path: str, label_encoders_path: str,
+                 cache_size: int = 0, cache_ttl: float = 0):
         self.model_path = Path(model_path)
         self.label_encoder_path = Path(label_encoder_path)
         self.label_encoders_path = Path(label_encoders_path)
         
+        # Each service caches only its own model's predictions: a reloaded
+        # model starts with an empty cache
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+        self.cache = PredictionCache(cache_size, cache_ttl) if cache_size > 0 else None
+        
         self.model = None
         self.label_encoder = None
+        self.classes = None
         self.feature_engineer = None
+        self.feature_plan = None
+        self.fitted_with_names = False
+        
+        # The version is the hash of the artifacts this service was built from
+        files = self.artifact_files()
+        self.signature = artifact_signature(files)
+        self.version = artifact_hash(files)
         
         self._load_model()
     
+    def artifact_files(self) -> List[Path]:
+        if self.model_path.is_dir():
+            return sorted(
+                path for path in self.model_path.iterdir()
+                if path.is_file() and not path.name.endswith('.tmp')
+            )
+        
+        return [self.model_path, self.label_encoder_path, self.label_encoders_path]
+    
     def _load_model(self):
         try:
-            self.model = joblib.load(self.model_path)
-            logger.info(f"Model loaded from {self.model_path}")
-            
-            self.label_encoder = joblib.load(self.label_encoder_path)
-            logger.info(f"Label encoder loaded from {self.label_encoder_path}")
-            
-            self.feature_engineer = FeatureEngineer()
-            label_encoders = joblib.load(self.label_encoders_path)
-            self.feature_engineer.label_encoders = label_encoders
-            logger.info(f"Feature engineer loaded")
+            # A directory is a compiled export (src/models/export_model.py), a file a pickle
+            if self.model_path.is_dir():
+                self._load_compiled_model()
+            else:
+                self._load_pickled_model()
             
         except Exception as e:
             logger.error(f"Error loading model: {e}")
             raise
     
+    def _load_compiled_model(self):
+        # Model, feature plan and label classes all come from the export:
+        # no pickles and no sklearn/xgboost import on this path
+        self.model = CompiledModel.load(self.model_path)
+        self.classes = self.model.risk_classes
+        logger.info(f"Compiled {self.model.manifest['model_type']} loaded from {self.model_path}")
+        
+        self.feature_plan = FeaturePlan(self.model.feature_columns, self.model.categories)
+        logger.info(f"Feature plan loaded ({self.feature_plan.n_features} features)")
+    
+    def _load_pickled_model(self):
+        import joblib
+        from features.feature_engineering import FeatureEngineer
+        
+        self.model = joblib.load(self.model_path)
+        logger.info(f"Model loaded from {self.model_path}")
+        
+        self.label_encoder = joblib.load(self.label_encoder_path)
+        self.classes = self.label_encoder.classes_
+        logger.info(f"Label encoder loaded from {self.label_encoder_path}")
+        
+        self.feature_engineer = FeatureEngineer()
+        label_encoders = joblib.load(self.label_encoders_path)
+        self.feature_engineer.label_encoders = label_encoders
+        logger.info(f"Feature engineer loaded")
+        
+        # Datasets read from partitioned Parquet may order columns differently
+        # than the serving pipeline, so follow the model's training columns
+        self.feature_plan = FeaturePlan.from_feature_engineer(
+            self.feature_engineer,
+            self._prepare_input({}),
+            getattr(self.model, 'feature_names_in_', None)
+        )
+        logger.info(f"Feature plan compiled ({self.feature_plan.n_features} features)")
+        
+        # sklearn estimators fitted on a DataFrame warn on every array they score;
+        # the plan already follows their training column order (it fails on a
+        # mismatch). XGBoost derives the attribute from its booster and accepts arrays
+        self.fitted_with_names = 'feature_names_in_' in vars(self.model)
+    
     def is_loaded(self) -> bool:
-        return self.model is not None and self.label_encoder is not None
+        return self.model is not None and self.classes is not None
     
     def get_model_version(self) -> str:
-        return "v1.0"
+        return self.version
+    
+    def cache_stats(self) -> Optional[Dict]:
+        return self.cache.stats() if self.cache is not None else None
+    
+    def warm_up(self, samples: List[Dict] = None):
+        # First calls pay for lazy imports, cold tree pages and allocator growth,
+        # do them before serving (bypassing the cache, which must stay empty)
+        samples = samples or warm_up_samples()
+        for sample in samples:
+            self._predict_one(sample)
+        self._predict_many(samples)
     
     def predict(self, supplier_data: Dict) -> Dict:
         if not self.is_loaded():
             raise ValueError("Model not loaded")
         
+        if self.cache is None:
+            return self._predict_one(supplier_data)
+        
+        key = payload_key(supplier_data, self.version)
+        prediction = self.cache.get(key)
+        if prediction is None:
+            prediction = self._predict_one(supplier_data)
+            self.cache.put(key, prediction)
+        
+        return prediction
+    
+    def predict_batch(self, suppliers_data: List[Dict]) -> List[Dict]:
+        if not self.is_loaded():
+            raise ValueError("Model not loaded")
+        
+        if not suppliers_data:
+            return []
+        
+        if self.cache is None:
+            return self._predict_many(suppliers_data)
+        
+        # Only suppliers not seen recently go through the model
+        keys = [payload_key(supplier_data, self.version) for supplier_data in suppliers_data]
+        predictions = [self.cache.get(key) for key in keys]
+        missing = [i for i, prediction in enumerate(predictions) if prediction is None]
+        
+        if missing:
+            computed = self._predict_many([suppliers_data[i] for i in missing])
+            for i, prediction in zip(missing, computed):
+                predictions[i] = prediction
+                self.cache.put(keys[i], prediction)
+        
+        return predictions
+    
+    def _score(self, X: np.ndarray):
+        if not self.fitted_with_names:
+            return predict_with_proba(self.model, X, len(self.classes))
+        
+        # Only this call ignores the feature-name warning, and only that one
+        with warnings.catch_warnings():
+            warnings.filterwarnings("ignore", message="X does not have valid feature names", category=UserWarning)
+            return predict_with_proba(self.model, X, len(self.classes))
+    
+    def _predict_one(self, supplier_data: Dict) -> Dict:
         try:
-            input_data = self._prepare_input(supplier_data)
-            df = pd.DataFrame([input_data])
+            X = self.feature_plan.transform(self._prepare_input(supplier_data))
             
-            df = self.feature_engineer.create_features(df)
-            df = self.feature_engineer.encode_categorical(df)
-            X, _ = self.feature_engineer.prepare_for_ml(df)
+            predictions, probabilities = self._score(X)
             
-            prediction = self.model.predict(X)[0]
-            probabilities = self.model.predict_proba(X)[0]
+            risk_level = self.classes[predictions[0]]
             
-            risk_level = self.label_encoder.inverse_transform([prediction])[0]
+            return self._build_prediction(supplier_data, risk_level, probabilities[0])
             
-            risk_probs = {
-                label: float(prob) 
-                for label, prob in zip(self.label_encoder.classes_, probabilities)
-            }
+        except Exception as e:
+            logger.error(f"Prediction error: {e}")
+            raise
+    
+    def _predict_many(self, suppliers_data: List[Dict]) -> List[Dict]:
+        try:
+            inputs = [self._prepare_input(supplier_data) for supplier_data in suppliers_data]
             
-            confidence = float(probabilities[prediction])
-            risk_score = float(max(probabilities) * 10)
+            # The plan's column-wise batch path beats the pandas pipeline at every
+            # size up to MAX_BATCH_SIZE (benchmarks/feature_latency.py)
+            X = self.feature_plan.transform_many(inputs)
             
-            risk_details = self._calculate_risk_details(supplier_data)
-            recommendations = self._generate_recommendations(risk_level, supplier_data)
+            predictions, probabilities = self._score(X)
             
-            return {
-                'predicted_risk_level': risk_level,
-                'risk_probability': risk_probs,
-                'confidence': confidence,
-                'risk_score': risk_score,
-                'risk_details': risk_details,
-                'recommendations': recommendations
-            }
+            risk_levels = self.classes[predictions]
+            
+            return [
+                self._build_prediction(supplier_data, risk_level, row_probabilities)
+                for supplier_data, risk_level, row_probabilities
+                in zip(suppliers_data, risk_levels, probabilities)
+            ]
             
         except Exception as e:
             logger.error(f"Prediction error: {e}")
             raise
     
+    def _build_prediction(self, supplier_data: Dict, risk_level: str, probabilities: np.ndarray) -> Dict:
+        risk_probs = {
+            label: float(prob) 
+            for label, prob in zip(self.classes, probabilities)
+        }
+        
+        confidence = float(probabilities.max())
+        risk_score = confidence * 10
+        
+        risk_details = self._calculate_risk_details(supplier_data)
+        recommendations = self._generate_recommendations(risk_level, supplier_data)
+        
+        return {
+            'predicted_risk_level': risk_level,
+            'risk_probability': risk_probs,
+            'confidence': confidence,
+            'risk_score': risk_score,
+            'risk_details': risk_details,
+            'recommendations': recommendations,
+            'model_version': self.version
+        }
+    
     def _prepare_input(self, supplier_data: Dict) -> Dict:
         return {
             'country': supplier_data.get('country', 'Maroc'),
@@ -104,15 +286,15 @@ class MLService:
             'liquidity_ratio': supplier_data.get('liquidity_ratio', 1.8),
             'payment_delay_days': 5,
             'financial_health_score': supplier_data.get('financial_health_score', 7.2),
-            'otd_3m': supplier_data.get('on_time_delivery_rate', 92.5),
-            'avg_delay_days_3m': 2.0,
-            'delay_volatility_3m': 1.0,
-            'otd_6m': supplier_data.get('on_time_delivery_rate', 92.5),
-            'avg_delay_days_6m': 2.0,
+            'otd_3m': supplier_data.get('otd_3m', supplier_data.get('on_time_delivery_rate', 92.5)),
+            'avg_delay_days_3m': supplier_data.get('avg_delay_days_3m', 2.0),
+            'delay_volatility_3m': supplier_data.get('delay_volatility_3m', 1.0),
+            'otd_6m': supplier_data.get('otd_6m', supplier_data.get('on_time_delivery_rate', 92.5)),
+            'avg_delay_days_6m': supplier_data.get('avg_delay_days_6m', 2.0),
             'on_time_delivery_rate': supplier_data.get('on_time_delivery_rate', 92.5),
             'lead_time_days': supplier_data.get('lead_time_days', 25),
-            'ppm_3m': 100,
-            'defect_rate_3m': supplier_data.get('quality_defect_rate', 1.5),
+            'ppm_3m': supplier_data.get('ppm_3m', 100),
+            'defect_rate_3m': supplier_data.get('defect_rate_3m', supplier_data.get('quality_defect_rate', 1.5)),
             'quality_defect_rate': supplier_data.get('quality_defect_rate', 1.5),
             'cpk_latest': 1.3,
             'recurring_8d': 0,
@@ -229,11 +411,27 @@ class MLService:
         return recommendations
 
 _ml_service_instance = None
+_ml_service_lock = threading.Lock()
 
-def get_ml_service(model_path: str, label_encoder_path: str, label_encoders_path: str) -> MLService:
+def get_ml_service(model_path: str, label_encoder_path: str, label_encoders_path: str,
+                   cache_size: int = 0, cache_ttl: float = 0) -> MLService:
     global _ml_service_instance
     
     if _ml_service_instance is None:
-        _ml_service_instance = MLService(model_path, label_encoder_path, label_encoders_path)
+        with _ml_service_lock:
+            if _ml_service_instance is None:
+                _ml_service_instance = MLService(
+                    model_path, label_encoder_path, label_encoders_path, cache_size, cache_ttl
+                )
+    
+    return _ml_service_instance
+
+def swap_ml_service(service: MLService) -> MLService:
+    # Requests keep the service they started with, so in-flight work finishes on
+    # the previous model while new requests get the new one
+    global _ml_service_instance
+    
+    with _ml_service_lock:
+        previous, _ml_service_instance = _ml_service_instance, service
     
-    return _ml_service_instance
\ No newline at end of file
+    return previous
\ No newline at end of file
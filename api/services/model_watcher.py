@@ -0,0 +1,89 @@
+from typing import Optional
+import logging
+import os
+import threading
+
+from api.services.ml_service import MLService, get_ml_service, swap_ml_service, artifact_signature, artifact_hash
+
+logger = logging.getLogger(__name__)
+
+class ModelWatcher:
+    # Polls the model artifacts; a changed hash is loaded and warmed up on this
+    # thread, then swapped in while requests keep being served by the old model
+    
+    def __init__(self, model_path: str, label_encoder_path: str, label_encoders_path: str, interval: float):
+        self.paths = (model_path, label_encoder_path, label_encoders_path)
+        self.interval = interval
+        self.pid = os.getpid()
+        
+        self._pending = None
+        self._failed = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="model-watcher", daemon=True)
+    
+    def start(self):
+        self._thread.start()
+        logger.info(f"Watching {self.paths[0]} for new models every {self.interval}s")
+    
+    def stop(self):
+        self._stop.set()
+    
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.check()
+            except Exception as e:
+                logger.error(f"Model watcher error: {e}")
+    
+    def check(self) -> Optional[MLService]:
+        current = get_ml_service(*self.paths)
+        files = current.artifact_files()
+        signature = artifact_signature(files)
+        
+        if signature in (current.signature, self._failed):
+            return None
+        
+        # Artifacts are written in several steps: wait until they stop changing
+        if signature != self._pending:
+            self._pending = signature
+            return None
+        
+        if artifact_hash(files) == current.version:
+            current.signature = signature
+            return None
+        
+        try:
+            service = MLService(*self.paths, current.cache_size, current.cache_ttl)
+            service.warm_up()
+        except Exception as e:
+            self._failed = signature
+            logger.error(f"New model artifacts could not be loaded, keeping {current.version}: {e}")
+            return None
+        
+        swap_ml_service(service)
+        logger.info(f"Model reloaded: {current.version} -> {service.version}")
+        return service
+
+_model_watcher_instance = None
+_model_watcher_lock = threading.Lock()
+
+def start_model_watcher(model_path: str, label_encoder_path: str, label_encoders_path: str,
+                        interval: float) -> ModelWatcher:
+    global _model_watcher_instance
+    
+    # One watcher per process: API process and each process-pool worker.
+    # Forked workers inherit the parent's instance but not its thread
+    with _model_watcher_lock:
+        if _model_watcher_instance is None or _model_watcher_instance.pid != os.getpid():
+            _model_watcher_instance = ModelWatcher(model_path, label_encoder_path, label_encoders_path, interval)
+            _model_watcher_instance.start()
+    
+    return _model_watcher_instance
+
+def stop_model_watcher():
+    global _model_watcher_instance
+    
+    with _model_watcher_lock:
+        if _model_watcher_instance is not None:
+            _model_watcher_instance.stop()
+            _model_watcher_instance = None
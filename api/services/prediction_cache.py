@@ -0,0 +1,84 @@
+from collections import OrderedDict
+from typing import Dict, Optional
+import hashlib
+import json
+import threading
+import time
+
+def canonical_payload(supplier_data: Dict) -> str:
+    # Same supplier profile, same string: field order and 15 vs 15.0 do not
+    # matter, and the caller's supplier_id is not part of the profile
+    canonical = {
+        name: float(value) if isinstance(value, (int, float)) and not isinstance(value, bool) else value
+        for name, value in supplier_data.items()
+        if name != 'supplier_id'
+    }
+    return json.dumps(canonical, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+
+def payload_key(supplier_data: Dict, model_version: str) -> str:
+    payload = canonical_payload(supplier_data)
+    return hashlib.blake2b(f"{model_version}:{payload}".encode(), digest_size=16).hexdigest()
+
+class PredictionCache:
+    # Bounded LRU of finished predictions, with an optional time-to-live.
+    # Values are shared between callers and must not be modified
+    
+    def __init__(self, max_size: int, ttl: float = 0):
+        self.max_size = max_size
+        self.ttl = ttl
+        
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            entry = self._entries.get(key)
+            
+            if entry is None:
+                self.misses += 1
+                return None
+            
+            value, expires_at = entry
+            if expires_at is not None and time.monotonic() >= expires_at:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+    
+    def put(self, key: str, value: Dict):
+        expires_at = time.monotonic() + self.ttl if self.ttl > 0 else None
+        
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+    
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'ttl_seconds': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
@@ -0,0 +1,177 @@
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+import logging
+import sys
+import threading
+
+sys.path.append('src')
+from features.rolling_features import RollingFeatureEngine, defect_rate_from_ppm
+from api.models.schemas import SupplierInput
+
+logger = logging.getLogger(__name__)
+
+# Incident events increment these SupplierInput counters
+INCIDENT_FIELDS = {
+    'supply_chain_disruption': 'supply_chain_disruption_history',
+    'cybersecurity': 'cybersecurity_incidents',
+    'labor_dispute': 'labor_disputes'
+}
+
+PROFILE_FIELDS = set(SupplierInput.__fields__) - {'supplier_id'}
+
+# Deliveries a rolling window needs before its figures replace the profile's:
+# a single late delivery would otherwise set the on-time rate to 0
+ROLLING_MIN_EVENTS = 10
+
+class SupplierRiskState:
+    # In-memory state fed by supplier events: the latest profile of every
+    # supplier, its rolling delivery windows and its current risk score.
+    # Only suppliers touched by new events are rescored
+    
+    def __init__(self, min_events: int = ROLLING_MIN_EVENTS):
+        self.min_events = min_events
+        self.profiles: Dict[str, Dict] = {}
+        self.rolling = RollingFeatureEngine()
+        self.current: Dict[str, Dict] = {}
+        self.revisions: Dict[str, int] = {}
+        self.events = 0
+        
+        self._lock = threading.Lock()
+    
+    def apply(self, events: List[Dict]) -> List[str]:
+        # Updates the state and returns the suppliers to rescore, each once
+        affected = {}
+        
+        for event in events:
+            if event['event_type'] == 'incident' and event.get('incident_type') not in INCIDENT_FIELDS:
+                raise ValueError(f"Incident event for {event['supplier_id']} needs an incident_type in {list(INCIDENT_FIELDS)}")
+        
+        with self._lock:
+            for event in events:
+                supplier_id = event['supplier_id']
+                profile = self.profiles.setdefault(supplier_id, SupplierInput(supplier_id=supplier_id).dict())
+                
+                if event['event_type'] == 'delivery':
+                    self.rolling.update(
+                        supplier_id,
+                        self._naive_utc(event['timestamp']),
+                        event['delay_days'],
+                        event.get('quantity') or 0,
+                        event.get('defective_units') or 0
+                    )
+                elif event['event_type'] == 'incident':
+                    field = INCIDENT_FIELDS[event['incident_type']]
+                    profile[field] += event.get('count') or 1
+                elif event['event_type'] == 'profile':
+                    profile.update({k: v for k, v in (event.get('attributes') or {}).items() if k in PROFILE_FIELDS})
+                
+                self.revisions[supplier_id] = self.revisions.get(supplier_id, 0) + 1
+                affected[supplier_id] = None
+                self.events += 1
+        
+        return list(affected)
+    
+    def unknown(self, supplier_ids: List[str]) -> List[str]:
+        return [supplier_id for supplier_id in dict.fromkeys(supplier_ids) if supplier_id not in self.profiles]
+    
+    def seed(self, profiles: Dict[str, Dict]):
+        # Stored profiles of suppliers seen for the first time; events apply on top
+        with self._lock:
+            for supplier_id, profile in profiles.items():
+                self.profiles.setdefault(supplier_id, dict(profile, supplier_id=supplier_id))
+    
+    def profile_rows(self, supplier_ids: List[str]) -> List[Dict]:
+        with self._lock:
+            return [dict(self.profiles[supplier_id]) for supplier_id in supplier_ids]
+    
+    @staticmethod
+    def _naive_utc(timestamp: datetime) -> datetime:
+        # Windows compare timestamps: mixing offset-aware and naive ones would fail
+        if timestamp.tzinfo is not None:
+            return timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+        return timestamp
+    
+    def scoring_inputs(self, supplier_ids: List[str]) -> Tuple[List[Dict], List[int]]:
+        with self._lock:
+            inputs = [self._scoring_input(supplier_id) for supplier_id in supplier_ids]
+            revisions = [self.revisions[supplier_id] for supplier_id in supplier_ids]
+        return inputs, revisions
+    
+    def _scoring_input(self, supplier_id: str) -> Dict:
+        supplier_data = dict(self.profiles[supplier_id])
+        
+        # Rolling windows with enough deliveries replace the snapshot delivery and
+        # quality figures; the 3-month window also stands for the current rates
+        features = self.rolling.features(supplier_id)
+        if features is None:
+            return supplier_data
+        
+        for window, count in self.rolling.event_counts(supplier_id).items():
+            if count < self.min_events:
+                continue
+            
+            suffix = f"_{window}"
+            supplier_data.update({name: value for name, value in features.items() if name.endswith(suffix)})
+            
+            if window == '3m':
+                defect_rate = defect_rate_from_ppm(features['ppm_3m'])
+                supplier_data['on_time_delivery_rate'] = features['otd_3m']
+                supplier_data['defect_rate_3m'] = defect_rate
+                supplier_data['quality_defect_rate'] = defect_rate
+        
+        return supplier_data
+    
+    def record_scores(self, supplier_ids: List[str], inputs: List[Dict], revisions: List[int],
+                      predictions: List[Dict]) -> List[Dict]:
+        rows = []
+        # Naive UTC, the supplier store's convention for scored_at
+        now = self._naive_utc(datetime.now(timezone.utc))
+        
+        with self._lock:
+            for supplier_id, supplier_data, revision, prediction in zip(supplier_ids, inputs, revisions, predictions):
+                # Concurrent ingestions may finish out of order: never overwrite a newer score
+                current = self.current.get(supplier_id)
+                if current is not None and current['revision'] > revision:
+                    rows.append(current)
+                    continue
+                
+                row = {
+                    'supplier_id': supplier_id,
+                    'country': supplier_data['country'],
+                    'region': supplier_data['region'],
+                    'sector': supplier_data['sector'],
+                    'family': supplier_data['family'],
+                    'predicted_risk_level': prediction['predicted_risk_level'],
+                    'risk_probability': prediction['risk_probability'],
+                    'confidence': prediction['confidence'],
+                    'risk_score': prediction['risk_score'],
+                    'on_time_delivery_rate': supplier_data['on_time_delivery_rate'],
+                    'quality_defect_rate': supplier_data['quality_defect_rate'],
+                    'model_version': prediction['model_version'],
+                    'revision': revision,
+                    'updated_at': now
+                }
+                self.current[supplier_id] = row
+                rows.append(row)
+        
+        return rows
+    
+    def get(self, supplier_id: str) -> Optional[Dict]:
+        return self.current.get(supplier_id)
+    
+    def rows(self, risk_level: Optional[str] = None) -> List[Dict]:
+        with self._lock:
+            return [row for row in self.current.values() if risk_level is None or row['predicted_risk_level'] == risk_level]
+
+_risk_state_instance = None
+_risk_state_lock = threading.Lock()
+
+def get_risk_state() -> SupplierRiskState:
+    global _risk_state_instance
+    
+    if _risk_state_instance is None:
+        with _risk_state_lock:
+            if _risk_state_instance is None:
+                _risk_state_instance = SupplierRiskState()
+    
+    return _risk_state_instance
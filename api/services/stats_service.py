@@ -0,0 +1,133 @@
+from datetime import datetime
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+from pathlib import Path
+import logging
+import sys
+import threading
+
+sys.path.append('src')
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_COLUMNS = ['sector', 'country', 'region', 'family']
+
+class StatsService:
+    
+    def __init__(self, data_path: str, label_encoders_path: str):
+        self.data_path = Path(data_path)
+        self.dvc_path = Path(f"{data_path}.dvc")
+        self.label_encoders_path = Path(label_encoders_path)
+        
+        self._stats = None
+        self._signature = None
+        self._dvc_cache = (None, None)
+        self._lock = threading.Lock()
+    
+    def get_stats(self) -> Dict:
+        signature = self._current_signature()
+        
+        if signature != self._signature:
+            with self._lock:
+                if signature != self._signature:
+                    self._stats = self._compute_stats()
+                    self._signature = signature
+                    logger.info(f"Statistics refreshed from {self.data_path} ({self._stats['total_suppliers']} suppliers)")
+        
+        return self._stats
+    
+    def _current_signature(self) -> Tuple:
+        if self.data_path.is_dir():
+            # Partitioned Parquet dataset: any file added, removed or rewritten
+            files = sorted(path for path in self.data_path.rglob('*') if path.is_file())
+            stats = [path.stat() for path in files]
+            return tuple((str(path), stat.st_mtime_ns, stat.st_size) for path, stat in zip(files, stats)), self._dvc_hash()
+        
+        stat = self.data_path.stat()
+        return stat.st_mtime_ns, stat.st_size, self._dvc_hash()
+    
+    def _dvc_hash(self) -> Optional[str]:
+        # The .dvc file is only re-read when it changes on disk
+        try:
+            mtime = self.dvc_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+        
+        cached_mtime, cached_hash = self._dvc_cache
+        if mtime != cached_mtime:
+            cached_hash = None
+            for line in self.dvc_path.read_text().splitlines():
+                line = line.strip().lstrip('- ')
+                if line.startswith('md5:'):
+                    cached_hash = line.split(':', 1)[1].strip()
+                    break
+            self._dvc_cache = (mtime, cached_hash)
+        
+        return cached_hash
+    
+    def _compute_stats(self) -> Dict:
+        # pandas is only needed once the stats are actually requested
+        from data.dataset_io import read_dataset, dataset_columns
+        
+        wanted = {'risk_level'} | set(SEGMENT_COLUMNS) | {f"{col}_encoded" for col in SEGMENT_COLUMNS}
+        columns = [col for col in dataset_columns(str(self.data_path)) if col in wanted]
+        df = read_dataset(str(self.data_path), columns=columns)
+        
+        segments = self._decode_segments(df)
+        
+        stats = {
+            'total_suppliers': len(df),
+            'risk_distribution': self._counts(df['risk_level']),
+            'sectors': self._counts(segments['sector']) if 'sector' in segments else {},
+            'last_updated': datetime.fromtimestamp(self.data_path.stat().st_mtime)
+        }
+        
+        for col in SEGMENT_COLUMNS:
+            stats[f"by_{col}"] = self._breakdown(segments[col], df['risk_level']) if col in segments else {}
+        
+        return stats
+    
+    def _decode_segments(self, df: 'pd.DataFrame') -> Dict[str, 'pd.Series']:
+        import pandas as pd
+        
+        segments = {col: df[col].astype(str) for col in SEGMENT_COLUMNS if col in df.columns}
+        
+        # The processed dataset only keeps the label-encoded categorical columns
+        missing = [col for col in SEGMENT_COLUMNS if col not in segments and f"{col}_encoded" in df.columns]
+        if missing:
+            import joblib
+            label_encoders = joblib.load(self.label_encoders_path)
+            for col in missing:
+                if col in label_encoders:
+                    classes = label_encoders[col].classes_.astype(str)
+                    segments[col] = pd.Series(classes[df[f"{col}_encoded"].to_numpy()], index=df.index)
+        
+        return segments
+    
+    def _counts(self, series: 'pd.Series') -> Dict[str, int]:
+        return {str(key): int(value) for key, value in series.value_counts().items()}
+    
+    def _breakdown(self, segment: 'pd.Series', risk_level: 'pd.Series') -> Dict[str, Dict]:
+        import pandas as pd
+        
+        table = pd.crosstab(segment, risk_level)
+        
+        return {
+            str(value): {
+                'total': int(row.sum()),
+                'risk_distribution': {str(level): int(count) for level, count in row.items() if count}
+            }
+            for value, row in table.iterrows()
+        }
+
+_stats_service_instance = None
+
+def get_stats_service(data_path: str, label_encoders_path: str) -> StatsService:
+    global _stats_service_instance
+    
+    if _stats_service_instance is None:
+        _stats_service_instance = StatsService(data_path, label_encoders_path)
+    
+    return _stats_service_instance
@@ -0,0 +1,408 @@
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import base64
+import json
+import logging
+import threading
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql, sqlite
+
+from api.services.prediction_cache import PredictionCache
+
+logger = logging.getLogger(__name__)
+
+# Rows per executemany round trip for bulk writes
+BULK_CHUNK_ROWS = 5000
+
+# Supplier columns stored as real (indexed or filterable) columns; every other
+# profile field goes in the JSON profile
+SEGMENT_COLUMNS = ['country', 'region', 'sector', 'family']
+
+# Columns the listing can be sorted on and the aggregates grouped by
+SORT_COLUMNS = ['supplier_id', 'risk_score', 'confidence', 'scored_at', 'updated_at']
+GROUP_COLUMNS = [*SEGMENT_COLUMNS, 'risk_level']
+
+# Distinct aggregate queries kept by the cache
+AGGREGATE_CACHE_SIZE = 256
+
+metadata = sa.MetaData()
+
+suppliers = sa.Table(
+    'suppliers', metadata,
+    sa.Column('supplier_id', sa.String(64), primary_key=True),
+    sa.Column('supplier_name', sa.String(128)),
+    sa.Column('country', sa.String(64)),
+    sa.Column('region', sa.String(16)),
+    sa.Column('sector', sa.String(32)),
+    sa.Column('family', sa.String(64)),
+    sa.Column('profile', sa.JSON, nullable=False),
+    # Latest score, copied from the prediction history
+    sa.Column('risk_level', sa.String(16)),
+    sa.Column('risk_score', sa.Float),
+    sa.Column('confidence', sa.Float),
+    sa.Column('model_version', sa.String(32)),
+    sa.Column('scored_at', sa.DateTime),
+    sa.Column('updated_at', sa.DateTime, nullable=False),
+    # Covering indexes: segment filters and group-by counts (with the mean
+    # score) read the index alone, never the rows
+    sa.Index('ix_suppliers_risk_level_score', 'risk_level', 'risk_score'),
+    *[
+        sa.Index(f'ix_suppliers_{column}_risk', column, 'risk_level', 'risk_score')
+        for column in SEGMENT_COLUMNS
+    ],
+    # Keyset pagination walks (sort column, supplier_id) in index order
+    *[
+        sa.Index(f'ix_suppliers_{column}_id', column, 'supplier_id')
+        for column in SORT_COLUMNS if column != 'supplier_id'
+    ]
+)
+
+feature_snapshots = sa.Table(
+    'feature_snapshots', metadata,
+    sa.Column('id', sa.Integer, primary_key=True, autoincrement=True),
+    sa.Column('supplier_id', sa.String(64), nullable=False),
+    sa.Column('as_of', sa.DateTime, nullable=False, index=True),
+    sa.Column('features', sa.JSON, nullable=False),
+    sa.Index('ix_feature_snapshots_supplier_as_of', 'supplier_id', 'as_of')
+)
+
+predictions = sa.Table(
+    'predictions', metadata,
+    sa.Column('id', sa.Integer, primary_key=True, autoincrement=True),
+    sa.Column('supplier_id', sa.String(64), nullable=False),
+    sa.Column('risk_level', sa.String(16), nullable=False, index=True),
+    sa.Column('risk_score', sa.Float, nullable=False),
+    sa.Column('confidence', sa.Float, nullable=False),
+    sa.Column('risk_probability', sa.JSON, nullable=False),
+    sa.Column('model_version', sa.String(32), nullable=False),
+    sa.Column('created_at', sa.DateTime, nullable=False, index=True),
+    sa.Index('ix_predictions_supplier_created_at', 'supplier_id', 'created_at')
+)
+
+def utc_now() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+def naive_utc(timestamp: datetime) -> datetime:
+    # Stored timestamps are naive UTC, like SupplierRiskState's: offset-aware
+    # values are converted, naive ones are taken as UTC already
+    if timestamp.tzinfo is not None:
+        return timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+    return timestamp
+
+def _encode_cursor(values: List[Any]) -> str:
+    payload = json.dumps([v.isoformat() if isinstance(v, datetime) else v for v in values])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+def _decode_cursor(cursor: str, sort: str, descending: bool) -> Tuple:
+    try:
+        payload = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        cursor_sort, cursor_descending, value, supplier_id = json.loads(payload)
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+    
+    if (cursor_sort, cursor_descending) != (sort, descending):
+        raise ValueError("Cursor was issued for another sort order")
+    
+    if value is not None and isinstance(suppliers.c[sort].type, sa.DateTime):
+        value = datetime.fromisoformat(value)
+    return value, supplier_id
+
+def _chunks(rows: List[Dict], size: int = BULK_CHUNK_ROWS) -> Iterable[List[Dict]]:
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+class SupplierStore:
+    # Suppliers with their latest score, feature snapshots and prediction
+    # history. SQLite by default, any SQLAlchemy URL (e.g. postgresql://) works
+    
+    def __init__(self, database_url: str, pool_size: int = 5, max_overflow: int = 10, aggregate_ttl: float = 0):
+        self.database_url = database_url
+        self.engine = self._create_engine(database_url, pool_size, max_overflow)
+        # Aggregates scan whole indexes: repeated dashboard queries are served
+        # from memory, at most aggregate_ttl seconds behind other processes' writes
+        self.aggregate_cache = PredictionCache(AGGREGATE_CACHE_SIZE, aggregate_ttl) if aggregate_ttl > 0 else None
+        metadata.create_all(self.engine)
+        # create_all skips the tables that exist: add indexes introduced since
+        for index in suppliers.indexes:
+            index.create(self.engine, checkfirst=True)
+        logger.info(f"Supplier store ready ({self.engine.dialect.name}, {self.engine.url.render_as_string(hide_password=True)})")
+    
+    @staticmethod
+    def _create_engine(database_url: str, pool_size: int, max_overflow: int) -> sa.Engine:
+        url = sa.make_url(database_url)
+        
+        if url.get_backend_name() != 'sqlite':
+            return sa.create_engine(url, pool_size=pool_size, max_overflow=max_overflow, pool_pre_ping=True)
+        
+        # One SQLite file shared by the API threads: WAL lets readers run while
+        # a batch is written, and connections may move between threads
+        engine = sa.create_engine(url, connect_args={'check_same_thread': False, 'timeout': 30})
+        
+        @sa.event.listens_for(engine, 'connect')
+        def _sqlite_pragmas(connection, _):
+            cursor = connection.cursor()
+            cursor.execute('PRAGMA journal_mode=WAL')
+            cursor.execute('PRAGMA synchronous=NORMAL')
+            cursor.close()
+        
+        return engine
+    
+    def _insert(self, table: sa.Table):
+        # Dialect insert, for ON CONFLICT upserts
+        if self.engine.dialect.name == 'postgresql':
+            return postgresql.insert(table)
+        if self.engine.dialect.name == 'sqlite':
+            return sqlite.insert(table)
+        raise ValueError(f"Upserts are not supported on {self.engine.dialect.name}")
+    
+    def upsert_suppliers(self, rows: List[Dict]) -> int:
+        # rows: supplier dicts (SupplierInput fields plus supplier_id, optional supplier_name)
+        now = utc_now()
+        records = [
+            {
+                'supplier_id': str(row['supplier_id']),
+                'supplier_name': row.get('supplier_name'),
+                **{col: row.get(col) for col in SEGMENT_COLUMNS},
+                'profile': {k: v for k, v in row.items() if k not in ('supplier_id', 'supplier_name')},
+                'updated_at': now
+            }
+            for row in rows
+        ]
+        
+        statement = self._insert(suppliers)
+        statement = statement.on_conflict_do_update(
+            index_elements=['supplier_id'],
+            set_={
+                **{col: statement.excluded[col] for col in [*SEGMENT_COLUMNS, 'profile', 'updated_at']},
+                'supplier_name': sa.func.coalesce(statement.excluded.supplier_name, suppliers.c.supplier_name)
+            }
+        )
+        
+        with self.engine.begin() as connection:
+            for chunk in _chunks(records):
+                connection.execute(statement, chunk)
+        
+        self._invalidate_aggregates()
+        return len(records)
+    
+    def record_predictions(self, rows: List[Dict]) -> int:
+        # rows: supplier_id plus a prediction (predicted_risk_level, risk_score,
+        # confidence, risk_probability, model_version). Appends to the history
+        # and moves each supplier's latest score
+        now = utc_now()
+        history = [
+            {
+                'supplier_id': str(row['supplier_id']),
+                'risk_level': row['predicted_risk_level'],
+                'risk_score': row['risk_score'],
+                'confidence': row['confidence'],
+                'risk_probability': row['risk_probability'],
+                'model_version': row['model_version'],
+                'created_at': naive_utc(row['updated_at']) if row.get('updated_at') else now
+            }
+            for row in rows
+        ]
+        
+        latest = (
+            suppliers.update()
+            .where(suppliers.c.supplier_id == sa.bindparam('b_supplier_id'))
+            .where(sa.or_(suppliers.c.scored_at.is_(None), suppliers.c.scored_at <= sa.bindparam('b_created_at')))
+            .values(
+                risk_level=sa.bindparam('b_risk_level'),
+                risk_score=sa.bindparam('b_risk_score'),
+                confidence=sa.bindparam('b_confidence'),
+                model_version=sa.bindparam('b_model_version'),
+                scored_at=sa.bindparam('b_created_at')
+            )
+        )
+        
+        with self.engine.begin() as connection:
+            for chunk in _chunks(history):
+                connection.execute(predictions.insert(), chunk)
+                connection.execute(latest, [{f"b_{k}": v for k, v in record.items()} for record in chunk])
+        
+        self._invalidate_aggregates()
+        return len(history)
+    
+    def _invalidate_aggregates(self):
+        if self.aggregate_cache is not None:
+            self.aggregate_cache.clear()
+    
+    def record_features(self, rows: List[Dict], as_of: datetime) -> int:
+        # rows: supplier_id plus feature values (e.g. RollingFeatureEngine output)
+        as_of = naive_utc(as_of)
+        records = [
+            {
+                'supplier_id': str(row['supplier_id']),
+                'as_of': as_of,
+                'features': {k: v for k, v in row.items() if k != 'supplier_id'}
+            }
+            for row in rows
+        ]
+        
+        with self.engine.begin() as connection:
+            for chunk in _chunks(records):
+                connection.execute(feature_snapshots.insert(), chunk)
+        
+        return len(records)
+    
+    def get_supplier(self, supplier_id: str) -> Optional[Dict]:
+        with self.engine.connect() as connection:
+            row = connection.execute(
+                sa.select(suppliers).where(suppliers.c.supplier_id == supplier_id)
+            ).mappings().first()
+        
+        return dict(row) if row is not None else None
+    
+    def get_profiles(self, supplier_ids: List[str]) -> Dict[str, Dict]:
+        profiles = {}
+        with self.engine.connect() as connection:
+            for chunk in _chunks(list(supplier_ids), 500):
+                query = sa.select(suppliers.c.supplier_id, suppliers.c.profile).where(suppliers.c.supplier_id.in_(chunk))
+                profiles.update({row.supplier_id: row.profile for row in connection.execute(query)})
+        return profiles
+    
+    @staticmethod
+    def _filter_conditions(filters: Dict) -> List:
+        # filters: segment / risk_level value lists, min_score and max_score
+        conditions = []
+        for column in GROUP_COLUMNS:
+            values = filters.get(column)
+            if values:
+                conditions.append(suppliers.c[column].in_(values))
+        
+        if filters.get('min_score') is not None:
+            conditions.append(suppliers.c.risk_score >= filters['min_score'])
+        if filters.get('max_score') is not None:
+            conditions.append(suppliers.c.risk_score <= filters['max_score'])
+        return conditions
+    
+    def list_suppliers(self, filters: Dict, sort: str = 'supplier_id', descending: bool = False,
+                       limit: int = 100, cursor: Optional[str] = None) -> Tuple[List[Dict], Optional[str]]:
+        # One page of suppliers, without their profile, and the cursor of the
+        # next one. Keyset pagination: a page costs the same at any depth
+        if sort not in SORT_COLUMNS:
+            raise ValueError(f"Cannot sort on {sort}, expected one of {SORT_COLUMNS}")
+        
+        sort_column = suppliers.c[sort]
+        keys = [sort_column] if sort == 'supplier_id' else [sort_column, suppliers.c.supplier_id]
+        conditions = self._filter_conditions(filters)
+        
+        if sort != 'supplier_id':
+            # Keys are compared as tuples, which NULL would break: unscored
+            # suppliers are left out of listings sorted on a score column
+            conditions.append(sort_column.is_not(None))
+        
+        if cursor is not None:
+            value, supplier_id = _decode_cursor(cursor, sort, descending)
+            after = sa.tuple_(*keys) if len(keys) > 1 else keys[0]
+            position = sa.tuple_(value, supplier_id) if len(keys) > 1 else supplier_id
+            conditions.append(after < position if descending else after > position)
+        
+        query = (
+            sa.select(*[column for column in suppliers.c if column.name != 'profile'])
+            .where(*conditions)
+            .order_by(*[key.desc() if descending else key for key in keys])
+            .limit(limit + 1)
+        )
+        
+        with self.engine.connect() as connection:
+            rows = [dict(row) for row in connection.execute(query).mappings()]
+        
+        # The extra row only tells whether a next page exists
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = _encode_cursor([sort, descending, last[sort], last['supplier_id']])
+        
+        return rows, next_cursor
+    
+    def aggregate(self, group_by: List[str], filters: Dict) -> List[Dict]:
+        # Supplier counts and mean risk score per group, computed by the database
+        for column in group_by:
+            if column not in GROUP_COLUMNS:
+                raise ValueError(f"Cannot group by {column}, expected columns in {GROUP_COLUMNS}")
+        
+        key = json.dumps([group_by, filters], sort_keys=True)
+        if self.aggregate_cache is not None:
+            groups = self.aggregate_cache.get(key)
+            if groups is not None:
+                return groups
+        
+        columns = [suppliers.c[column] for column in group_by]
+        query = (
+            sa.select(
+                *columns,
+                sa.func.count().label('count'),
+                sa.func.avg(suppliers.c.risk_score).label('avg_risk_score')
+            )
+            .where(*self._filter_conditions(filters))
+            .group_by(*columns)
+            .order_by(sa.func.count().desc())
+        )
+        
+        with self.engine.connect() as connection:
+            groups = [
+                {
+                    'key': {column: row[column] for column in group_by},
+                    'count': row['count'],
+                    'avg_risk_score': row['avg_risk_score']
+                }
+                for row in connection.execute(query).mappings()
+            ]
+        
+        if self.aggregate_cache is not None:
+            self.aggregate_cache.put(key, groups)
+        return groups
+    
+    def prediction_history(self, supplier_id: str, limit: int = 50) -> List[Dict]:
+        query = (
+            sa.select(predictions)
+            .where(predictions.c.supplier_id == supplier_id)
+            .order_by(predictions.c.created_at.desc(), predictions.c.id.desc())
+            .limit(limit)
+        )
+        
+        with self.engine.connect() as connection:
+            return [dict(row) for row in connection.execute(query).mappings()]
+    
+    def latest_features(self, supplier_id: str) -> Optional[Dict]:
+        query = (
+            sa.select(feature_snapshots)
+            .where(feature_snapshots.c.supplier_id == supplier_id)
+            .order_by(feature_snapshots.c.as_of.desc(), feature_snapshots.c.id.desc())
+            .limit(1)
+        )
+        
+        with self.engine.connect() as connection:
+            row = connection.execute(query).mappings().first()
+        
+        return dict(row) if row is not None else None
+    
+    def dispose(self):
+        self.engine.dispose()
+
+_supplier_store_instance = None
+_supplier_store_lock = threading.Lock()
+
+def get_supplier_store(database_url: str, pool_size: int = 5, max_overflow: int = 10,
+                       aggregate_ttl: float = 0) -> SupplierStore:
+    global _supplier_store_instance
+    
+    # One engine, hence one connection pool, per process
+    if _supplier_store_instance is None:
+        with _supplier_store_lock:
+            if _supplier_store_instance is None:
+                _supplier_store_instance = SupplierStore(database_url, pool_size, max_overflow, aggregate_ttl)
+    
+    return _supplier_store_instance
+
+def close_supplier_store():
+    global _supplier_store_instance
+    
+    with _supplier_store_lock:
+        if _supplier_store_instance is not None:
+            _supplier_store_instance.dispose()
+            _supplier_store_instance = None
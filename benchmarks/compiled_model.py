@@ -0,0 +1,65 @@
+import os
+import subprocess
+import sys
+import time
+import numpy as np
+
+sys.path.append('.')
+sys.path.append('src')
+from api.services.ml_service import MLService
+from data.dataset_io import read_dataset
+
+N_ROWS = 200
+COLD_START_RUNS = 3
+
+# Fresh interpreter: imports, model load and first prediction, like a new worker
+COLD_START = """
+import sys, time
+start = time.perf_counter()
+from api.services.ml_service import MLService
+service = MLService(sys.argv[1], 'models/label_encoder.pkl', 'models/label_encoders.pkl')
+service.predict({})
+print(time.perf_counter() - start, 'sklearn' in sys.modules)
+"""
+
+def artifact_size(path):
+    if os.path.isdir(path):
+        return sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+    return os.path.getsize(path)
+
+def cold_start(model_path):
+    timings = []
+    for _ in range(COLD_START_RUNS):
+        output = subprocess.run(
+            [sys.executable, '-c', COLD_START, model_path],
+            capture_output=True, text=True, check=True
+        ).stdout.split()
+        timings.append(float(output[0]))
+    return min(timings), output[1] == 'True'
+
+def row_latency(service, records):
+    latencies = []
+    for record in records:
+        start = time.perf_counter()
+        service.predict(record)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return np.percentile(latencies, 50)
+
+def main(pickle_path='models/best_model.pkl', compiled_path='models/compiled',
+         data_path='data/raw/suppliers_data.csv', n_rows=N_ROWS):
+    records = read_dataset(data_path).head(n_rows).to_dict(orient='records')
+    
+    print(f"{'format':<10}{'size KB':>10}{'cold start s':>14}{'sklearn':>9}{'p50 ms/row':>12}")
+    
+    for name, path in (('pickle', pickle_path), ('compiled', compiled_path)):
+        service = MLService(path, 'models/label_encoder.pkl', 'models/label_encoders.pkl')
+        service.predict(records[0])
+        
+        seconds, imports_sklearn = cold_start(path)
+        p50 = row_latency(service, records)
+        
+        print(f"{name:<10}{artifact_size(path) / 1024:>10.0f}{seconds:>14.2f}{str(imports_sklearn):>9}{p50:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
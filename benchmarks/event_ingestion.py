@@ -0,0 +1,73 @@
+import time
+import sys
+
+sys.path.append('.')
+sys.path.append('src')
+from api.services.ml_service import MLService
+from api.services.risk_state import SupplierRiskState, PROFILE_FIELDS
+from data.dataset_io import read_dataset
+from data.generate_data import generate_event_history
+
+EVENTS_PER_BATCH = 500
+
+def profile_events(suppliers):
+    # Every supplier starts from its dataset profile
+    columns = [col for col in suppliers.columns if col in PROFILE_FIELDS]
+    categorical = {col: str for col in columns if suppliers[col].dtype == 'category'}
+    records = suppliers[columns].astype(categorical).to_dict(orient='records')
+    return [
+        {'supplier_id': supplier_id, 'event_type': 'profile', 'attributes': record}
+        for supplier_id, record in zip(suppliers['supplier_id'].astype(str), records)
+    ]
+
+def delivery_events(events):
+    return [
+        {'supplier_id': supplier_id, 'event_type': 'delivery', 'timestamp': timestamp,
+         'delay_days': delay, 'quantity': quantity, 'defective_units': defects}
+        for supplier_id, timestamp, delay, quantity, defects in zip(
+            events['supplier_id'].tolist(),
+            events['delivered_at'].to_numpy(dtype='datetime64[us]').tolist(),
+            events['delay_days'].tolist(),
+            events['quantity'].tolist(),
+            events['defective_units'].tolist()
+        )
+    ]
+
+def ingest(state, service, events):
+    # Same steps as POST /api/v1/events, without HTTP
+    supplier_ids = state.apply(events)
+    inputs, revisions = state.scoring_inputs(supplier_ids)
+    state.record_scores(supplier_ids, inputs, revisions, service.predict_batch(inputs))
+    return len(supplier_ids)
+
+def main(model_path='models/best_model.pkl', data_path='data/raw/suppliers_data.csv',
+         events_per_batch=EVENTS_PER_BATCH):
+    service = MLService(model_path, 'models/label_encoder.pkl', 'models/label_encoders.pkl')
+    suppliers = read_dataset(data_path)
+    
+    state = SupplierRiskState()
+    ingest(state, service, profile_events(suppliers))
+    
+    events = delivery_events(generate_event_history(suppliers))
+    
+    start = time.perf_counter()
+    rescored = 0
+    for i in range(0, len(events), events_per_batch):
+        rescored += ingest(state, service, events[i:i + events_per_batch])
+    elapsed = time.perf_counter() - start
+    
+    # Reference: rescoring every supplier after each batch
+    start = time.perf_counter()
+    inputs, _ = state.scoring_inputs(list(state.profiles))
+    service.predict_batch(inputs)
+    full_rescore = time.perf_counter() - start
+    n_batches = -(-len(events) // events_per_batch)
+    
+    print(f"{len(events)} delivery events, {len(state.profiles)} suppliers, batches of {events_per_batch}")
+    print(f"ingestion: {len(events) / elapsed:.0f} events/s ({elapsed:.1f}s), {rescored} supplier rescores")
+    print(f"rescoring everyone after each batch instead: ~{full_rescore * n_batches:.1f}s of inference")
+    print(f"current-risk table: {len(state.current)} suppliers")
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:2])
@@ -0,0 +1,102 @@
+import time
+import sys
+import joblib
+import numpy as np
+import pandas as pd
+
+sys.path.append('src')
+from features.feature_engineering import FeatureEngineer
+from features.feature_plan import FeaturePlan
+from data.dataset_io import read_dataset
+
+N_ROWS = 500
+P50_BUDGET_MS = 2.0
+BATCH_SIZES = [1, 4, 8, 16, 32, 64, 1000, 10000, 50000]
+BATCH_RUNS = 5
+
+def pandas_frame(feature_engineer, records):
+    df = feature_engineer.create_features(pd.DataFrame(records))
+    df = feature_engineer.encode_categorical(df)
+    X, _ = feature_engineer.prepare_for_ml(df)
+    return X
+
+def pandas_path(feature_engineer, record):
+    return pandas_frame(feature_engineer, [record]).to_numpy(dtype=float)
+
+def best_ms(fn, runs=BATCH_RUNS):
+    best = float('inf')
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+def batch_latency(feature_engineer, plan, records):
+    # Batch path against one transform() per row and the pandas pipeline
+    print(f"\n{'rows':>6}{'row loop':>12}{'batch':>12}{'pandas':>12}{'vs loop':>10}")
+    for size in BATCH_SIZES:
+        batch = (records * (size // len(records) + 1))[:size]
+        
+        expected = pandas_frame(feature_engineer, batch)[plan.feature_columns].to_numpy(dtype=float)
+        if not np.allclose(plan.transform_many(batch), expected):
+            raise AssertionError(f"Batch parity failure on {size} rows")
+        
+        runs = max(BATCH_RUNS, 1000 // size)
+        loop_ms = best_ms(lambda: [plan.transform(record) for record in batch], runs)
+        batch_ms = best_ms(lambda: plan.transform_many(batch), runs)
+        pandas_ms = best_ms(lambda: pandas_frame(feature_engineer, batch).to_numpy(dtype=float))
+        print(f"{size:>6}{loop_ms:>10.3f}ms{batch_ms:>10.3f}ms{pandas_ms:>10.3f}ms{loop_ms / batch_ms:>9.1f}x")
+
+def main(data_path='data/raw/suppliers_data.csv', encoders_path='models/label_encoders.pkl', n_rows=N_ROWS):
+    feature_engineer = FeatureEngineer()
+    feature_engineer.label_encoders = joblib.load(encoders_path)
+    
+    records = read_dataset(data_path).head(n_rows).to_dict(orient='records')
+    plan = FeaturePlan.from_feature_engineer(feature_engineer, records[0])
+    
+    pandas_latencies = []
+    plan_latencies = []
+    
+    for record in records:
+        start = time.perf_counter()
+        try:
+            expected = pandas_path(feature_engineer, record)
+        except ValueError:
+            # Categories unknown to the encoders must be rejected by both paths
+            try:
+                plan.transform(record)
+            except ValueError:
+                continue
+            raise AssertionError(f"Feature plan accepted unknown categories for {record.get('supplier_id')}")
+        pandas_latencies.append((time.perf_counter() - start) * 1000)
+        
+        start = time.perf_counter()
+        row = plan.transform(record)
+        plan_latencies.append((time.perf_counter() - start) * 1000)
+        
+        if not np.allclose(row, expected):
+            mismatched = [
+                col for col, a, b in zip(plan.feature_columns, row[0], expected[0])
+                if not np.isclose(a, b)
+            ]
+            raise AssertionError(f"Parity failure for {record.get('supplier_id')}: {mismatched}")
+    
+    pandas_p50 = np.percentile(pandas_latencies, 50)
+    plan_p50 = np.percentile(plan_latencies, 50)
+    
+    print(f"Parity OK on {len(plan_latencies)} suppliers ({plan.n_features} features)")
+    print(f"pandas path  p50: {pandas_p50:.3f} ms  p95: {np.percentile(pandas_latencies, 95):.3f} ms")
+    print(f"feature plan p50: {plan_p50:.3f} ms  p95: {np.percentile(plan_latencies, 95):.3f} ms")
+    print(f"Speedup: {pandas_p50 / plan_p50:.1f}x")
+    
+    batch_latency(feature_engineer, plan, [
+        record for record in records
+        if all(str(record[col]) in codes for col, codes in plan.category_codes.items())
+    ])
+    
+    if plan_p50 > P50_BUDGET_MS:
+        raise SystemExit(f"Feature plan p50 {plan_p50:.3f} ms exceeds the {P50_BUDGET_MS} ms budget")
+
+
+if __name__ == "__main__":
+    main()
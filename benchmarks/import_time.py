@@ -0,0 +1,59 @@
+import subprocess
+import sys
+
+IMPORT_RUNS = 3
+TOP_MODULES = 15
+
+# Cumulative import time allowed for the API entry point, and modules that must
+# stay off the serving path (they are only needed for training or pickled models)
+IMPORT_BUDGET_MS = 1000
+FORBIDDEN_MODULES = ['pandas', 'pyarrow', 'joblib', 'sklearn', 'scipy', 'xgboost', 'mlflow', 'sqlalchemy']
+
+CHECK = """
+import sys
+import {module}
+print(' '.join(name for name in {forbidden} if name in sys.modules))
+"""
+
+def import_profile(module):
+    # python -X importtime writes "self | cumulative | name" (microseconds) to stderr
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', CHECK.format(module=module, forbidden=FORBIDDEN_MODULES)],
+        capture_output=True, text=True, check=True
+    )
+    
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line.split(':', 1)[1].split('|')
+        timings[name.strip()] = int(cumulative) / 1000
+    
+    return timings, result.stdout.split()
+
+def main(module='api.main', budget_ms=IMPORT_BUDGET_MS):
+    profiles = [import_profile(module) for _ in range(IMPORT_RUNS)]
+    timings, loaded = min(profiles, key=lambda profile: profile[0][module])
+    total = timings[module]
+    
+    print(f"Slowest imports under {module} (cumulative ms, best of {IMPORT_RUNS})")
+    top_level = {name: ms for name, ms in timings.items() if '.' not in name or name.startswith('api.')}
+    for name, ms in sorted(top_level.items(), key=lambda item: -item[1])[:TOP_MODULES]:
+        print(f"{name:<40}{ms:>10.1f}")
+    
+    print(f"\n{module}: {total:.0f} ms (budget {budget_ms} ms)")
+    
+    failures = []
+    if total > budget_ms:
+        failures.append(f"import time {total:.0f} ms over the {budget_ms} ms budget")
+    if loaded:
+        failures.append(f"heavy modules imported on the serving path: {', '.join(loaded)}")
+    
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    
+    return not failures
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main(*sys.argv[1:2]) else 1)
@@ -0,0 +1,53 @@
+import time
+import sys
+import numpy as np
+
+sys.path.append('.')
+sys.path.append('src/models')
+from train_models import RiskPredictionBenchmark
+from api.services.ml_service import predict_with_proba
+
+N_REQUESTS = 200
+
+def time_requests(fn, rows):
+    latencies = []
+    for row in rows:
+        start = time.perf_counter()
+        fn(row)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return np.percentile(latencies, 50), np.percentile(latencies, 95)
+
+def main(n_requests=N_REQUESTS):
+    benchmark = RiskPredictionBenchmark(experiment_name="inference_latency_benchmark")
+    X_train, X_test, y_train, y_test = benchmark.load_data()
+    benchmark.initialize_models()
+    
+    n_classes = len(benchmark.label_encoder.classes_)
+    rows = [X_test.iloc[[i % len(X_test)]] for i in range(n_requests)]
+    
+    print(f"\nPer-request latency over {n_requests} single-row predictions (ms)")
+    print(f"{'model':<22}{'before p50':>12}{'before p95':>12}{'after p50':>12}{'after p95':>12}{'speedup':>10}")
+    
+    for model_name, model in benchmark.models.items():
+        model.fit(X_train, y_train)
+        
+        def before(X):
+            model.predict(X)
+            model.predict_proba(X)
+        
+        def after(X):
+            predict_with_proba(model, X, n_classes)
+        
+        # Warm up both paths before timing
+        before(rows[0])
+        after(rows[0])
+        
+        before_p50, before_p95 = time_requests(before, rows)
+        after_p50, after_p95 = time_requests(after, rows)
+        
+        print(f"{model_name:<22}{before_p50:>12.3f}{before_p95:>12.3f}{after_p50:>12.3f}{after_p95:>12.3f}"
+              f"{before_p50 / after_p50:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
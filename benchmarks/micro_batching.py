@@ -0,0 +1,82 @@
+import json
+import os
+import subprocess
+import sys
+
+N_REQUESTS = 2000
+CONCURRENCY_LEVELS = [1, 16, 500]
+
+# Each run has its own process (settings are read from the environment): the
+# app is served in-process through httpx's ASGI transport, warmed up, then hit
+# by concurrent clients sending N_REQUESTS single predictions in total
+WORKER = """
+import asyncio, json, logging, sys, time
+import numpy as np
+import httpx
+sys.path.append('.')
+logging.disable(logging.WARNING)
+from api.main import app, warm_up_model
+from api.routes import predictions
+
+N_REQUESTS, CONCURRENCY = int(sys.argv[1]), int(sys.argv[2])
+
+async def main():
+    await warm_up_model()
+    latencies = []
+    statuses = {}
+    queue = iter(range(N_REQUESTS))
+    
+    async def client(http):
+        for i in queue:
+            payload = {'supplier_id': f'B{i}', 'debt_ratio': 0.1 + (i % 80) / 100}
+            start = time.perf_counter()
+            response = await http.post('/api/v1/predict', json=payload)
+            latencies.append(time.perf_counter() - start)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+    
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url='http://bench') as http:
+        start = time.perf_counter()
+        await asyncio.gather(*(client(http) for _ in range(CONCURRENCY)))
+        elapsed = time.perf_counter() - start
+    
+    batcher = predictions.get_micro_batcher_dependency(predictions.get_inference_executor_dependency())
+    print(json.dumps({
+        'seconds': elapsed,
+        'p50_ms': float(np.percentile(latencies, 50)) * 1000,
+        'p99_ms': float(np.percentile(latencies, 99)) * 1000,
+        'statuses': statuses,
+        'batches': batcher.batches if batcher else None,
+        'avg_batch': batcher.average_batch_size() if batcher else None
+    }))
+
+asyncio.run(main())
+"""
+
+def run(env, n_requests, concurrency):
+    output = subprocess.run(
+        [sys.executable, '-c', WORKER, str(n_requests), str(concurrency)],
+        env={**os.environ, **env, 'MODEL_RELOAD_ENABLED': 'false', 'PREDICTION_CACHE_SIZE': '0'},
+        capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def main(n_requests=N_REQUESTS, concurrency_levels=CONCURRENCY_LEVELS):
+    modes = [
+        ('no batching', {'MICRO_BATCHING_ENABLED': 'false'}),
+        ('micro-batching', {'MICRO_BATCHING_ENABLED': 'true'})
+    ]
+    
+    print(f"{n_requests} requests per run")
+    print(f"{'clients':>7}  {'mode':<16}{'total':>9}{'req/s':>9}{'p50':>10}{'p99':>10}{'batches':>9}{'avg':>7}  statuses")
+    for concurrency in concurrency_levels:
+        for name, env in modes:
+            r = run(env, n_requests, concurrency)
+            batches = f"{r['batches']:>9}{r['avg_batch']:>7.1f}" if r['batches'] is not None else f"{'-':>9}{'-':>7}"
+            print(f"{concurrency:>7}  {name:<16}{r['seconds']:>8.2f}s{n_requests / r['seconds']:>9.0f}"
+                  f"{r['p50_ms']:>8.1f}ms{r['p99_ms']:>8.1f}ms{batches}  {r['statuses']}")
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:]]
+    main(*args[:1], *([args[1:]] if len(args) > 1 else []))
@@ -0,0 +1,55 @@
+import subprocess
+import sys
+
+N_WORKERS = 4
+
+# Each worker loads the export, reads every array page once (as scoring many
+# rows eventually does) and reports its memory from /proc/self/smaps_rollup (Linux)
+WORKER = """
+import sys, time
+import numpy as np
+sys.path.append('src')
+from models.compiled_model import CompiledModel
+
+def rollup():
+    fields = {}
+    with open('/proc/self/smaps_rollup') as f:
+        for line in f:
+            parts = line.split()
+            if parts[0].endswith(':') and len(parts) == 3:
+                fields[parts[0][:-1]] = int(parts[1])
+    return fields
+
+before = rollup()
+model = CompiledModel.load(sys.argv[1], mmap=sys.argv[2] == 'mmap')
+checksum = sum(float(np.sum(array)) for array in model.arrays.values())
+after = rollup()
+
+private = sum(after[k] - before[k] for k in ('Private_Clean', 'Private_Dirty'))
+print(private, after['Pss'] - before['Pss'])
+sys.stdout.flush()
+time.sleep(float(sys.argv[3]))
+"""
+
+def run_workers(model_path, mode, n_workers):
+    # Workers stay alive together so shared pages are split between them in Pss
+    workers = [
+        subprocess.Popen([sys.executable, '-c', WORKER, model_path, mode, '2'], stdout=subprocess.PIPE, text=True)
+        for _ in range(n_workers)
+    ]
+    outputs = [worker.communicate()[0].split() for worker in workers]
+    private = [int(output[0]) for output in outputs]
+    pss = [int(output[1]) for output in outputs]
+    return sum(private) / n_workers / 1024, sum(pss) / n_workers / 1024
+
+def main(model_path='models/compiled', n_workers=N_WORKERS):
+    print(f"Per-worker memory added by the model, {n_workers} workers (MB)")
+    print(f"{'loading':<10}{'private':>10}{'pss':>10}")
+    
+    for mode in ('copy', 'mmap'):
+        private, pss = run_workers(model_path, mode, n_workers)
+        print(f"{mode:<10}{private:>10.1f}{pss:>10.1f}")
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:2])
@@ -0,0 +1,118 @@
+import json
+import os
+import tempfile
+import time
+import sys
+from datetime import timedelta
+
+import numpy as np
+
+sys.path.append('.')
+from api.services.supplier_store import SupplierStore, suppliers, utc_now, _chunks
+
+N_SUPPLIERS = 1_000_000
+PAGE_SIZE = 100
+RUNS = 5
+
+COUNTRIES = ['Maroc', 'France', 'Allemagne', 'Chine', 'Thaïlande', 'Espagne', 'Turquie', 'Pologne', 'Mexique', 'États-Unis']
+REGIONS = ['EMEA', 'APAC', 'NA', 'LATAM']
+SECTORS = ['automotive', 'aeronautic']
+FAMILIES = ['Câblage', 'Injection', 'Filtration', 'Composite', 'Usinage', 'Électronique']
+RISK_LEVELS = ['low', 'medium', 'high', 'critical']
+
+def fill(store, n, seed=42):
+    # Scored suppliers written straight into the table: the listing reads
+    # only these columns, the profile stays a small placeholder
+    rng = np.random.default_rng(seed)
+    now = utc_now()
+    scores = rng.uniform(0, 10, n).round(2)
+    
+    rows = [
+        {
+            'supplier_id': f"F{i:07d}",
+            'supplier_name': f"Supplier_{i:07d}",
+            'country': COUNTRIES[country],
+            'region': REGIONS[region],
+            'sector': SECTORS[sector],
+            'family': FAMILIES[family],
+            'profile': {},
+            'risk_level': RISK_LEVELS[level],
+            'risk_score': score,
+            'confidence': score / 10,
+            'model_version': 'benchmark',
+            'scored_at': now - timedelta(seconds=i),
+            'updated_at': now
+        }
+        for i, country, region, sector, family, level, score in zip(
+            range(n),
+            rng.integers(0, len(COUNTRIES), n).tolist(),
+            rng.integers(0, len(REGIONS), n).tolist(),
+            rng.integers(0, len(SECTORS), n).tolist(),
+            rng.integers(0, len(FAMILIES), n).tolist(),
+            rng.choice(len(RISK_LEVELS), n, p=[0.5, 0.3, 0.15, 0.05]).tolist(),
+            scores.tolist()
+        )
+    ]
+    
+    with store.engine.begin() as connection:
+        for chunk in _chunks(rows):
+            connection.execute(suppliers.insert(), chunk)
+
+def timed(fn, runs=RUNS):
+    best = float('inf')
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return result, best * 1000
+
+def payload_kb(result):
+    return len(json.dumps(result, default=str).encode()) / 1024
+
+def main(n=N_SUPPLIERS):
+    with tempfile.TemporaryDirectory() as tmp:
+        store = SupplierStore(f"sqlite:///{os.path.join(tmp, 'suppliers.db')}")
+        
+        start = time.perf_counter()
+        fill(store, n)
+        print(f"{n} suppliers loaded in {time.perf_counter() - start:.1f}s")
+        
+        filters = {'risk_level': ['high', 'critical'], 'country': ['Chine']}
+        cases = [
+            ('first page by id', {}, 'supplier_id', False),
+            ('first page by score desc', {}, 'risk_score', True),
+            ('filtered page by score desc', filters, 'risk_score', True)
+        ]
+        
+        print(f"\n{'listing (page of ' + str(PAGE_SIZE) + ')':<36}{'first':>10}{'page 100':>10}{'KB':>8}")
+        for name, case_filters, sort, descending in cases:
+            page, first_ms = timed(lambda: store.list_suppliers(case_filters, sort, descending, PAGE_SIZE))
+            
+            # Walk to the 100th page, then time that page alone
+            cursor = page[1]
+            for _ in range(98):
+                cursor = store.list_suppliers(case_filters, sort, descending, PAGE_SIZE, cursor)[1]
+            _, deep_ms = timed(lambda: store.list_suppliers(case_filters, sort, descending, PAGE_SIZE, cursor))
+            
+            print(f"{name:<36}{first_ms:>8.1f}ms{deep_ms:>8.1f}ms{payload_kb(page[0]):>8.1f}")
+        
+        print(f"\n{'aggregate':<36}{'time':>10}{'groups':>10}{'KB':>8}")
+        for group_by, case_filters in [
+            (['risk_level'], {}),
+            (['country', 'risk_level'], {}),
+            (['sector', 'risk_level'], {'min_score': 8.0})
+        ]:
+            groups, ms = timed(lambda: store.aggregate(group_by, case_filters))
+            print(f"{' x '.join(group_by) + (' (filtered)' if case_filters else ''):<36}{ms:>8.1f}ms{len(groups):>10}{payload_kb(groups):>8.1f}")
+        
+        # Same query again through the API's aggregate cache
+        cached_store = SupplierStore(store.database_url, aggregate_ttl=60)
+        groups, ms = timed(lambda: cached_store.aggregate(['country', 'risk_level'], {}))
+        print(f"{'country x risk_level (cached)':<36}{ms:>8.3f}ms{len(groups):>10}{payload_kb(groups):>8.1f}")
+        
+        cached_store.dispose()
+        store.dispose()
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:2]])
@@ -0,0 +1,199 @@
+import os
+import shutil
+import pandas as pd
+
+# Format used by the pipeline scripts when no explicit path is given: csv or parquet
+DATA_FORMAT = os.environ.get('SUPPLIER_DATA_FORMAT', 'csv')
+
+PARQUET_SUFFIXES = ('.parquet', '.pq')
+
+# String columns stored as categories, both in memory and as Parquet dictionaries
+CATEGORICAL_COLUMNS = [
+    'country', 'region', 'sector', 'family',
+    'single_source', 'certification_iso',
+    'cert_iatf16949', 'iatf_16949', 'cert_as9100', 'as9100',
+    'cert_expiry_next90d', 'reach_compliance', 'non_conformity_flag',
+    'trade_barrier_flag', 'route_disruption_flag',
+    'criticity_level', 'risk_level'
+]
+
+
+def parquet_available():
+    try:
+        import pyarrow  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def dataset_path(path, fmt=None):
+    # Swap the extension of a default dataset path for the configured format
+    fmt = fmt or DATA_FORMAT
+    root, _ = os.path.splitext(path)
+    return root + ('.parquet' if fmt == 'parquet' else '.csv')
+
+
+def is_parquet(path):
+    return str(path).endswith(PARQUET_SUFFIXES) or os.path.isdir(path)
+
+
+def typed(df):
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns and df[col].dtype == object:
+            df[col] = df[col].astype('category')
+    return df
+
+
+def read_dataset(path, columns=None, filters=None):
+    if is_parquet(path):
+        df = pd.read_parquet(path, columns=columns, filters=filters)
+        return _restore_partition_columns(df, path)
+    
+    if filters:
+        raise ValueError("Row filters are only supported for Parquet datasets")
+    
+    # keep_default_na=False: region 'NA' (North America) must not be read as missing
+    return pd.read_csv(
+        path,
+        usecols=columns,
+        dtype={col: 'category' for col in CATEGORICAL_COLUMNS},
+        keep_default_na=False,
+        na_values=['']
+    )
+
+
+def read_dataset_chunks(path, chunksize, columns=None):
+    if is_parquet(path):
+        import pyarrow.dataset as ds
+        
+        dataset = ds.dataset(path, format='parquet', partitioning='hive')
+        for batch in dataset.to_batches(columns=columns, batch_size=chunksize):
+            yield _restore_partition_columns(batch.to_pandas(), path)
+        return
+    
+    yield from pd.read_csv(
+        path,
+        usecols=columns,
+        dtype={col: 'category' for col in CATEGORICAL_COLUMNS},
+        keep_default_na=False,
+        na_values=[''],
+        chunksize=chunksize
+    )
+
+
+def dataset_columns(path):
+    if is_parquet(path):
+        import pyarrow.dataset as ds
+        return ds.dataset(path, format='parquet', partitioning='hive').schema.names
+    
+    return pd.read_csv(path, nrows=0).columns.tolist()
+
+
+def write_dataset(df, path, partition_cols=None):
+    if is_parquet(path) and not parquet_available():
+        fallback = dataset_path(path, 'csv')
+        print(f"pyarrow not installed, writing CSV to {fallback} instead of Parquet")
+        path = fallback
+    
+    parent = os.path.dirname(path)
+    if parent:
+        os.makedirs(parent, exist_ok=True)
+    
+    if is_parquet(path):
+        typed(df.copy(deep=False)).to_parquet(path, index=False, compression='snappy', partition_cols=partition_cols)
+    else:
+        if partition_cols:
+            raise ValueError("Partitioning is only supported for Parquet datasets")
+        df.to_csv(path, index=False, encoding='utf-8')
+    
+    return path
+
+
+class DatasetWriter:
+    # Appends DataFrame chunks to one dataset without holding it in memory
+    
+    def __init__(self, path, partition_cols=None):
+        if is_parquet(path) and not parquet_available():
+            path = dataset_path(path, 'csv')
+            print(f"pyarrow not installed, writing CSV to {path} instead of Parquet")
+        
+        if partition_cols and not is_parquet(path):
+            raise ValueError("Partitioning is only supported for Parquet datasets")
+        
+        self.path = path
+        self.partition_cols = partition_cols
+        self.rows = 0
+        self._chunks = 0
+        self._writer = None
+        self._schema = None
+        
+        parent = os.path.dirname(path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+        
+        if os.path.isdir(path):
+            shutil.rmtree(path)
+        elif os.path.exists(path):
+            os.remove(path)
+    
+    def write(self, df):
+        if is_parquet(self.path):
+            self._write_parquet(typed(df.copy(deep=False)))
+        else:
+            df.to_csv(self.path, mode='a', header=self._chunks == 0, index=False, encoding='utf-8')
+        
+        self.rows += len(df)
+        self._chunks += 1
+    
+    def _write_parquet(self, df):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        
+        table = pa.Table.from_pandas(df, schema=self._schema, preserve_index=False)
+        self._schema = self._schema or table.schema
+        
+        if self.partition_cols:
+            pq.write_to_dataset(
+                table,
+                self.path,
+                partition_cols=self.partition_cols,
+                basename_template=f"part-{self._chunks:05d}-{{i}}.parquet"
+            )
+            return
+        
+        if self._writer is None:
+            self._writer = pq.ParquetWriter(self.path, table.schema, compression='snappy')
+        self._writer.write_table(table)
+    
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def dataset_size(path):
+    if os.path.isdir(path):
+        return sum(
+            os.path.getsize(os.path.join(root, name))
+            for root, _, files in os.walk(path)
+            for name in files
+        )
+    return os.path.getsize(path)
+
+
+def _restore_partition_columns(df, path):
+    # Hive partition values come back as categories of strings, e.g. region_encoded=3
+    if not os.path.isdir(path):
+        return df
+    
+    for col in df.columns:
+        if isinstance(df[col].dtype, pd.CategoricalDtype) and col not in CATEGORICAL_COLUMNS:
+            df[col] = pd.to_numeric(df[col].astype(str))
+    
+    return df
@@ -2,12 +2,29 @@ import pandas as pd
 import numpy as np
 import random
 import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
 
+sys.path.append('src')
+from data.dataset_io import write_dataset, dataset_path, dataset_size, DatasetWriter
+
 # Configuration
 N = 1000
-random.seed(42)
-np.random.seed(42)
+SEED = 42
+random.seed(SEED)
+np.random.seed(SEED)
+
+# Générateur vectorisé (tests de charge) : lignes par shard, chaque shard a sa
+# propre graine, le résultat ne dépend donc pas du nombre de processus
+SHARD_ROWS = 250_000
+
+# Historique de livraisons : assez de mois pour remplir les fenêtres 3m et 6m
+EVENT_MONTHS = 12
+DELIVERIES_PER_MONTH = 8
+EVENTS_END_DATE = "2025-11-18"
 
 # Listes de valeurs possibles
 countries = [
@@ -27,59 +44,40 @@ families = ["Câblage", "Injection", "Filtration", "Composite", "Usinage", "Éle
 yes_no = ["yes", "no"]
 criticity_levels = ["low", "medium", "high", "critical"]
 
+# Distributions par niveau de risque, partagées par generate_supplier et le
+# générateur vectorisé (indexées par position dans TIERS)
+TIERS = ["critical", "high", "medium", "low"]
+TIER_CUTOFFS = [0.05, 0.20, 0.50]
+TIER_PARAMS = {
+    "base_risk": [(7, 10), (5, 7), (3, 5), (0.5, 3)],
+    "otd": [(60, 75), (75, 85), (85, 92), (92, 100)],
+    "ppm_mean": [8, 7, 6, 5],
+    "debt_ratio": [(0.7, 0.95), (0.5, 0.8), (0.3, 0.6), (0.1, 0.4)],
+    "country_risk": [(70, 95), (50, 80), (30, 60), (10, 40)],
+    "financial_health": [(0, 3), (3, 5), (5, 7), (7, 10)],
+    "quality_defect": [(4, 10), (2, 5), (1, 3), (0.1, 1.5)],
+    "incidents": [(3, 7), (2, 4), (1, 3), (0, 1)],
+}
+
 def generate_supplier(i):
     country = random.choice(countries)
     sector = random.choice(sectors)
     
     # Distribution réaliste forcée: 50% low, 30% medium, 15% high, 5% critical
     random_dist = random.random()
+    tier = sum(random_dist >= cutoff for cutoff in TIER_CUTOFFS)
+    target_risk = TIERS[tier]
     
-    if random_dist < 0.05:
-        target_risk = "critical"
-        base_risk = random.uniform(7, 10)
-    elif random_dist < 0.20:
-        target_risk = "high"
-        base_risk = random.uniform(5, 7)
-    elif random_dist < 0.50:
-        target_risk = "medium"
-        base_risk = random.uniform(3, 5)
-    else:
-        target_risk = "low"
-        base_risk = random.uniform(0.5, 3)
+    base_risk = random.uniform(*TIER_PARAMS["base_risk"][tier])
     
     # Générer des métriques cohérentes avec le niveau de risque
-    if target_risk == "critical":
-        otd = random.uniform(60, 75)
-        ppm = int(np.random.lognormal(mean=8, sigma=0.5))
-        debt_ratio = random.uniform(0.7, 0.95)
-        country_risk = random.randint(70, 95)
-        financial_health = random.uniform(0, 3)
-        quality_defect = random.uniform(4, 10)
-        incidents = random.randint(3, 7)
-    elif target_risk == "high":
-        otd = random.uniform(75, 85)
-        ppm = int(np.random.lognormal(mean=7, sigma=0.5))
-        debt_ratio = random.uniform(0.5, 0.8)
-        country_risk = random.randint(50, 80)
-        financial_health = random.uniform(3, 5)
-        quality_defect = random.uniform(2, 5)
-        incidents = random.randint(2, 4)
-    elif target_risk == "medium":
-        otd = random.uniform(85, 92)
-        ppm = int(np.random.lognormal(mean=6, sigma=0.5))
-        debt_ratio = random.uniform(0.3, 0.6)
-        country_risk = random.randint(30, 60)
-        financial_health = random.uniform(5, 7)
-        quality_defect = random.uniform(1, 3)
-        incidents = random.randint(1, 3)
-    else:
-        otd = random.uniform(92, 100)
-        ppm = int(np.random.lognormal(mean=5, sigma=0.5))
-        debt_ratio = random.uniform(0.1, 0.4)
-        country_risk = random.randint(10, 40)
-        financial_health = random.uniform(7, 10)
-        quality_defect = random.uniform(0.1, 1.5)
-        incidents = random.randint(0, 1)
+    otd = random.uniform(*TIER_PARAMS["otd"][tier])
+    ppm = int(np.random.lognormal(mean=TIER_PARAMS["ppm_mean"][tier], sigma=0.5))
+    debt_ratio = random.uniform(*TIER_PARAMS["debt_ratio"][tier])
+    country_risk = random.randint(*TIER_PARAMS["country_risk"][tier])
+    financial_health = random.uniform(*TIER_PARAMS["financial_health"][tier])
+    quality_defect = random.uniform(*TIER_PARAMS["quality_defect"][tier])
+    incidents = random.randint(*TIER_PARAMS["incidents"][tier])
     
     risk_score = base_risk
     
@@ -156,11 +154,194 @@ def generate_dataset(n=N):
     
     return df
 
-def save_dataset(df, output_path="data/raw/suppliers_data.csv"):
-    os.makedirs(os.path.dirname(output_path), exist_ok=True)
-    df.to_csv(output_path, index=False, encoding="utf-8")
+def _uniform(rng, n, low, high):
+    return low + (high - low) * rng.random(n)
+
+def _tier_uniform(rng, tier, name):
+    low, high = np.array(TIER_PARAMS[name], dtype=float).T
+    return _uniform(rng, len(tier), low[tier], high[tier])
+
+def _tier_integers(rng, tier, name):
+    # Bornes incluses, comme random.randint
+    low, high = np.array(TIER_PARAMS[name]).T
+    return rng.integers(low[tier], high[tier] + 1)
+
+def _categorical(codes, values):
+    return pd.Categorical.from_codes(codes, categories=values)
+
+def _labels(prefix, ids):
+    # f"{prefix}{i:04d}" sans boucle Python
+    return np.char.add(prefix, np.char.zfill(ids.astype(str), 4))
+
+def generate_shard(start, n, seed=SEED):
+    # Fournisseurs start..start+n-1, chaque colonne tirée d'un coup en NumPy
+    rng = np.random.default_rng([seed, start])
+    ids = np.arange(start, start + n)
+    
+    country = rng.integers(0, len(countries), n)
+    region_names = sorted(set(regions.values()))
+    country_region = np.array([region_names.index(regions[c]) for c in countries])
+    sector = rng.integers(0, len(sectors), n)
+    tier = np.searchsorted(TIER_CUTOFFS, rng.random(n), side='right')
+    
+    otd = _tier_uniform(rng, tier, "otd")
+    ppm_mean = np.array(TIER_PARAMS["ppm_mean"], dtype=float)[tier]
+    quality_defect = _tier_uniform(rng, tier, "quality_defect")
+    country_risk = _tier_integers(rng, tier, "country_risk")
+    
+    def yes_no_draw(mask=None):
+        codes = rng.integers(0, 2, n)
+        if mask is not None:
+            codes = np.where(mask, codes, yes_no.index("no"))
+        return _categorical(codes, yes_no)
+    
+    def days_before(reference, max_days, unit):
+        # Peu de dates possibles : formatées une fois, tirées comme catégories
+        offsets = np.arange(max_days + 1).astype('timedelta64[D]')
+        dates = np.datetime_as_string(np.datetime64(reference, unit) - offsets, unit=unit)
+        return _categorical(rng.integers(0, max_days + 1, n), dates)
+    
+    return pd.DataFrame({
+        "supplier_id": _labels("F", ids),
+        "supplier_name": _labels("Supplier_", ids),
+        "country": _categorical(country, countries),
+        "region": _categorical(country_region[country], region_names),
+        "sector": _categorical(sector, sectors),
+        "family": _categorical(rng.integers(0, len(families), n), families),
+        "single_source": yes_no_draw(),
+        "distance_km": np.round(_uniform(rng, n, 50, 1500), 1),
+        
+        "years_in_business": rng.integers(1, 51, n),
+        "certification_iso": yes_no_draw(),
+        
+        "revenue_millions": np.round(rng.lognormal(mean=3, sigma=1, size=n), 2),
+        "profit_margin": np.round(_uniform(rng, n, -5, 20), 2),
+        "debt_ratio": np.round(_tier_uniform(rng, tier, "debt_ratio"), 3),
+        "liquidity_ratio": np.round(_uniform(rng, n, 0.5, 2.5), 2),
+        "payment_delay_days": rng.integers(0, 31, n),
+        "financial_health_score": np.round(_tier_uniform(rng, tier, "financial_health"), 2),
+        
+        "otd_3m": np.round(otd, 1),
+        "avg_delay_days_3m": np.round(_uniform(rng, n, 0, 6), 1),
+        "delay_volatility_3m": np.round(_uniform(rng, n, 0.3, 2.5), 2),
+        
+        "otd_6m": np.round(_uniform(rng, n, 70, 100), 1),
+        "avg_delay_days_6m": np.round(_uniform(rng, n, 0, 6), 1),
+        "on_time_delivery_rate": np.round(otd, 2),
+        "lead_time_days": rng.integers(5, 61, n),
+        
+        "ppm_3m": rng.lognormal(mean=ppm_mean, sigma=0.5).astype(np.int64),
+        "defect_rate_3m": np.round(quality_defect, 2),
+        "quality_defect_rate": np.round(quality_defect, 2),
+        "cpk_latest": np.round(_uniform(rng, n, 0.9, 1.6), 2),
+        "recurring_8d": rng.integers(0, 8, n),
+        "capacity_utilization": np.round(_uniform(rng, n, 50, 100), 2),
+        
+        "cert_iatf16949": yes_no_draw(),
+        "iatf_16949": yes_no_draw(sector == sectors.index("automotive")),
+        "cert_as9100": yes_no_draw(),
+        "as9100": yes_no_draw(sector == sectors.index("aeronautic")),
+        "cert_expiry_next90d": yes_no_draw(),
+        "reach_compliance": _categorical((rng.random(n) < 0.1).astype(np.int8), yes_no),
+        "esg_score": np.round(_uniform(rng, n, 40, 95), 1),
+        "environmental_score": np.round(_uniform(rng, n, 4, 9), 2),
+        "non_conformity_flag": yes_no_draw(),
+        
+        "country_risk_index": country_risk,
+        "geopolitical_risk": np.round(country_risk / 10, 2),
+        "trade_barrier_flag": yes_no_draw(),
+        "route_disruption_flag": yes_no_draw(),
+        "supply_chain_disruption_history": _tier_integers(rng, tier, "incidents"),
+        "cybersecurity_incidents": rng.integers(0, 4, n),
+        "labor_disputes": rng.integers(0, 3, n),
+        
+        "risk_score": np.round(_tier_uniform(rng, tier, "base_risk"), 2),
+        "criticity_level": _categorical(tier, TIERS),
+        "risk_level": _categorical(tier, TIERS),
+        
+        "last_update": days_before("2025-11-18", 60, "D"),
+        "last_assessment_date": days_before("2025-11-18", 90, "s"),
+    })
+
+def _generate_shards(shards, seed, n_jobs):
+    if n_jobs <= 1:
+        for start, n in shards:
+            yield generate_shard(start, n, seed)
+        return
+    
+    # Au plus deux shards en attente par processus : la mémoire reste bornée
+    # et les shards sont écrits dans l'ordre
+    with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+        pending = deque()
+        for start, n in shards:
+            pending.append(executor.submit(generate_shard, start, n, seed))
+            if len(pending) >= 2 * n_jobs:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+def generate_dataset_sharded(n, output_path=None, shard_rows=SHARD_ROWS, n_jobs=1, seed=SEED, partition_cols=None):
+    output_path = output_path or dataset_path("data/raw/suppliers_data.csv")
+    shards = [(start, min(shard_rows, n - start + 1)) for start in range(1, n + 1, shard_rows)]
+    
+    print(f"Génération de {n} fournisseurs en {len(shards)} shards ({n_jobs} processus)...")
+    start_time = time.perf_counter()
+    
+    with DatasetWriter(output_path, partition_cols=partition_cols) as writer:
+        for df in _generate_shards(shards, seed, n_jobs):
+            writer.write(df)
+    
+    elapsed = time.perf_counter() - start_time
+    print(f"Fichier sauvegardé: {writer.path}")
+    print(f"Total: {writer.rows} fournisseurs en {elapsed:.1f}s ({elapsed / writer.rows * 1e6:.2f}s par million)")
+    print(f"Taille: {dataset_size(writer.path) / 1024 ** 2:.1f} MB")
+    
+    return writer.path
+
+def generate_event_history(suppliers, months=EVENT_MONTHS, deliveries_per_month=DELIVERIES_PER_MONTH,
+                           end_date=EVENTS_END_DATE, seed=SEED):
+    # Une ligne par livraison, cohérente avec le profil du fournisseur :
+    # otd_3m -> probabilité d'être à l'heure, avg_delay_days_3m -> retard moyen,
+    # ppm_3m -> taux de pièces défectueuses
+    rng = np.random.default_rng([seed, len(suppliers)])
+    span_days = int(round(months * 365.25 / 12))
     
-    file_size = os.path.getsize(output_path) / 1024
+    counts = rng.poisson(deliveries_per_month * months, len(suppliers))
+    owner = np.repeat(np.arange(len(suppliers)), counts)
+    n = owner.size
+    
+    otd = suppliers['otd_3m'].to_numpy(dtype=float)[owner] / 100
+    mean_delay = suppliers['avg_delay_days_3m'].to_numpy(dtype=float)[owner]
+    ppm = suppliers['ppm_3m'].to_numpy(dtype=float)[owner]
+    
+    late = rng.random(n) >= otd
+    delay = np.where(late, 1 + np.floor(rng.exponential(mean_delay + 1)), -rng.integers(0, 3, n))
+    quantity = rng.integers(100, 5001, n)
+    
+    events = pd.DataFrame({
+        "supplier_id": suppliers['supplier_id'].to_numpy()[owner],
+        "delivered_at": np.datetime64(end_date, 'D') - rng.integers(0, span_days, n).astype('timedelta64[D]'),
+        "delay_days": delay.astype(np.int64),
+        "quantity": quantity,
+        "defective_units": rng.binomial(quantity, np.minimum(ppm / 1e6, 1)),
+    })
+    
+    # Ordre chronologique, comme un flux d'événements
+    return events.sort_values("delivered_at", kind="stable").reset_index(drop=True)
+
+def save_event_history(events, output_path=None):
+    output_path = write_dataset(events, output_path or dataset_path("data/raw/supplier_events.csv"))
+    print(f"\nHistorique sauvegardé: {output_path} ({len(events)} livraisons)")
+    return output_path
+
+def save_dataset(df, output_path=None, partition_cols=None):
+    output_path = write_dataset(
+        df,
+        output_path or dataset_path("data/raw/suppliers_data.csv"),
+        partition_cols=partition_cols
+    )
+    
+    file_size = dataset_size(output_path) / 1024
     print(f"\nFichier sauvegardé: {output_path}")
     print(f"Taille: {file_size:.2f} KB")
     print(f"\nAperçu:")
@@ -169,6 +350,22 @@ def save_dataset(df, output_path="data/raw/suppliers_data.csv"):
     return output_path
 
 if __name__ == "__main__":
-    df = generate_dataset(n=N)
-    save_dataset(df)
+    # GENERATE_ROWS : jeu de données de test de charge, généré par shards
+    # vectorisés (GENERATE_N_JOBS processus) et écrit au fil de l'eau
+    n_rows = int(os.environ.get('GENERATE_ROWS', 0))
+    
+    if n_rows:
+        generate_dataset_sharded(
+            n_rows,
+            os.environ.get('GENERATE_OUTPUT'),
+            shard_rows=int(os.environ.get('GENERATE_SHARD_ROWS', SHARD_ROWS)),
+            n_jobs=int(os.environ.get('GENERATE_N_JOBS', 1))
+        )
+    else:
+        df = generate_dataset(n=N)
+        save_dataset(df)
+        
+        # GENERATE_EVENTS=1 : historique de livraisons (src/features/rolling_features.py)
+        if os.environ.get('GENERATE_EVENTS') == '1':
+            save_event_history(generate_event_history(df))
     print("\nDataset prêt!")
\ No newline at end of file
@@ -4,6 +4,14 @@ from sklearn.preprocessing import StandardScaler, LabelEncoder
 from sklearn.impute import SimpleImputer
 import joblib
 import os
+import sys
+
+sys.path.append('src')
+from data.dataset_io import (
+    read_dataset, read_dataset_chunks, write_dataset, dataset_path, DatasetWriter
+)
+
+CATEGORICAL_COLS = ['country', 'region', 'sector', 'family']
 
 class FeatureEngineer:
     
@@ -12,8 +20,9 @@ class FeatureEngineer:
         self.label_encoders = {}
         self.imputer = SimpleImputer(strategy='median')
         
-    def create_features(self, df):
-        df = df.copy()
+    def create_features(self, df, copy=True):
+        if copy:
+            df = df.copy()
         
         # Financial composite features
         df['revenue_per_year'] = df['revenue_millions'] / np.maximum(df['years_in_business'], 1)
@@ -85,11 +94,11 @@ class FeatureEngineer:
         
         return df
     
-    def encode_categorical(self, df):
-        df = df.copy()
-        categorical_cols = ['country', 'region', 'sector', 'family']
+    def encode_categorical(self, df, copy=True):
+        if copy:
+            df = df.copy()
         
-        for col in categorical_cols:
+        for col in CATEGORICAL_COLS:
             if col in df.columns:
                 if col not in self.label_encoders:
                     self.label_encoders[col] = LabelEncoder()
@@ -99,7 +108,16 @@ class FeatureEngineer:
         
         return df
     
-    def handle_missing_values(self, df):
+    def handle_missing_values(self, df, fit=True):
+        if not fit:
+            # Imputer already fitted (streaming): fill only the columns with gaps
+            # in this chunk, the others keep their dtype
+            statistics = dict(zip(self.imputer.feature_names_in_, self.imputer.statistics_))
+            gaps = [col for col in df.columns[df.isna().any()] if col in statistics]
+            if gaps:
+                df = df.fillna({col: statistics[col] for col in gaps})
+            return df
+        
         missing = df.isnull().sum()
         if missing.sum() > 0:
             numeric_cols = df.select_dtypes(include=[np.number]).columns
@@ -107,6 +125,10 @@ class FeatureEngineer:
         
         return df
     
+    def fit_label_encoders(self, categories):
+        for col, values in categories.items():
+            self.label_encoders[col] = LabelEncoder().fit(sorted(values))
+    
     def prepare_for_ml(self, df):
         exclude_cols = [
             'supplier_id', 'supplier_name', 'risk_level', 'criticity_level',
@@ -131,11 +153,12 @@ class FeatureEngineer:
         joblib.dump(self.imputer, f'{output_dir}/imputer.pkl')
 
 
-def preprocess_pipeline(input_path='data/raw/suppliers_data.csv', 
-                        output_path='data/processed/suppliers_processed.csv'):
+def preprocess_pipeline(input_path=None, output_path=None, partition_cols=None):
+    input_path = input_path or dataset_path('data/raw/suppliers_data.csv')
+    output_path = output_path or dataset_path('data/processed/suppliers_processed.csv')
     
     print("Loading data...")
-    df = pd.read_csv(input_path)
+    df = read_dataset(input_path)
     print(f"Loaded {len(df)} suppliers")
     
     fe = FeatureEngineer()
@@ -153,13 +176,11 @@ def preprocess_pipeline(input_path='data/raw/suppliers_data.csv',
     X, y = fe.prepare_for_ml(df)
     
     print("Saving processed data...")
-    os.makedirs(os.path.dirname(output_path), exist_ok=True)
-    
     processed_df = X.copy()
     if y is not None:
         processed_df['risk_level'] = y.values
     
-    processed_df.to_csv(output_path, index=False)
+    write_dataset(processed_df, output_path, partition_cols=partition_cols)
     fe.save_transformers()
     
     print(f"Done. Final shape: {processed_df.shape}")
@@ -167,9 +188,77 @@ def preprocess_pipeline(input_path='data/raw/suppliers_data.csv',
     return processed_df, fe
 
 
+def preprocess_pipeline_streaming(input_path=None, output_path=None, chunksize=100_000,
+                                  sample_rows=100_000, partition_cols=None, random_state=42):
+    input_path = input_path or dataset_path('data/raw/suppliers_data.csv')
+    output_path = output_path or dataset_path('data/processed/suppliers_processed.csv')
+    
+    fe = FeatureEngineer()
+    
+    # Pass 1: label encoder vocabularies, the columns read as float in any chunk
+    # and a uniform sample of the whole file for the imputer
+    print("Collecting categories and sampling rows (pass 1)...")
+    rng = np.random.default_rng(random_state)
+    categories = {col: set() for col in CATEGORICAL_COLS}
+    float_cols = set()
+    sample = None
+    for chunk in read_dataset_chunks(input_path, chunksize):
+        for col in CATEGORICAL_COLS:
+            categories[col].update(chunk[col].astype(str).unique())
+        float_cols.update(chunk.select_dtypes(include=[np.floating]).columns)
+        
+        # Reservoir: keep the sample_rows rows with the smallest random keys seen so far
+        chunk = chunk.assign(_sample_key=rng.random(len(chunk)))
+        sample = chunk if sample is None else pd.concat([sample, chunk], ignore_index=True)
+        sample = sample.nsmallest(sample_rows, '_sample_key')
+    fe.fit_label_encoders(categories)
+    
+    # A column read as int in one chunk and float (gaps) in another is float
+    # everywhere, so every chunk is written with the same dtypes
+    float_dtypes = {col: np.float64 for col in float_cols}
+    
+    print(f"Fitting imputer on a {len(sample)} rows sample...")
+    sample = fe.create_features(sample.drop(columns='_sample_key').astype(float_dtypes), copy=False)
+    fe.imputer.fit(sample.select_dtypes(include=[np.number]))
+    del sample
+    
+    # Pass 2: transform and write chunk by chunk, memory bounded by chunksize
+    print(f"Transforming in chunks of {chunksize} rows (pass 2)...")
+    risk_distribution = {}
+    
+    with DatasetWriter(output_path, partition_cols=partition_cols) as writer:
+        for chunk in read_dataset_chunks(input_path, chunksize):
+            chunk = fe.create_features(chunk.astype(float_dtypes), copy=False)
+            chunk = fe.handle_missing_values(chunk, fit=False)
+            chunk = fe.encode_categorical(chunk, copy=False)
+            X, y = fe.prepare_for_ml(chunk)
+            
+            if y is not None:
+                X = X.assign(risk_level=y.values)
+                for level, count in y.value_counts().items():
+                    risk_distribution[level] = risk_distribution.get(level, 0) + int(count)
+            
+            writer.write(X)
+            print(f"  {writer.rows} suppliers written")
+    
+    fe.save_transformers()
+    
+    print(f"Done. {writer.rows} suppliers written to {writer.path}")
+    
+    return {'rows': writer.rows, 'output_path': writer.path, 'risk_distribution': risk_distribution}, fe
+
+
 if __name__ == "__main__":
-    df_processed, feature_engineer = preprocess_pipeline()
-    print("\nPreprocessing completed successfully")
-    print(f"\nRisk distribution:")
-    if 'risk_level' in df_processed.columns:
-        print(df_processed['risk_level'].value_counts())
\ No newline at end of file
+    chunksize = int(os.environ.get('PREPROCESS_CHUNKSIZE', 0))
+    
+    if chunksize:
+        summary, feature_engineer = preprocess_pipeline_streaming(chunksize=chunksize)
+        print("\nPreprocessing completed successfully")
+        print(f"\nRisk distribution:")
+        print(summary['risk_distribution'])
+    else:
+        df_processed, feature_engineer = preprocess_pipeline()
+        print("\nPreprocessing completed successfully")
+        print(f"\nRisk distribution:")
+        if 'risk_level' in df_processed.columns:
+            print(df_processed['risk_level'].value_counts())
\ No newline at end of file
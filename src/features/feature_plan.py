@@ -0,0 +1,243 @@
+import math
+from operator import itemgetter
+import numpy as np
+
+# Record fields read by derive_features (numeric, then yes/no certifications)
+DERIVE_INPUTS = [
+    'years_in_business', 'revenue_millions', 'debt_ratio', 'profit_margin',
+    'on_time_delivery_rate', 'quality_defect_rate', 'environmental_score',
+    'geopolitical_risk', 'financial_health_score', 'capacity_utilization',
+    'lead_time_days', 'supply_chain_disruption_history', 'cybersecurity_incidents',
+    'labor_disputes'
+]
+CERTIFICATION_INPUTS = ['iatf_16949', 'as9100', 'reach_compliance', 'certification_iso']
+
+# Below this many rows the per-row loop beats the column-wise batch path: its
+# ~60 NumPy calls cost about 65 us, a row 9 us in the loop against 2 us in the
+# batch (benchmarks/feature_latency.py)
+VECTOR_MIN_ROWS = 10
+
+
+def derive_features(r):
+    # Scalar mirror of FeatureEngineer.create_features for a single record
+    years = r['years_in_business']
+    revenue = r['revenue_millions']
+    debt_ratio = r['debt_ratio']
+    profit_margin = r['profit_margin']
+    otd = r['on_time_delivery_rate']
+    defect_rate = r['quality_defect_rate']
+    environmental = r['environmental_score']
+    geopolitical = r['geopolitical_risk']
+    
+    iatf = int(r['iatf_16949'] == 'yes')
+    as9100 = int(r['as9100'] == 'yes')
+    reach = int(r['reach_compliance'] == 'yes')
+    iso = int(r['certification_iso'] == 'yes')
+    certification_count = iso + iatf + as9100 + reach
+    has_sector_certification = iatf | as9100
+    total_incidents = (
+        r['supply_chain_disruption_history'] +
+        r['cybersecurity_incidents'] +
+        r['labor_disputes']
+    )
+    
+    return {
+        'revenue_per_year': revenue / max(years, 1),
+        'financial_stability': (
+            (r['financial_health_score'] * 0.4) +
+            ((1 - debt_ratio) * 5 * 0.3) +
+            (profit_margin * 0.3)
+        ),
+        'operational_excellence': (
+            (otd * 0.5) +
+            (min(max(100 - defect_rate * 10, 0), 100) * 0.3) +
+            (r['capacity_utilization'] * 0.2)
+        ) / 10,
+        'logistics_efficiency': otd / math.log1p(r['lead_time_days']),
+        'maturity_score': min(max(years / 20, 0), 1) * 10,
+        'is_established': int(years >= 10),
+        'is_young_company': int(years < 5),
+        'iatf_16949_binary': iatf,
+        'as9100_binary': as9100,
+        'reach_compliance_binary': reach,
+        'certification_iso_binary': iso,
+        'certification_count': certification_count,
+        'has_sector_certification': has_sector_certification,
+        'compliance_score': (
+            (certification_count * 2) +
+            environmental +
+            (has_sector_certification * 2)
+        ) / 1.2,
+        'total_incidents': total_incidents,
+        'external_risk_score': (
+            (geopolitical * 0.5) +
+            (total_incidents * 2) +
+            ((10 - environmental) * 0.3)
+        ),
+        'risk_debt_interaction': debt_ratio * geopolitical,
+        'quality_delivery_interaction': defect_rate * (100 - otd),
+        'debt_to_revenue_ratio': debt_ratio / max(revenue, 0.1),
+        'profitability_ratio': profit_margin / max(revenue, 0.1),
+    }
+
+
+def derive_feature_columns(c):
+    # Column-wise derive_features: c maps every DERIVE_INPUTS field to a float
+    # array and every CERTIFICATION_INPUTS field to a 0/1 float array
+    years = c['years_in_business']
+    revenue = c['revenue_millions']
+    debt_ratio = c['debt_ratio']
+    profit_margin = c['profit_margin']
+    otd = c['on_time_delivery_rate']
+    defect_rate = c['quality_defect_rate']
+    environmental = c['environmental_score']
+    geopolitical = c['geopolitical_risk']
+    
+    iatf = c['iatf_16949']
+    as9100 = c['as9100']
+    reach = c['reach_compliance']
+    iso = c['certification_iso']
+    certification_count = iso + iatf + as9100 + reach
+    has_sector_certification = np.maximum(iatf, as9100)
+    total_incidents = (
+        c['supply_chain_disruption_history'] +
+        c['cybersecurity_incidents'] +
+        c['labor_disputes']
+    )
+    
+    return {
+        'revenue_per_year': revenue / np.maximum(years, 1),
+        'financial_stability': (
+            (c['financial_health_score'] * 0.4) +
+            ((1 - debt_ratio) * 5 * 0.3) +
+            (profit_margin * 0.3)
+        ),
+        'operational_excellence': (
+            (otd * 0.5) +
+            (np.clip(100 - defect_rate * 10, 0, 100) * 0.3) +
+            (c['capacity_utilization'] * 0.2)
+        ) / 10,
+        'logistics_efficiency': otd / np.log1p(c['lead_time_days']),
+        'maturity_score': np.clip(years / 20, 0, 1) * 10,
+        'is_established': (years >= 10).astype(float),
+        'is_young_company': (years < 5).astype(float),
+        'iatf_16949_binary': iatf,
+        'as9100_binary': as9100,
+        'reach_compliance_binary': reach,
+        'certification_iso_binary': iso,
+        'certification_count': certification_count,
+        'has_sector_certification': has_sector_certification,
+        'compliance_score': (
+            (certification_count * 2) +
+            environmental +
+            (has_sector_certification * 2)
+        ) / 1.2,
+        'total_incidents': total_incidents,
+        'external_risk_score': (
+            (geopolitical * 0.5) +
+            (total_incidents * 2) +
+            ((10 - environmental) * 0.3)
+        ),
+        'risk_debt_interaction': debt_ratio * geopolitical,
+        'quality_delivery_interaction': defect_rate * (100 - otd),
+        'debt_to_revenue_ratio': debt_ratio / np.maximum(revenue, 0.1),
+        'profitability_ratio': profit_margin / np.maximum(revenue, 0.1),
+    }
+
+DERIVED_FEATURES = list(derive_features({
+    **dict.fromkeys(DERIVE_INPUTS, 1), **dict.fromkeys(CERTIFICATION_INPUTS, 'no')
+}))
+
+
+class FeaturePlan:
+    
+    def __init__(self, feature_columns, categories):
+        # categories: column -> encoder classes, in code order
+        self.feature_columns = list(feature_columns)
+        self.n_features = len(self.feature_columns)
+        self.category_codes = {
+            col: {label: code for code, label in enumerate(classes)}
+            for col, classes in categories.items()
+        }
+        
+        # Batch path: record fields are read with one itemgetter call per record
+        # (numeric fields, then string fields) and every feature is computed per column
+        encoded = {col + '_encoded' for col in self.category_codes}
+        derived = set(DERIVED_FEATURES)
+        passthrough = [col for col in self.feature_columns if col not in encoded and col not in derived]
+        self.numeric_inputs = list(dict.fromkeys(DERIVE_INPUTS + passthrough))
+        self.string_inputs = CERTIFICATION_INPUTS + list(self.category_codes)
+        self._numeric_getter = itemgetter(*self.numeric_inputs)
+        self._string_getter = itemgetter(*self.string_inputs)
+    
+    @classmethod
+    def from_feature_engineer(cls, feature_engineer, template_input, feature_columns=None):
+        # Column order comes from the pandas path itself (or the model's training
+        # columns when known), so both paths stay aligned
+        import pandas as pd
+        
+        df = feature_engineer.create_features(pd.DataFrame([template_input]))
+        df = feature_engineer.encode_categorical(df)
+        X, _ = feature_engineer.prepare_for_ml(df)
+        
+        if feature_columns is not None:
+            X = X[list(feature_columns)]
+        
+        categories = {col: encoder.classes_ for col, encoder in feature_engineer.label_encoders.items()}
+        plan = cls(X.columns, categories)
+        
+        if not np.allclose(plan.transform(template_input), X.to_numpy(dtype=float)):
+            raise ValueError("Feature plan does not match the pandas feature pipeline")
+        
+        return plan
+    
+    def _row_values(self, record):
+        values = dict(record)
+        values.update(derive_features(record))
+        
+        for col, codes in self.category_codes.items():
+            label = str(record[col])
+            if label not in codes:
+                raise ValueError(f"y contains previously unseen labels: '{label}' for {col}")
+            values[col + '_encoded'] = codes[label]
+        
+        return [values[col] for col in self.feature_columns]
+    
+    def transform(self, record):
+        row = np.empty((1, self.n_features))
+        row[0] = self._row_values(record)
+        return row
+    
+    def transform_many(self, records):
+        n = len(records)
+        if n < VECTOR_MIN_ROWS:
+            X = np.empty((n, self.n_features))
+            for i, record in enumerate(records):
+                X[i] = self._row_values(record)
+            return X
+        
+        numeric = np.array(list(map(self._numeric_getter, records)), dtype=float).reshape(n, -1)
+        columns = dict(zip(self.numeric_inputs, numeric.T))
+        strings = dict(zip(self.string_inputs, zip(*map(self._string_getter, records))))
+        
+        for col in CERTIFICATION_INPUTS:
+            columns[col] = np.fromiter(map('yes'.__eq__, strings[col]), dtype=float, count=n)
+        
+        columns.update(derive_feature_columns(columns))
+        
+        for col, codes in self.category_codes.items():
+            try:
+                columns[col + '_encoded'] = np.fromiter(map(codes.__getitem__, strings[col]), dtype=float, count=n)
+            except KeyError:
+                # Non-string labels are matched as strings, like the single-row path
+                labels = list(map(str, strings[col]))
+                encoded = list(map(codes.get, labels))
+                if None in encoded:
+                    label = labels[encoded.index(None)]
+                    raise ValueError(f"y contains previously unseen labels: '{label}' for {col}")
+                columns[col + '_encoded'] = np.array(encoded, dtype=float)
+        
+        X = np.empty((n, self.n_features))
+        for i, col in enumerate(self.feature_columns):
+            X[:, i] = columns[col]
+        return X
@@ -0,0 +1,198 @@
+import math
+import os
+import sys
+from bisect import bisect, insort
+from collections import deque
+from datetime import timedelta
+
+sys.path.append('src')
+
+# Rolling windows behind the *_3m / *_6m snapshot columns
+WINDOWS = {'3m': timedelta(days=91), '6m': timedelta(days=182)}
+
+METRICS = ['otd', 'avg_delay_days', 'delay_volatility', 'ppm']
+
+# ppm and quality_defect_rate (percent) are drawn independently per risk tier in
+# src/data/generate_data.py, so ppm / 1e4 is not on the training scale (a few
+# hundredths of a percent against 0.1-10 %). ln(ppm) is mapped piecewise-linearly
+# from the tier means (ppm_mean 5..8, low to critical) onto the middle of the
+# tier's quality_defect range, clamped to the range ends
+LOG_PPM_ANCHORS = [4.0, 5.0, 6.0, 7.0, 8.0, 9.0]
+DEFECT_RATE_ANCHORS = [0.1, 0.8, 2.0, 3.5, 7.0, 10.0]
+
+
+def defect_rate_from_ppm(ppm):
+    # quality_defect_rate equivalent (training scale) of a window's ppm
+    x = math.log(max(ppm, 1.0))
+    if x <= LOG_PPM_ANCHORS[0]:
+        return DEFECT_RATE_ANCHORS[0]
+    if x >= LOG_PPM_ANCHORS[-1]:
+        return DEFECT_RATE_ANCHORS[-1]
+    
+    i = bisect(LOG_PPM_ANCHORS, x)
+    x0, x1 = LOG_PPM_ANCHORS[i - 1], LOG_PPM_ANCHORS[i]
+    y0, y1 = DEFECT_RATE_ANCHORS[i - 1], DEFECT_RATE_ANCHORS[i]
+    return y0 + (y1 - y0) * (x - x0) / (x1 - x0)
+
+
+class RollingWindow:
+    # Events of the last `length` with running sums: adding an event and
+    # expiring the oldest one are both O(1), nothing is recomputed
+    
+    __slots__ = ('length', 'events', 'count', 'on_time', 'delay_sum', 'delay_sq_sum', 'quantity', 'defects')
+    
+    def __init__(self, length):
+        self.length = length
+        self.events = deque()
+        self._reset()
+    
+    def _reset(self):
+        self.count = 0
+        self.on_time = 0
+        self.delay_sum = 0.0
+        self.delay_sq_sum = 0.0
+        self.quantity = 0
+        self.defects = 0
+    
+    def add(self, event):
+        # event: (timestamp, delay_days, quantity, defective_units)
+        if self.events and event[0] < self.events[-1][0]:
+            # Late arrival: keep the deque in time order so expiry stays at the left end
+            insort(self.events, event)
+        else:
+            self.events.append(event)
+        self._apply(event, 1)
+    
+    def expire(self, now):
+        cutoff = now - self.length
+        while self.events and self.events[0][0] <= cutoff:
+            self._apply(self.events.popleft(), -1)
+        
+        # Start again from exact zeros rather than accumulated float error
+        if not self.events:
+            self._reset()
+    
+    def _apply(self, event, sign):
+        _, delay, quantity, defects = event
+        lateness = max(delay, 0)
+        
+        self.count += sign
+        self.on_time += sign * (delay <= 0)
+        self.delay_sum += sign * lateness
+        self.delay_sq_sum += sign * lateness * lateness
+        self.quantity += sign * quantity
+        self.defects += sign * defects
+    
+    def features(self):
+        if not self.count:
+            return dict.fromkeys(METRICS)
+        
+        mean_delay = self.delay_sum / self.count
+        variance = max(self.delay_sq_sum / self.count - mean_delay ** 2, 0.0)
+        
+        return {
+            'otd': 100.0 * self.on_time / self.count,
+            'avg_delay_days': mean_delay,
+            'delay_volatility': math.sqrt(variance),
+            'ppm': 1e6 * self.defects / self.quantity if self.quantity else 0.0
+        }
+
+
+class RollingFeatureEngine:
+    # Per-supplier rolling delivery/quality features, updated event by event.
+    # Events are expected roughly in time order per supplier; features can be
+    # read at any time, optionally as of a later date
+    
+    def __init__(self, windows=None):
+        self.windows = windows or WINDOWS
+        self.suppliers = {}
+        self.events = 0
+    
+    def update(self, supplier_id, timestamp, delay_days, quantity=0, defective_units=0):
+        state = self.suppliers.get(supplier_id)
+        if state is None:
+            state = self.suppliers[supplier_id] = {
+                name: RollingWindow(length) for name, length in self.windows.items()
+            }
+        
+        event = (timestamp, delay_days, quantity, defective_units)
+        for window in state.values():
+            window.add(event)
+            window.expire(window.events[-1][0])
+        
+        self.events += 1
+        return self._features(state)
+    
+    def features(self, supplier_id, as_of=None):
+        state = self.suppliers.get(supplier_id)
+        if state is None:
+            return None
+        
+        if as_of is not None:
+            for window in state.values():
+                window.expire(as_of)
+        
+        return self._features(state)
+    
+    def event_counts(self, supplier_id):
+        # Deliveries currently held by each window (as of the last features() call)
+        state = self.suppliers.get(supplier_id)
+        if state is None:
+            return dict.fromkeys(self.windows, 0)
+        return {name: window.count for name, window in state.items()}
+    
+    def _features(self, state):
+        features = {}
+        for name, window in state.items():
+            for metric, value in window.features().items():
+                features[f"{metric}_{name}"] = value
+        return features
+    
+    def consume(self, events):
+        # events: DataFrame with supplier_id, delivered_at, delay_days, quantity, defective_units
+        # Plain Python values: pandas Timestamps are much slower to compare
+        rows = zip(
+            events['supplier_id'].tolist(),
+            events['delivered_at'].to_numpy(dtype='datetime64[us]').tolist(),
+            events['delay_days'].tolist(),
+            events['quantity'].tolist(),
+            events['defective_units'].tolist()
+        )
+        for supplier_id, delivered_at, delay, quantity, defects in rows:
+            self.update(supplier_id, delivered_at, delay, quantity, defects)
+        return len(events)
+    
+    def snapshot(self, as_of=None):
+        import pandas as pd
+        
+        rows = {supplier_id: self.features(supplier_id, as_of) for supplier_id in self.suppliers}
+        df = pd.DataFrame.from_dict(rows, orient='index')
+        df.index.name = 'supplier_id'
+        return df.reset_index()
+
+
+def build_rolling_features(events_path=None, output_path=None, chunksize=100_000):
+    from data.dataset_io import read_dataset_chunks, write_dataset, dataset_path
+    
+    events_path = events_path or dataset_path('data/raw/supplier_events.csv')
+    output_path = output_path or dataset_path('data/processed/supplier_rolling_features.csv')
+    
+    # The event log is streamed: memory holds the open windows, not the history
+    engine = RollingFeatureEngine()
+    last_event = None
+    for chunk in read_dataset_chunks(events_path, chunksize):
+        chunk['delivered_at'] = chunk['delivered_at'].astype('datetime64[s]')
+        engine.consume(chunk)
+        chunk_last = chunk['delivered_at'].max()
+        last_event = chunk_last if last_event is None else max(last_event, chunk_last)
+        print(f"  {engine.events} events, {len(engine.suppliers)} suppliers")
+    
+    snapshot = engine.snapshot(as_of=last_event).round(2)
+    write_dataset(snapshot, output_path)
+    print(f"Rolling features as of {last_event:%Y-%m-%d} written to {output_path}")
+    
+    return snapshot
+
+
+if __name__ == "__main__":
+    build_rolling_features(chunksize=int(os.environ.get('ROLLING_CHUNKSIZE', 100_000)))
@@ -0,0 +1,129 @@
+import json
+import os
+import numpy as np
+from typing import Dict, List
+from pathlib import Path
+
+MANIFEST_FILE = "manifest.json"
+FORMAT_VERSION = 1
+
+def _softmax(raw: np.ndarray) -> np.ndarray:
+    raw = raw - raw.max(axis=1, keepdims=True)
+    exp = np.exp(raw)
+    return exp / exp.sum(axis=1, keepdims=True)
+
+def _sigmoid(raw: np.ndarray) -> np.ndarray:
+    positive = 1.0 / (1.0 + np.exp(-raw[:, 0]))
+    return np.column_stack([1.0 - positive, positive])
+
+class CompiledModel:
+    # Array-based export of a trained classifier, evaluated with NumPy only.
+    # Tree ensembles are flattened into one node table shared by all trees;
+    # linear models keep their coefficients. The manifest also carries the
+    # feature plan (column order, category codes) and the risk labels
+    
+    def __init__(self, manifest: Dict, arrays: Dict[str, np.ndarray]):
+        if manifest.get('format_version') != FORMAT_VERSION:
+            raise ValueError(f"Unsupported compiled model format {manifest.get('format_version')}")
+        
+        self.manifest = manifest
+        self.arrays = arrays
+        
+        self.kind = manifest['kind']
+        self.output = manifest['output']
+        self.classes_ = np.asarray(manifest['classes'])
+        self.risk_classes = np.asarray(manifest['risk_classes'], dtype=object)
+        self.feature_columns: List[str] = manifest['feature_columns']
+        self.categories: Dict[str, List[str]] = manifest['categories']
+        
+        if self.kind == 'trees':
+            self.max_depth = manifest['max_depth']
+            self.roots = arrays['roots']
+            self.feature = arrays['feature']
+            self.threshold = arrays['threshold']
+            self.left = arrays['left']
+            self.right = arrays['right']
+            self.missing_left = arrays['missing_left']
+            self.value = arrays['value']
+            self.tree_class = arrays.get('tree_class')
+        elif self.kind == 'linear':
+            self.coef = arrays['coef']
+        else:
+            raise ValueError(f"Unknown compiled model kind '{self.kind}'")
+        
+        self.baseline = arrays['baseline']
+    
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> 'CompiledModel':
+        # Arrays are memory-mapped read-only by default: every process serving the
+        # same export shares one page-cache copy instead of a private one
+        path = Path(path)
+        manifest = json.loads((path / MANIFEST_FILE).read_text())
+        mmap_mode = 'r' if mmap else None
+        arrays = {name: np.load(path / f"{name}.npy", mmap_mode=mmap_mode) for name in manifest['arrays']}
+        return cls(manifest, arrays)
+    
+    def save(self, path: str):
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        
+        # Files are replaced, never rewritten in place: a running worker keeps its
+        # mapping of the old inode instead of reading a truncated file
+        for name, array in self.arrays.items():
+            self._replace(path / f"{name}.npy", lambda f: np.save(f, np.ascontiguousarray(array)))
+        
+        manifest = dict(self.manifest, arrays=sorted(self.arrays))
+        self._replace(path / MANIFEST_FILE, lambda f: f.write(json.dumps(manifest, indent=2).encode()))
+    
+    @staticmethod
+    def _replace(target: Path, write):
+        tmp = target.with_name(target.name + '.tmp')
+        with open(tmp, 'wb') as f:
+            write(f)
+        os.replace(tmp, target)
+    
+    def raw_scores(self, X: np.ndarray) -> np.ndarray:
+        # Margin before the output transform, without the baseline
+        X = np.asarray(X, dtype=np.float64)
+        
+        if self.kind == 'linear':
+            return X @ self.coef.T
+        
+        leaf_values = self.value[self._leaves(X)]
+        
+        if self.output == 'mean':
+            return leaf_values.mean(axis=1)
+        
+        # Boosting: every tree adds its (already scaled) leaf value to one class
+        return leaf_values[:, :, 0] @ self.tree_class
+    
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        raw = self.raw_scores(X) + self.baseline
+        
+        if self.output == 'softmax':
+            return _softmax(raw)
+        if self.output == 'sigmoid':
+            return _sigmoid(raw)
+        return raw
+    
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        return self.classes_[self.predict_proba(X).argmax(axis=1)]
+    
+    def _leaves(self, X: np.ndarray) -> np.ndarray:
+        # All trees walk down together, one level per step; leaves point to
+        # themselves so finished trees stay put. Trees split on float32 features
+        X = X.astype(np.float32).astype(np.float64)
+        rows = np.arange(len(X))[:, None]
+        nodes = np.repeat(self.roots[None, :], len(X), axis=0)
+        
+        for _ in range(self.max_depth):
+            values = X[rows, self.feature[nodes]]
+            go_left = values <= self.threshold[nodes]
+            
+            missing = np.isnan(values)
+            if missing.any():
+                go_left = np.where(missing, self.missing_left[nodes], go_left)
+            
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+        
+        return nodes
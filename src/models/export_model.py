@@ -0,0 +1,214 @@
+import json
+import numpy as np
+import joblib
+import os
+import sys
+import warnings
+
+sys.path.append('src')
+from models.compiled_model import CompiledModel, FORMAT_VERSION
+from data.dataset_io import read_dataset, dataset_path
+
+COMPILED_MODEL_DIR = 'models/compiled'
+
+# Rows of the processed dataset used to check the export against the original model
+PARITY_ROWS = 500
+PARITY_ATOL = 1e-6
+
+def _sklearn_tree(estimator, values):
+    tree = estimator.tree_
+    nodes = np.arange(tree.node_count)
+    leaf = tree.children_left == -1
+    missing_left = getattr(tree, 'missing_go_to_left', np.zeros(tree.node_count))
+    
+    # Leaves point to themselves and always go "left"
+    return {
+        'feature': np.where(leaf, 0, tree.feature),
+        'threshold': np.where(leaf, np.inf, tree.threshold),
+        'left': np.where(leaf, nodes, tree.children_left),
+        'right': np.where(leaf, nodes, tree.children_right),
+        'missing_left': np.asarray(missing_left, dtype=bool),
+        'value': values,
+        'depth': tree.max_depth
+    }
+
+def _xgboost_tree(dump, feature_index):
+    nodes = []
+    
+    def walk(node):
+        nodes.append(node)
+        for child in node.get('children', []):
+            walk(child)
+    
+    walk(dump)
+    position = {node['nodeid']: i for i, node in enumerate(nodes)}
+    
+    tree = {
+        'feature': np.zeros(len(nodes), dtype=np.int64),
+        'threshold': np.full(len(nodes), np.inf),
+        'left': np.arange(len(nodes)),
+        'right': np.arange(len(nodes)),
+        'missing_left': np.zeros(len(nodes), dtype=bool),
+        'value': np.zeros((len(nodes), 1)),
+        'depth': max(node.get('depth', 0) for node in nodes) + 1
+    }
+    
+    for i, node in enumerate(nodes):
+        if 'leaf' in node:
+            tree['value'][i, 0] = node['leaf']
+            continue
+        
+        # XGBoost goes left when x < split on float32 values, i.e. x <= previous float32
+        split = np.float32(node['split_condition'])
+        tree['feature'][i] = feature_index[node['split']]
+        tree['threshold'][i] = np.nextafter(split, np.float32(-np.inf))
+        tree['left'][i] = position[node['yes']]
+        tree['right'][i] = position[node['no']]
+        tree['missing_left'][i] = node['missing'] == node['yes']
+    
+    return tree
+
+def _pack_trees(trees):
+    # Concatenate every tree into one node table; child indices become global
+    offsets = np.cumsum([0] + [len(tree['feature']) for tree in trees[:-1]])
+    
+    return {
+        'roots': offsets.astype(np.int32),
+        'feature': np.concatenate([tree['feature'] for tree in trees]).astype(np.int32),
+        'threshold': np.concatenate([tree['threshold'] for tree in trees]).astype(np.float64),
+        'left': np.concatenate([tree['left'] + offset for tree, offset in zip(trees, offsets)]).astype(np.int32),
+        'right': np.concatenate([tree['right'] + offset for tree, offset in zip(trees, offsets)]).astype(np.int32),
+        'missing_left': np.concatenate([tree['missing_left'] for tree in trees]),
+        'value': np.concatenate([tree['value'] for tree in trees]).astype(np.float64)
+    }, max(tree['depth'] for tree in trees)
+
+def _class_matrix(n_trees, n_outputs, tree_class):
+    matrix = np.zeros((n_trees, n_outputs))
+    matrix[np.arange(n_trees), tree_class] = 1.0
+    return matrix
+
+def _export_forest(model):
+    estimators = getattr(model, 'estimators_', [model])
+    trees = []
+    for estimator in estimators:
+        values = estimator.tree_.value[:, 0, :]
+        trees.append(_sklearn_tree(estimator, values / values.sum(axis=1, keepdims=True)))
+    
+    arrays, max_depth = _pack_trees(trees)
+    arrays['baseline'] = np.zeros(model.n_classes_)
+    return arrays, {'kind': 'trees', 'output': 'mean', 'max_depth': int(max_depth)}
+
+def _export_gradient_boosting(model):
+    n_outputs = model.estimators_.shape[1]
+    trees, tree_class = [], []
+    for stage in model.estimators_:
+        for k, estimator in enumerate(stage):
+            trees.append(_sklearn_tree(estimator, estimator.tree_.value[:, 0, :] * model.learning_rate))
+            tree_class.append(k)
+    
+    arrays, max_depth = _pack_trees(trees)
+    arrays['tree_class'] = _class_matrix(len(trees), n_outputs, tree_class)
+    arrays['baseline'] = np.zeros(n_outputs)
+    output = 'softmax' if n_outputs > 1 else 'sigmoid'
+    return arrays, {'kind': 'trees', 'output': output, 'max_depth': int(max_depth)}
+
+def _export_xgboost(model, feature_columns):
+    booster = model.get_booster()
+    n_outputs = model.n_classes_ if model.n_classes_ > 2 else 1
+    parallel_trees = int(model.get_params().get('num_parallel_tree') or 1)
+    
+    feature_index = {name: i for i, name in enumerate(feature_columns)}
+    feature_index.update({f"f{i}": i for i in range(len(feature_columns))})
+    
+    dumps = [json.loads(tree) for tree in booster.get_dump(dump_format='json')]
+    trees = [_xgboost_tree(dump, feature_index) for dump in dumps]
+    tree_class = [(i // parallel_trees) % n_outputs for i in range(len(trees))]
+    
+    arrays, max_depth = _pack_trees(trees)
+    arrays['tree_class'] = _class_matrix(len(trees), n_outputs, tree_class)
+    arrays['baseline'] = np.zeros(n_outputs)
+    output = 'softmax' if n_outputs > 1 else 'sigmoid'
+    return arrays, {'kind': 'trees', 'output': output, 'max_depth': int(max_depth)}
+
+def _export_linear(model):
+    arrays = {
+        'coef': np.asarray(model.coef_, dtype=np.float64),
+        'baseline': np.asarray(model.intercept_, dtype=np.float64)
+    }
+    output = 'softmax' if len(model.classes_) > 2 else 'sigmoid'
+    return arrays, {'kind': 'linear', 'output': output}
+
+def _raw_margin(model, X):
+    # Untransformed scores of the original model, used to recover boosting baselines
+    if type(model).__name__.startswith('XGB'):
+        margin = model.predict(X, output_margin=True)
+    else:
+        margin = model.decision_function(X)
+    return np.asarray(margin, dtype=np.float64).reshape(len(X), -1)
+
+def export_model(model, label_encoder, label_encoders, feature_columns, output_dir, X_check):
+    # Writes `model` with its feature plan and encoders as a CompiledModel and
+    # checks it against the original predict_proba on X_check
+    feature_columns = list(feature_columns)
+    X = np.asarray(X_check[feature_columns] if hasattr(X_check, 'columns') else X_check, dtype=np.float64)
+    
+    name = type(model).__name__
+    if name in ('RandomForestClassifier', 'ExtraTreesClassifier', 'DecisionTreeClassifier', 'ExtraTreeClassifier'):
+        arrays, spec = _export_forest(model)
+    elif name == 'GradientBoostingClassifier':
+        arrays, spec = _export_gradient_boosting(model)
+    elif name == 'XGBClassifier':
+        arrays, spec = _export_xgboost(model, feature_columns)
+    elif name == 'LogisticRegression':
+        arrays, spec = _export_linear(model)
+    else:
+        raise ValueError(f"No compiled format for {name}, keep serving the pickle")
+    
+    manifest = {
+        'format_version': FORMAT_VERSION,
+        'model_type': name,
+        **spec,
+        'classes': [int(c) for c in model.classes_],
+        'risk_classes': [str(c) for c in label_encoder.classes_],
+        'feature_columns': feature_columns,
+        'categories': {col: [str(c) for c in encoder.classes_] for col, encoder in label_encoders.items()}
+    }
+    
+    compiled = CompiledModel(manifest, arrays)
+    
+    with warnings.catch_warnings():
+        warnings.filterwarnings("ignore", message="X does not have valid feature names")
+        
+        if spec['kind'] == 'trees' and spec['output'] != 'mean':
+            arrays['baseline'] = (_raw_margin(model, X) - compiled.raw_scores(X)).mean(axis=0)
+            compiled = CompiledModel(manifest, arrays)
+        
+        expected = model.predict_proba(X)
+    
+    actual = compiled.predict_proba(X)
+    if not np.allclose(actual, expected, atol=PARITY_ATOL) or not (actual.argmax(axis=1) == expected.argmax(axis=1)).all():
+        raise ValueError(f"Compiled {name} does not match the original model "
+                         f"(max abs diff {np.abs(actual - expected).max():.2e})")
+    
+    compiled.save(output_dir)
+    
+    size = sum(os.path.getsize(os.path.join(output_dir, f)) for f in os.listdir(output_dir))
+    print(f"Compiled {name} exported to {output_dir} ({size / 1024:.0f} KB, parity checked on {len(X)} rows)")
+    
+    return compiled
+
+
+def main(model_dir='models', data_path=None, output_dir=COMPILED_MODEL_DIR):
+    model = joblib.load(f'{model_dir}/best_model.pkl')
+    label_encoder = joblib.load(f'{model_dir}/label_encoder.pkl')
+    label_encoders = joblib.load(f'{model_dir}/label_encoders.pkl')
+    
+    data_path = data_path or dataset_path('data/processed/suppliers_processed.csv')
+    X_check = read_dataset(data_path).drop('risk_level', axis=1).head(PARITY_ROWS)
+    
+    feature_columns = getattr(model, 'feature_names_in_', X_check.columns)
+    export_model(model, label_encoder, label_encoders, feature_columns, output_dir, X_check)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,31 +1,251 @@
 import pandas as pd
 import numpy as np
-from sklearn.model_selection import train_test_split, cross_val_score, GridSearchCV
+from sklearn.model_selection import train_test_split, cross_validate, ParameterSampler, StratifiedKFold
+from sklearn.base import clone
 from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier
 from sklearn.linear_model import LogisticRegression
 from sklearn.svm import SVC
 from xgboost import XGBClassifier
 from sklearn.metrics import classification_report, confusion_matrix, accuracy_score, f1_score
 from sklearn.preprocessing import LabelEncoder
+from sklearn.utils import resample
 import mlflow
 import mlflow.sklearn
 import joblib
+from scipy.stats import loguniform, randint, uniform
+from joblib import parallel_config
+# sklearn's Parallel/delayed pair carries the caller's sklearn config into the workers
+from sklearn.utils.parallel import Parallel, delayed
 import os
+import shutil
+import subprocess
+import sys
+import time
+import tempfile
+import warnings
+from math import ceil, floor, log
 from datetime import datetime
 
+sys.path.append('src')
+from data.dataset_io import read_dataset, dataset_path
+from models.export_model import export_model, COMPILED_MODEL_DIR
+
+CV_FOLDS = 5
+
+# Successive-halving search: seconds per model family and elimination factor
+SEARCH_TIME_BUDGET = 60
+SEARCH_FACTOR = 3
+SEARCH_MAX_CANDIDATES = 243
+SEARCH_PLAN_FRACTION = 0.5
+
+SEARCH_SPACES = {
+    'logistic_regression': {
+        'C': loguniform(1e-3, 1e2)
+    },
+    'random_forest': {
+        'n_estimators': randint(50, 300),
+        'max_depth': [5, 10, 20, None],
+        'min_samples_leaf': randint(1, 10),
+        'max_features': ['sqrt', 'log2', None]
+    },
+    'gradient_boosting': {
+        'n_estimators': randint(50, 300),
+        'learning_rate': loguniform(0.01, 0.3),
+        'max_depth': randint(2, 6),
+        'subsample': uniform(0.6, 0.4)
+    },
+    'xgboost': {
+        'n_estimators': randint(50, 300),
+        'learning_rate': loguniform(0.01, 0.3),
+        'max_depth': randint(3, 10),
+        'subsample': uniform(0.6, 0.4),
+        'colsample_bytree': uniform(0.5, 0.5),
+        'min_child_weight': randint(1, 10)
+    },
+    'svm': {
+        'C': loguniform(0.1, 100),
+        'gamma': loguniform(1e-4, 1)
+    }
+}
+
+def resolve_n_jobs(n_jobs):
+    # joblib's convention: -1 is every core, -2 all but one, and so on
+    # (None keeps meaning every core here)
+    if n_jobs == 0:
+        raise ValueError("n_jobs == 0 has no meaning, use 1 for sequential runs")
+    if n_jobs is None:
+        return os.cpu_count()
+    if n_jobs < 0:
+        return max(1, os.cpu_count() + 1 + n_jobs)
+    return n_jobs
+
+def set_thread_budget(model, n_threads):
+    # Models that parallelize internally (forests, XGBoost) get an explicit share
+    if 'n_jobs' in model.get_params():
+        model.set_params(n_jobs=n_threads)
+    return model
+
+def fold_estimator(model):
+    # CV fold models are only scored with predict(); SVC's Platt scaling runs its
+    # own internal 5-fold CV and does not change predict(), so it is skipped there
+    model = clone(model)
+    if model.get_params().get('probability'):
+        model.set_params(probability=False)
+    return model
+
+# Inference profile: single-row repeats, batch size and batch repeats
+PROFILE_SINGLE_REPEATS = 50
+PROFILE_BATCH_SIZE = 1000
+PROFILE_BATCH_REPEATS = 5
+
+# Loads the pickle in a fresh interpreter and scores a batch. The growth of the
+# peak RSS covers native allocations (sklearn trees, xgboost boosters) that
+# tracemalloc does not see. The model's module is imported first so its import
+# cost is not counted. The peak is VmHWM from /proc (Linux, reset by exec unlike
+# ru_maxrss): elsewhere the probe fails and the figure is NaN
+MEMORY_PROBE = """
+import importlib, sys, warnings
+import joblib
+import numpy as np
+
+def peak_mb():
+    with open('/proc/self/status') as f:
+        return next(int(line.split()[1]) for line in f if line.startswith('VmHWM:')) / 1024
+
+warnings.simplefilter('ignore')
+importlib.import_module(sys.argv[1])
+X = np.load(sys.argv[3])
+before = peak_mb()
+model = joblib.load(sys.argv[2])
+getattr(model, 'predict_proba', model.predict)(X)
+print(peak_mb() - before)
+"""
+
+# Models whose f1_score is within this distance of the best are ranked by latency
+SELECTION_TOLERANCE = 0.005
+
+def predict_scores(model, X):
+    # The API serves predict_proba (argmax gives the label), fall back to predict
+    if hasattr(model, 'predict_proba'):
+        return model.predict_proba(X)
+    return model.predict(X)
+
+def profile_inference(model, X):
+    # Serving-side cost of a fitted model: median latency for one row and for a
+    # batch, pickled size, and peak RSS added by loading it and scoring a batch.
+    # Rows are passed as a float array, the way the API feature plan builds them
+    X = np.asarray(X, dtype=float)
+    row = X[:1]
+    batch = np.resize(X, (PROFILE_BATCH_SIZE, X.shape[1]))
+    
+    with warnings.catch_warnings():
+        warnings.filterwarnings("ignore", message="X does not have valid feature names")
+        
+        for _ in range(5):
+            predict_scores(model, row)
+        
+        single = []
+        for _ in range(PROFILE_SINGLE_REPEATS):
+            start = time.perf_counter()
+            predict_scores(model, row)
+            single.append(time.perf_counter() - start)
+        
+        batched = []
+        for _ in range(PROFILE_BATCH_REPEATS):
+            start = time.perf_counter()
+            predict_scores(model, batch)
+            batched.append(time.perf_counter() - start)
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'model.pkl')
+            joblib.dump(model, path)
+            size = os.path.getsize(path)
+            
+            batch_path = os.path.join(tmp_dir, 'batch.npy')
+            np.save(batch_path, batch)
+            probe = subprocess.run(
+                [sys.executable, '-c', MEMORY_PROBE, type(model).__module__, path, batch_path],
+                capture_output=True, text=True
+            )
+            peak_rss = float(probe.stdout) if probe.returncode == 0 else float('nan')
+    
+    return {
+        'latency_single_ms': float(np.median(single)) * 1000,
+        'latency_batch_ms': float(np.median(batched)) * 1000,
+        'model_size_mb': size / 1024 ** 2,
+        'peak_rss_mb': peak_rss
+    }
+
+def halving_schedule(n_candidates, min_resources, max_resources, factor):
+    # (candidates, samples per fit) for each round. As with sklearn's 'exhaust', the
+    # first round starts as large as possible so the last one uses max_resources
+    # (exactly, so its scores compare with the defaults'); with too many
+    # candidates it eliminates aggressively at min_resources first
+    n_rounds = 1 + floor(log(n_candidates, factor))
+    min_resources = max(min_resources, max_resources // factor ** (n_rounds - 1))
+    n_possible = 1 + floor(log(max_resources // min_resources, factor))
+    
+    schedule = []
+    for itr in range(n_rounds):
+        power = max(0, itr - n_rounds + n_possible)
+        n_resources = min_resources * factor ** power
+        schedule.append((n_candidates, max_resources if itr == n_rounds - 1 else min(n_resources, max_resources)))
+        n_candidates = ceil(n_candidates / factor)
+    
+    return schedule
+
+def plan_candidates(time_budget, min_resources, max_resources, factor, n_splits, fit_seconds):
+    # Largest number of sampled candidates whose predicted search cost fits the
+    # budget (0 when not even one elimination round fits); fit_seconds(n) is the
+    # expected time of one fit on n samples
+    best = 0
+    for n_candidates in range(factor, SEARCH_MAX_CANDIDATES + 1):
+        cost = sum(
+            n * n_splits * fit_seconds(n_resources)
+            for n, n_resources in halving_schedule(n_candidates, min_resources, max_resources, factor)
+        )
+        if cost > time_budget:
+            break
+        best = n_candidates
+    return best
+
+def evaluate_candidate(estimator, params, fold_data, n_resources, deadline=None):
+    # CV accuracy of one candidate, each fold fit on a stratified subsample. The
+    # deadline (wall clock, shared with the worker processes) is checked before
+    # every fold: a trial cut short returns None and is discarded
+    start = time.perf_counter()
+    scores = []
+    for X_fit, y_fit, X_val, y_val in fold_data:
+        if deadline is not None and time.time() >= deadline:
+            return None
+        if n_resources < len(X_fit):
+            X_fit, y_fit = resample(
+                X_fit, y_fit, n_samples=n_resources, replace=False, stratify=y_fit, random_state=42
+            )
+        model = clone(estimator).set_params(**params)
+        model.fit(X_fit, y_fit)
+        scores.append(accuracy_score(y_val, model.predict(X_val)))
+    return np.array(scores), (time.perf_counter() - start) / len(fold_data)
+
+def fit_predict(model, X_fit, y_fit, X_eval):
+    model.fit(X_fit, y_fit)
+    return model, model.predict(X_eval)
+
 class RiskPredictionBenchmark:
     
     def __init__(self, experiment_name="supplier_risk_prediction"):
         self.models = {}
         self.results = {}
         self.best_model = None
+        self.cv_estimators = {}
         self.label_encoder = LabelEncoder()
         
         mlflow.set_experiment(experiment_name)
         
-    def load_data(self, data_path='data/processed/suppliers_processed.csv'):
+    def load_data(self, data_path=None, columns=None):
+        data_path = data_path or dataset_path('data/processed/suppliers_processed.csv')
         print(f"Loading data from {data_path}")
-        df = pd.read_csv(data_path)
+        df = read_dataset(data_path, columns=columns)
         
         X = df.drop('risk_level', axis=1)
         y = df['risk_level']
@@ -76,59 +296,312 @@ class RiskPredictionBenchmark:
         
         print(f"Initialized {len(self.models)} models")
     
-    def train_and_evaluate(self, X_train, X_test, y_train, y_test):
+    def prepare_folds(self, X_train, y_train):
+        # Fold indices and fold matrices are computed once and shared by every model
+        # (same splits as cross_val_score(cv=CV_FOLDS) on a classifier)
+        folds = list(StratifiedKFold(n_splits=CV_FOLDS).split(X_train, y_train))
+        X = X_train.to_numpy(dtype=float)
+        
+        fold_data = [
+            (X[train_idx], y_train[train_idx], X[val_idx], y_train[val_idx])
+            for train_idx, val_idx in folds
+        ]
+        
+        return folds, X, fold_data
+    
+    def search_hyperparameters(self, X_train, y_train, time_budget=SEARCH_TIME_BUDGET, n_jobs=-1):
+        # Successive halving per model family: many sampled candidates are scored on
+        # small subsamples and only the best 1/SEARCH_FACTOR moves on to more data
+        # each round. The best candidate scored on max_resources replaces the
+        # defaults before train_and_evaluate, and only if it beats them on the
+        # same folds
+        n_jobs = resolve_n_jobs(n_jobs)
+        _, X, fold_data = self.prepare_folds(X_train, y_train)
+        
+        # Same minimum as sklearn's 'smallest': two samples per class per split
+        min_resources = CV_FOLDS * 2 * len(np.unique(y_train))
+        max_resources = min(len(X_fit) for X_fit, _, _, _ in fold_data)
         
         for model_name, model in self.models.items():
+            if model_name not in SEARCH_SPACES:
+                continue
+            
             print(f"\n{'='*60}")
-            print(f"Training: {model_name}")
+            print(f"Searching: {model_name}")
             print(f"{'='*60}")
             
-            with mlflow.start_run(run_name=f"{model_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"):
-                
+            start = time.perf_counter()
+            deadline = time.time() + time_budget
+            
+            # Trials run in parallel, so each one is kept single-threaded
+            estimator = fold_estimator(model)
+            if n_jobs > 1:
+                set_thread_budget(estimator, 1)
+            
+            # The defaults are scored first, inside the budget: candidates must beat
+            # this score, and its fold fit time anchors the fit-time model
+            baseline = evaluate_candidate(estimator, {}, fold_data, max_resources, deadline)
+            if baseline is None:
+                print(f"Search skipped: scoring the defaults exceeds the {time_budget}s budget")
+                continue
+            
+            baseline_scores, full_seconds = baseline
+            fit_seconds = self._fit_time_model(estimator, X, y_train, min_resources, max_resources, full_seconds)
+            
+            # Sampled hyperparameters can be far slower than the defaults, so only
+            # part of the remaining budget is planned; the deadline is the hard stop
+            n_candidates = plan_candidates(
+                (deadline - time.time()) * SEARCH_PLAN_FRACTION * n_jobs,
+                min_resources, max_resources, SEARCH_FACTOR, CV_FOLDS, fit_seconds
+            )
+            
+            if n_candidates == 0:
+                print(f"Search skipped: one fit takes {fit_seconds(max_resources):.1f}s, "
+                      f"too long for a {time_budget}s budget, keeping default hyperparameters")
+                continue
+            
+            candidates = list(ParameterSampler(SEARCH_SPACES[model_name], n_candidates, random_state=42))
+            trials, completed = self._run_halving(
+                estimator, candidates, fold_data, min_resources, max_resources, deadline, n_jobs
+            )
+            elapsed = time.perf_counter() - start
+            
+            # Scores on subsamples are not comparable with the defaults' score, so
+            # only trials fit on max_resources can win
+            finalists = [trial for trial in trials if trial['n_resources'] == max_resources]
+            best = max(finalists, key=lambda trial: trial['cv_mean'], default=None)
+            replaced = best is not None and best['cv_mean'] > baseline_scores.mean()
+            
+            if not trials:
+                print("Search stopped by the time budget before any trial finished, keeping default hyperparameters")
+                continue
+            
+            with mlflow.start_run(run_name=f"{model_name}_search_{datetime.now().strftime('%Y%m%d_%H%M%S')}"):
                 mlflow.log_param("model_type", model_name)
-                mlflow.log_param("train_size", len(X_train))
-                mlflow.log_param("test_size", len(X_test))
+                mlflow.log_param("search", "successive_halving")
+                mlflow.log_param("n_candidates", n_candidates)
+                mlflow.log_param("time_budget", time_budget)
+                mlflow.log_param("completed", completed)
+                mlflow.log_param("replaced_defaults", replaced)
+                mlflow.log_metric("default_cv_score", baseline_scores.mean())
+                if best is not None:
+                    mlflow.log_params({f"best_{key}": value for key, value in candidates[best['candidate']].items()})
+                    mlflow.log_metric("best_cv_score", best['cv_mean'])
+                mlflow.log_metric("search_seconds", elapsed)
                 
-                model.fit(X_train, y_train)
-                
-                y_pred = model.predict(X_test)
-                
-                accuracy = accuracy_score(y_test, y_pred)
-                f1 = f1_score(y_test, y_pred, average='weighted')
-                
-                cv_scores = cross_val_score(model, X_train, y_train, cv=5, scoring='accuracy')
-                cv_mean = cv_scores.mean()
-                cv_std = cv_scores.std()
-                
-                mlflow.log_metric("accuracy", accuracy)
-                mlflow.log_metric("f1_score", f1)
-                mlflow.log_metric("cv_mean", cv_mean)
-                mlflow.log_metric("cv_std", cv_std)
-                
-                mlflow.sklearn.log_model(model, model_name)
+                self._record_trials(model_name, candidates, trials)
+            
+            status = "" if completed else ", stopped by the time budget"
+            print(f"Candidates: {n_candidates}, {len(trials)} trials "
+                  f"({elapsed:.1f}s, budget {time_budget}s{status})")
+            print(f"Default CV score: {baseline_scores.mean():.4f} on {max_resources} samples per fold")
+            
+            if not replaced:
+                if best is None:
+                    print("No candidate reached the full training folds, keeping default hyperparameters")
+                else:
+                    print(f"Best candidate CV score: {best['cv_mean']:.4f}, keeping default hyperparameters")
+                continue
+            
+            best_params = candidates[best['candidate']]
+            self.models[model_name] = clone(model).set_params(**best_params)
+            print(f"Best CV score: {best['cv_mean']:.4f}")
+            print(f"Best params: {best_params}")
+    
+    def _run_halving(self, estimator, candidates, fold_data, min_resources, max_resources, deadline, n_jobs):
+        # Trials are dispatched one per worker and check the deadline themselves
+        # before every fold fit, so the budget is overrun by one fit at most
+        trials = []
+        remaining = list(range(len(candidates)))
+        schedule = halving_schedule(len(candidates), min_resources, max_resources, SEARCH_FACTOR)
+        
+        for iteration, (_, n_resources) in enumerate(schedule):
+            round_trials = []
+            
+            for i in range(0, len(remaining), n_jobs):
+                if time.time() >= deadline:
+                    return trials, False
                 
-                self.results[model_name] = {
-                    'accuracy': accuracy,
-                    'f1_score': f1,
-                    'cv_mean': cv_mean,
-                    'cv_std': cv_std,
-                    'model': model
-                }
+                batch = remaining[i:i + n_jobs]
+                outputs = Parallel(n_jobs=min(n_jobs, len(batch)))(
+                    delayed(evaluate_candidate)(estimator, candidates[c], fold_data, n_resources, deadline)
+                    for c in batch
+                )
                 
-                print(f"Accuracy: {accuracy:.4f}")
-                print(f"F1 Score: {f1:.4f}")
-                print(f"CV Mean: {cv_mean:.4f} (+/- {cv_std:.4f})")
+                for c, output in zip(batch, outputs):
+                    if output is None:
+                        continue
+                    scores, fit_time = output
+                    round_trials.append({
+                        'candidate': c,
+                        'iteration': iteration,
+                        'n_resources': n_resources,
+                        'cv_mean': scores.mean(),
+                        'cv_std': scores.std(),
+                        'fit_time': fit_time
+                    })
                 
-                print("\nClassification Report:")
-                print(classification_report(
-                    y_test, y_pred, 
-                    target_names=self.label_encoder.classes_
-                ))
+                if len(round_trials) < i + len(batch):
+                    trials.extend(round_trials[i:])
+                    return trials, False
+                trials.extend(round_trials[i:])
+            
+            ranked = sorted(round_trials, key=lambda trial: trial['cv_mean'], reverse=True)
+            remaining = [trial['candidate'] for trial in ranked[:ceil(len(ranked) / SEARCH_FACTOR)]]
+        
+        return trials, True
+    
+    def _fit_time_model(self, estimator, X, y, min_resources, max_resources, full_seconds):
+        # A fit on the smallest resources and the defaults' fold fit time on
+        # max_resources give an affine fit-time model: forests and boosting have a
+        # large fixed cost per fit
+        X_small, y_small = resample(X, y, n_samples=min_resources, replace=False, stratify=y, random_state=42)
+        
+        start = time.perf_counter()
+        clone(estimator).fit(X_small, y_small)
+        small_seconds = time.perf_counter() - start
+        
+        per_sample = max(full_seconds - small_seconds, 0) / max(max_resources - min_resources, 1)
+        fixed = max(small_seconds - per_sample * min_resources, 0)
+        
+        return lambda n_samples: fixed + per_sample * n_samples
+    
+    def _record_trials(self, model_name, candidates, trials):
+        # One nested MLflow run per (candidate, round) evaluation
+        for trial in trials:
+            with mlflow.start_run(run_name=f"{model_name}_trial_{trial['candidate']}_r{trial['iteration']}", nested=True):
+                mlflow.log_params(candidates[trial['candidate']])
+                mlflow.log_param("iteration", trial['iteration'])
+                mlflow.log_param("n_resources", trial['n_resources'])
+                mlflow.log_metric("cv_mean", trial['cv_mean'])
+                mlflow.log_metric("cv_std", trial['cv_std'])
+                mlflow.log_metric("fit_time", trial['fit_time'])
+    
+    def train_and_evaluate(self, X_train, X_test, y_train, y_test, n_jobs=1):
+        if n_jobs != 1:
+            return self.train_and_evaluate_parallel(X_train, X_test, y_train, y_test, core_budget=n_jobs)
+        
+        folds, X, _ = self.prepare_folds(X_train, y_train)
+        
+        for model_name, model in self.models.items():
+            print(f"\n{'='*60}")
+            print(f"Training: {model_name}")
+            print(f"{'='*60}")
+            
+            # The full-train fit keeps the DataFrame so feature_names_in_ is set for serving
+            model.fit(X_train, y_train)
+            
+            y_pred = model.predict(X_test)
+            
+            cv_results = cross_validate(
+                fold_estimator(model), X, y_train,
+                cv=folds, scoring='accuracy', return_estimator=True
+            )
+            self.cv_estimators[model_name] = cv_results['estimator']
+            
+            self._record_run(model_name, model, X_train, X_test, y_test, y_pred, cv_results['test_score'])
     
-    def select_best_model(self):
-        best_score = 0
-        best_name = None
+    def train_and_evaluate_parallel(self, X_train, X_test, y_train, y_test, core_budget=-1):
+        # Every (model, fit) pair is an independent task: the full-train fit plus
+        # one fit per CV fold, all scheduled together on a process pool
+        core_budget = resolve_n_jobs(core_budget)
+        
+        _, _, fold_data = self.prepare_folds(X_train, y_train)
+        
+        tasks = []
+        for model_name, model in self.models.items():
+            tasks.append((model_name, None, clone(model), X_train, y_train, X_test))
+            for fold, (X_fit, y_fit, X_val, _) in enumerate(fold_data):
+                tasks.append((model_name, fold, fold_estimator(model), X_fit, y_fit, X_val))
+        
+        n_workers = max(1, min(core_budget, len(tasks)))
+        threads_per_task = max(1, core_budget // n_workers)
+        
+        print(f"\nTraining {len(self.models)} models x {CV_FOLDS + 1} fits on {n_workers} workers "
+              f"({threads_per_task} thread(s) each)")
         
+        for _, _, model, _, _, _ in tasks:
+            set_thread_budget(model, threads_per_task)
+        
+        # inner_max_num_threads caps OpenMP/BLAS threads (XGBoost, numpy) per worker
+        with parallel_config(backend='loky', inner_max_num_threads=threads_per_task):
+            outputs = Parallel(n_jobs=n_workers)(
+                delayed(fit_predict)(model, X_fit, y_fit, X_eval)
+                for _, _, model, X_fit, y_fit, X_eval in tasks
+            )
+        
+        fitted = {}
+        cv_scores = {model_name: np.zeros(CV_FOLDS) for model_name in self.models}
+        for model_name in self.models:
+            self.cv_estimators[model_name] = [None] * CV_FOLDS
+        
+        for (model_name, fold, _, _, _, _), (model, y_pred) in zip(tasks, outputs):
+            if fold is None:
+                fitted[model_name] = (model, y_pred)
+            else:
+                cv_scores[model_name][fold] = accuracy_score(fold_data[fold][3], y_pred)
+                self.cv_estimators[model_name][fold] = model
+        
+        # MLflow runs are opened here, in the parent, one per model
+        for model_name in self.models:
+            model, y_pred = fitted[model_name]
+            self.models[model_name] = model
+            
+            print(f"\n{'='*60}")
+            print(f"Results: {model_name}")
+            print(f"{'='*60}")
+            
+            self._record_run(model_name, model, X_train, X_test, y_test, y_pred, cv_scores[model_name])
+    
+    def _record_run(self, model_name, model, X_train, X_test, y_test, y_pred, cv_scores):
+        with mlflow.start_run(run_name=f"{model_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"):
+            
+            mlflow.log_param("model_type", model_name)
+            mlflow.log_param("train_size", len(X_train))
+            mlflow.log_param("test_size", len(X_test))
+            
+            accuracy = accuracy_score(y_test, y_pred)
+            f1 = f1_score(y_test, y_pred, average='weighted')
+            
+            cv_mean = cv_scores.mean()
+            cv_std = cv_scores.std()
+            
+            mlflow.log_metric("accuracy", accuracy)
+            mlflow.log_metric("f1_score", f1)
+            mlflow.log_metric("cv_mean", cv_mean)
+            mlflow.log_metric("cv_std", cv_std)
+            
+            inference = profile_inference(model, X_test)
+            mlflow.log_param("profile_batch_size", PROFILE_BATCH_SIZE)
+            mlflow.log_metrics(inference)
+            
+            mlflow.sklearn.log_model(model, model_name)
+            
+            self.results[model_name] = {
+                'accuracy': accuracy,
+                'f1_score': f1,
+                'cv_mean': cv_mean,
+                'cv_std': cv_std,
+                **inference,
+                'model': model
+            }
+            
+            print(f"Accuracy: {accuracy:.4f}")
+            print(f"F1 Score: {f1:.4f}")
+            print(f"CV Mean: {cv_mean:.4f} (+/- {cv_std:.4f})")
+            print(f"Latency: {inference['latency_single_ms']:.3f} ms/row, "
+                  f"{inference['latency_batch_ms']:.1f} ms/{PROFILE_BATCH_SIZE} rows, "
+                  f"{inference['model_size_mb']:.2f} MB on disk, {inference['peak_rss_mb']:.1f} MB peak RSS")
+            
+            print("\nClassification Report:")
+            print(classification_report(
+                y_test, y_pred, 
+                target_names=self.label_encoder.classes_
+            ))
+    
+    def select_best_model(self, tolerance=SELECTION_TOLERANCE):
+        # Best f1_score first; every model within `tolerance` of it is considered
+        # equivalent and the one with the lowest single-row latency is served
         print(f"\n{'='*60}")
         print("BENCHMARK RESULTS")
         print(f"{'='*60}")
@@ -138,21 +611,34 @@ class RiskPredictionBenchmark:
             print(f"  Accuracy: {metrics['accuracy']:.4f}")
             print(f"  F1 Score: {metrics['f1_score']:.4f}")
             print(f"  CV Mean:  {metrics['cv_mean']:.4f}")
-            
-            if metrics['f1_score'] > best_score:
-                best_score = metrics['f1_score']
-                best_name = model_name
+            print(f"  Latency:  {metrics['latency_single_ms']:.3f} ms/row, "
+                  f"{metrics['latency_batch_ms']:.1f} ms/{PROFILE_BATCH_SIZE} rows")
+            print(f"  Size:     {metrics['model_size_mb']:.2f} MB, {metrics['peak_rss_mb']:.1f} MB peak RSS")
+        
+        top_score = max(metrics['f1_score'] for metrics in self.results.values())
+        
+        contenders = [
+            model_name for model_name, metrics in self.results.items()
+            if metrics['f1_score'] >= top_score - tolerance
+        ]
+        best_name = min(
+            contenders,
+            key=lambda name: (self.results[name]['latency_single_ms'], self.results[name]['latency_batch_ms'])
+        )
+        best_score = self.results[best_name]['f1_score']
         
         self.best_model = self.results[best_name]['model']
         
         print(f"\n{'='*60}")
         print(f"BEST MODEL: {best_name}")
-        print(f"F1 Score: {best_score:.4f}")
+        print(f"F1 Score: {best_score:.4f} (best {top_score:.4f}, tolerance {tolerance})")
+        print(f"Latency: {self.results[best_name]['latency_single_ms']:.3f} ms/row "
+              f"(fastest of {', '.join(contenders)})")
         print(f"{'='*60}")
         
         return best_name, self.best_model
     
-    def save_best_model(self, model_name, output_dir='models'):
+    def save_best_model(self, model_name, output_dir='models', X_check=None):
         os.makedirs(output_dir, exist_ok=True)
         
         joblib.dump(self.best_model, f'{output_dir}/best_model.pkl')
@@ -163,6 +649,26 @@ class RiskPredictionBenchmark:
             f.write(f"Metrics: {self.results[model_name]}\n")
         
         print(f"\nBest model saved to {output_dir}/")
+        
+        # Array-based copy for the NumPy runtime in src/models/compiled_model.py,
+        # the API's default MODEL_PATH
+        compiled_dir = os.path.join(output_dir, os.path.basename(COMPILED_MODEL_DIR))
+        label_encoders_path = f'{output_dir}/label_encoders.pkl'
+        if X_check is not None and os.path.exists(label_encoders_path):
+            try:
+                export_model(
+                    self.best_model, self.label_encoder, joblib.load(label_encoders_path),
+                    getattr(self.best_model, 'feature_names_in_', X_check.columns),
+                    compiled_dir, X_check
+                )
+                return
+            except ValueError as e:
+                print(f"Compiled export skipped: {e}")
+        
+        # A previous model's export must not keep being served in place of this one
+        if os.path.isdir(compiled_dir):
+            shutil.rmtree(compiled_dir)
+            print(f"Removed stale {compiled_dir}, serve {output_dir}/best_model.pkl (MODEL_PATH)")
 
 
 def main():
@@ -174,11 +680,23 @@ def main():
     
     benchmark.initialize_models()
     
-    benchmark.train_and_evaluate(X_train, X_test, y_train, y_test)
+    # TRAIN_N_JOBS: core budget for the benchmark, 1 = sequential (default, comparable
+    # with earlier runs), -1 = all cores, -2 = all but one
+    n_jobs = int(os.environ.get('TRAIN_N_JOBS', 1))
+    
+    # TRAIN_SEARCH=halving tunes every model family before the benchmark,
+    # TRAIN_SEARCH_BUDGET is the time budget in seconds per model family
+    if os.environ.get('TRAIN_SEARCH', 'none') == 'halving':
+        time_budget = float(os.environ.get('TRAIN_SEARCH_BUDGET', SEARCH_TIME_BUDGET))
+        benchmark.search_hyperparameters(X_train, y_train, time_budget=time_budget, n_jobs=n_jobs)
+    
+    benchmark.train_and_evaluate(X_train, X_test, y_train, y_test, n_jobs=n_jobs)
     
-    best_name, best_model = benchmark.select_best_model()
+    # SELECTION_TOLERANCE: f1_score gap within which the fastest model wins
+    tolerance = float(os.environ.get('SELECTION_TOLERANCE', SELECTION_TOLERANCE))
+    best_name, best_model = benchmark.select_best_model(tolerance=tolerance)
     
-    benchmark.save_best_model(best_name)
+    benchmark.save_best_model(best_name, X_check=X_test)
     
     print("\nBenchmark completed successfully!")
 
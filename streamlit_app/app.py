@@ -4,6 +4,7 @@ sys.path.append('.')
 from streamlit_app.utils.api_client import api_client
 from streamlit_app.utils.styling import apply_custom_styling
 from streamlit_app.utils.charts import create_distribution_pie
+from streamlit_app.utils.supplier_table import render_supplier_table
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
@@ -26,7 +27,7 @@ st.markdown('<p class="subtitle">Vue d\'ensemble des risques fournisseurs en tem
 st.markdown("<br>", unsafe_allow_html=True)
 
 try:
-    stats = api_client.get_stats()
+    stats = api_client.get_risk_overview()
     
     if stats:
         total = stats.get('total_suppliers', 0)
@@ -257,6 +258,10 @@ try:
             hide_index=True
         )
         
+        st.markdown("<br>", unsafe_allow_html=True)
+        
+        render_supplier_table()
+        
     else:
         st.warning("Impossible de récupérer les statistiques. Vérifiez que l'API est démarrée.")
         
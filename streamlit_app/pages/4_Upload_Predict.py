@@ -1,7 +1,7 @@
 import streamlit as st
 import sys
 sys.path.append('.')
-from streamlit_app.utils.api_client import api_client
+from streamlit_app.utils.api_client import api_client, BATCH_CHUNK_SIZE
 import pandas as pd
 import io
 from datetime import datetime
@@ -114,31 +114,42 @@ with tab1:
                     "Nombre de prédictions à effectuer",
                     min_value=1,
                     max_value=len(df_upload),
-                    value=min(10, len(df_upload)),
-                    help="Pour des raisons de performance, limitez à 50 max"
+                    value=len(df_upload),
+                    help="Les prédictions sont envoyées par lots à l'API, en parallèle"
                 )
             
             with col2:
                 st.metric("Total Fournisseurs", len(df_upload))
             
             with col3:
-                st.metric("Temps Estimé", f"{batch_size * 2}s")
+                st.metric("Lots API", -(-batch_size // BATCH_CHUNK_SIZE))
             
             if st.button(" Lancer les Prédictions", type="primary", use_container_width=True):
                 
                 progress_bar = st.progress(0)
                 status_text = st.empty()
                 
+                def update_progress(done, total):
+                    status_text.text(f"Analyse des fournisseurs {done}/{total}...")
+                    progress_bar.progress(done / total)
+                
+                id_cols = ['supplier_id'] if 'supplier_id' in df_upload.columns else []
+                suppliers_data = df_upload.head(batch_size)[id_cols + required_cols].to_dict(orient='records')
+                
+                # Les identifiants manquants ne sont pas envoyés : l'API en dérive un du contenu
+                for supplier in suppliers_data:
+                    supplier_id = supplier.pop('supplier_id', None)
+                    if pd.notna(supplier_id):
+                        # Colonne numérique avec des vides : 12.0 redevient 12
+                        if isinstance(supplier_id, float) and supplier_id.is_integer():
+                            supplier_id = int(supplier_id)
+                        supplier['supplier_id'] = str(supplier_id)
+                
+                batch = api_client.batch_predict(suppliers_data, progress_callback=update_progress)
+                
                 results = []
                 
-                for idx, row in df_upload.head(batch_size).iterrows():
-                    status_text.text(f"Analyse du fournisseur {idx + 1}/{batch_size}...")
-                    progress_bar.progress((idx + 1) / batch_size)
-                    
-                    supplier_data = row.to_dict()
-                    
-                    result = api_client.predict_supplier(supplier_data)
-                    
+                for idx, result in enumerate(batch['results']):
                     if result:
                         results.append({
                             'Index': idx + 1,
@@ -158,6 +169,17 @@ with tab1:
                 if results:
                     st.success(f" {len(results)} prédictions effectuées avec succès !")
                     
+                    if batch['errors']:
+                        st.warning(f" {batch['failed']} fournisseur(s) n'ont pas pu être analysés")
+                        with st.expander("Détail des erreurs"):
+                            st.dataframe(
+                                pd.DataFrame([
+                                    {'Index': error['index'] + 1, 'Erreur': error['error']}
+                                    for error in batch['errors']
+                                ]),
+                                use_container_width=True
+                            )
+                    
                     st.markdown("---")
                     
                     results_df = pd.DataFrame(results)
@@ -1,24 +1,51 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import pandas as pd
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional
 
 API_URL = "http://localhost:8000"
 
+BATCH_CHUNK_SIZE = 500
+BATCH_MAX_CONCURRENCY = 4
+BATCH_MAX_RETRIES = 3
+BATCH_BACKOFF_FACTOR = 0.5
+BATCH_TIMEOUT = 60
+
 class APIClient:
     
-    def __init__(self):
+    def __init__(self, max_concurrency: int = BATCH_MAX_CONCURRENCY, max_retries: int = BATCH_MAX_RETRIES):
         self.base_url = API_URL
+        self.max_concurrency = max_concurrency
+        self.session = self._create_session(max_concurrency, max_retries)
+    
+    def _create_session(self, pool_size: int, max_retries: int) -> requests.Session:
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=BATCH_BACKOFF_FACTOR,
+            status_forcelist=[429, 502, 503, 504],
+            allowed_methods=["GET", "POST"],
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+        
+        session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
     
     def check_health(self) -> Dict:
         try:
-            response = requests.get(f"{self.base_url}/api/v1/health", timeout=2)
+            response = self.session.get(f"{self.base_url}/api/v1/health", timeout=2)
             return response.json() if response.status_code == 200 else {"status": "error"}
         except:
             return {"status": "offline"}
     
     def predict_supplier(self, supplier_data: Dict) -> Optional[Dict]:
         try:
-            response = requests.post(
+            response = self.session.post(
                 f"{self.base_url}/api/v1/predict",
                 json=supplier_data,
                 timeout=10
@@ -30,18 +57,119 @@ class APIClient:
     
     def get_stats(self) -> Optional[Dict]:
         try:
-            response = requests.get(f"{self.base_url}/api/v1/stats", timeout=5)
+            response = self.session.get(f"{self.base_url}/api/v1/stats", timeout=5)
+            return response.json() if response.status_code == 200 else None
+        except:
+            return None
+    
+    def get_aggregates(self, group_by: List[str], **filters) -> Optional[Dict]:
+        # Counts computed by the API: a few hundred bytes whatever the number of suppliers
+        params = {'group_by': group_by, **{k: v for k, v in filters.items() if v is not None and v != []}}
+        try:
+            response = self.session.get(f"{self.base_url}/api/v1/aggregates", params=params, timeout=10)
+            return response.json() if response.status_code == 200 else None
+        except:
+            return None
+    
+    def list_suppliers(
+        self,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        sort: str = "supplier_id",
+        order: str = "asc",
+        **filters
+    ) -> Optional[Dict]:
+        # One page; pass the returned next_cursor (same sort and filters) for the next one
+        params = {'limit': limit, 'cursor': cursor, 'sort': sort, 'order': order}
+        params.update({k: v for k, v in filters.items() if v is not None and v != []})
+        try:
+            response = self.session.get(f"{self.base_url}/api/v1/suppliers", params=params, timeout=10)
             return response.json() if response.status_code == 200 else None
         except:
             return None
     
-    def batch_predict(self, suppliers_data: List[Dict]) -> List[Dict]:
-        results = []
-        for supplier in suppliers_data:
-            result = self.predict_supplier(supplier)
-            if result:
-                results.append(result)
-        return results
+    def get_risk_overview(self) -> Optional[Dict]:
+        # Risk distribution from the supplier store, or from /stats when the store is empty or disabled
+        aggregates = self.get_aggregates(['risk_level'])
+        if not aggregates or not aggregates['total']:
+            return self.get_stats()
+        
+        return {
+            'total_suppliers': aggregates['total'],
+            'risk_distribution': {
+                group['key']['risk_level']: group['count']
+                for group in aggregates['groups'] if group['key']['risk_level']
+            }
+        }
+    
+    def batch_predict(
+        self,
+        suppliers_data: List[Dict],
+        chunk_size: int = BATCH_CHUNK_SIZE,
+        max_concurrency: Optional[int] = None,
+        progress_callback: Optional[Callable[[int, int], None]] = None
+    ) -> Dict:
+        max_concurrency = min(max_concurrency or self.max_concurrency, self.max_concurrency)
+        total = len(suppliers_data)
+        
+        results: List[Optional[Dict]] = [None] * total
+        errors: List[Dict] = []
+        done = 0
+        
+        chunks = [(start, suppliers_data[start:start + chunk_size]) for start in range(0, total, chunk_size)]
+        
+        with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+            futures = {
+                executor.submit(self._predict_chunk, chunk): (start, chunk)
+                for start, chunk in chunks
+            }
+            
+            for future in as_completed(futures):
+                start, chunk = futures[future]
+                predictions, chunk_errors = future.result()
+                
+                results[start:start + len(chunk)] = predictions
+                errors.extend({**error, 'index': start + error['index']} for error in chunk_errors)
+                
+                done += len(chunk)
+                if progress_callback:
+                    progress_callback(done, total)
+        
+        errors.sort(key=lambda error: error['index'])
+        
+        return {
+            'results': results,
+            'errors': errors,
+            'total': total,
+            'succeeded': total - len(errors),
+            'failed': len(errors)
+        }
+    
+    def _predict_chunk(self, chunk: List[Dict]):
+        try:
+            response = self.session.post(
+                f"{self.base_url}/api/v1/predict/batch",
+                json={"suppliers": chunk},
+                timeout=BATCH_TIMEOUT
+            )
+        except Exception as e:
+            return [None] * len(chunk), [{'index': i, 'error': str(e)} for i in range(len(chunk))]
+        
+        if response.status_code == 200:
+            return response.json()['predictions'], []
+        
+        # Rejected chunk (e.g. one invalid row): bisect it to isolate the bad rows
+        if 400 <= response.status_code < 500 and response.status_code != 429 and len(chunk) > 1:
+            middle = len(chunk) // 2
+            left_predictions, left_errors = self._predict_chunk(chunk[:middle])
+            right_predictions, right_errors = self._predict_chunk(chunk[middle:])
+            return (
+                left_predictions + right_predictions,
+                left_errors + [{**error, 'index': middle + error['index']} for error in right_errors]
+            )
+        
+        error = f"HTTP {response.status_code}: {response.text[:200]}"
+        return [None] * len(chunk), [{'index': i, 'error': error} for i in range(len(chunk))]
 
 # Instance globale
 api_client = APIClient()
\ No newline at end of file
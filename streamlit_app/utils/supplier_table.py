@@ -0,0 +1,91 @@
+import streamlit as st
+import pandas as pd
+from streamlit_app.utils.api_client import api_client
+
+def render_supplier_table():
+    """Liste des fournisseurs : filtres, tri et pagination faits par l'API"""
+    st.markdown("""
+        <div class="chart-container">
+            <h3 style='margin-top: 0; color: #1f2937;'>Fournisseurs</h3>
+        </div>
+    """, unsafe_allow_html=True)
+    
+    countries = api_client.get_aggregates(['country']) or {'groups': []}
+    families = api_client.get_aggregates(['family']) or {'groups': []}
+    
+    col_f1, col_f2, col_f3, col_f4, col_f5 = st.columns(5)
+    
+    with col_f1:
+        filter_country = st.multiselect("Pays", sorted(g['key']['country'] for g in countries['groups'] if g['key']['country']))
+    with col_f2:
+        filter_sector = st.multiselect("Secteur", ["automotive", "aeronautic"])
+    with col_f3:
+        filter_family = st.multiselect("Famille", sorted(g['key']['family'] for g in families['groups'] if g['key']['family']))
+    with col_f4:
+        filter_risk = st.multiselect("Niveau de risque", ["low", "medium", "high", "critical"])
+    with col_f5:
+        score_range = st.slider("Score (confiance × 10)", 0.0, 10.0, (0.0, 10.0), 0.1)
+    
+    # risk_score vaut confiance × 10 : il classe les fournisseurs comme la
+    # confiance du niveau prédit, pas selon leur risque
+    sort_labels = {
+        'confidence': "Confiance du niveau prédit",
+        'supplier_id': "Identifiant",
+        'scored_at': "Date du score"
+    }
+    
+    col_s1, col_s2, col_s3 = st.columns([2, 1, 1])
+    
+    with col_s1:
+        sort = st.selectbox("Trier par", list(sort_labels), format_func=sort_labels.get)
+    with col_s2:
+        order = st.radio("Ordre", ["desc", "asc"], horizontal=True)
+    with col_s3:
+        page_size = st.selectbox("Lignes par page", [25, 50, 100], index=1)
+    
+    filters = {
+        'country': filter_country,
+        'sector': filter_sector,
+        'family': filter_family,
+        'risk_level': filter_risk,
+        # Bornes par défaut : pas de filtre (les fournisseurs non scorés restent visibles)
+        'min_score': score_range[0] if score_range[0] > 0 else None,
+        'max_score': score_range[1] if score_range[1] < 10 else None
+    }
+    
+    # Nouvelle requête : retour à la première page
+    query = repr((sort, order, page_size, filters))
+    if st.session_state.get('supplier_query') != query:
+        st.session_state.supplier_query = query
+        st.session_state.supplier_cursors = [None]
+    cursors = st.session_state.supplier_cursors
+    
+    page = api_client.list_suppliers(limit=page_size, cursor=cursors[-1], sort=sort, order=order, **filters)
+    
+    if page is None:
+        st.info("Liste indisponible : le store fournisseurs n'est pas activé sur l'API.")
+    else:
+        df_suppliers = pd.DataFrame(page['suppliers'])
+        
+        if df_suppliers.empty:
+            st.info("Aucun fournisseur ne correspond aux filtres.")
+        else:
+            st.dataframe(
+                df_suppliers[['supplier_id', 'supplier_name', 'country', 'sector', 'family',
+                              'risk_level', 'risk_score', 'confidence', 'scored_at']],
+                use_container_width=True,
+                hide_index=True
+            )
+        
+        col_p1, col_p2, col_p3 = st.columns([1, 2, 1])
+        
+        with col_p1:
+            if st.button("← Page précédente", disabled=len(cursors) == 1, use_container_width=True):
+                cursors.pop()
+                st.rerun()
+        with col_p2:
+            st.markdown(f"<div style='text-align: center;'>Page {len(cursors)}</div>", unsafe_allow_html=True)
+        with col_p3:
+            if st.button("Page suivante →", disabled=page['next_cursor'] is None, use_container_width=True):
+                cursors.append(page['next_cursor'])
+                st.rerun()
@@ -0,0 +1,100 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from features.feature_engineering import FeatureEngineer
+from features.feature_plan import FeaturePlan, VECTOR_MIN_ROWS
+
+
+def supplier_frame():
+    # Small frame covering the branches of create_features: young/established
+    # companies, revenue under the 0.1 floor, defect rates clipped at 0 and 100,
+    # every certification combination and both sectors
+    return pd.DataFrame({
+        'supplier_id': ['S1', 'S2', 'S3', 'S4', 'S5', 'S6'],
+        'supplier_name': ['A', 'B', 'C', 'D', 'E', 'F'],
+        'country': ['Maroc', 'France', 'Chine', 'Maroc', 'Allemagne', 'France'],
+        'region': ['EMEA', 'EMEA', 'APAC', 'EMEA', 'EMEA', 'EMEA'],
+        'sector': ['automotive', 'aeronautic', 'automotive', 'aeronautic', 'automotive', 'aeronautic'],
+        'family': ['Câblage', 'Usinage', 'Injection', 'Composite', 'Filtration', 'Électronique'],
+        'years_in_business': [0, 4, 5, 10, 25, 15],
+        'revenue_millions': [0.05, 3.2, 25.5, 150.0, 980.0, 12.0],
+        'profit_margin': [-4.0, 2.5, 8.5, 12.0, 18.0, 0.0],
+        'debt_ratio': [0.95, 0.6, 0.45, 0.3, 0.1, 0.0],
+        'liquidity_ratio': [0.4, 1.1, 1.8, 2.5, 3.0, 1.0],
+        'financial_health_score': [1.5, 4.0, 7.2, 8.0, 9.5, 6.0],
+        'on_time_delivery_rate': [55.0, 80.0, 92.5, 97.0, 100.0, 70.0],
+        'quality_defect_rate': [12.0, 5.0, 1.5, 0.3, 0.0, 10.0],
+        'lead_time_days': [90, 45, 25, 12, 1, 60],
+        'capacity_utilization': [98.0, 85.0, 78.5, 60.0, 40.0, 70.0],
+        'geopolitical_risk': [8.5, 5.0, 3.5, 2.0, 1.0, 6.0],
+        'supply_chain_disruption_history': [5, 2, 1, 0, 0, 3],
+        'cybersecurity_incidents': [3, 1, 0, 0, 0, 2],
+        'labor_disputes': [2, 0, 0, 1, 0, 1],
+        'environmental_score': [2.0, 5.5, 7.8, 8.5, 9.9, 4.0],
+        'certification_iso': ['no', 'yes', 'yes', 'yes', 'yes', 'no'],
+        'iatf_16949': ['no', 'no', 'yes', 'no', 'yes', 'no'],
+        'as9100': ['no', 'yes', 'no', 'yes', 'yes', 'no'],
+        'reach_compliance': ['no', 'yes', 'yes', 'no', 'yes', 'yes'],
+        'risk_level': ['critical', 'high', 'medium', 'low', 'low', 'high'],
+    })
+
+
+def pandas_features(feature_engineer, df):
+    df = feature_engineer.create_features(df)
+    df = feature_engineer.encode_categorical(df)
+    X, _ = feature_engineer.prepare_for_ml(df)
+    return X
+
+
+@pytest.fixture
+def fitted():
+    df = supplier_frame()
+    feature_engineer = FeatureEngineer()
+    # Fits the label encoders on the frame's categories
+    expected = pandas_features(feature_engineer, df)
+    records = df.drop(columns='risk_level').to_dict(orient='records')
+    plan = FeaturePlan.from_feature_engineer(feature_engineer, records[0])
+    return feature_engineer, plan, records, expected
+
+
+def test_plan_follows_pandas_column_order(fitted):
+    _, plan, _, expected = fitted
+    assert plan.feature_columns == list(expected.columns)
+
+
+def test_transform_matches_create_features(fitted):
+    _, plan, records, expected = fitted
+    for record, row in zip(records, expected.to_numpy(dtype=float)):
+        np.testing.assert_allclose(plan.transform(record)[0], row)
+
+
+def test_transform_many_matches_create_features(fitted):
+    _, plan, records, expected = fitted
+    np.testing.assert_allclose(plan.transform_many(records), expected.to_numpy(dtype=float))
+    
+    # Large enough for the column-wise batch path
+    many = records * 4
+    assert len(many) >= VECTOR_MIN_ROWS
+    np.testing.assert_allclose(plan.transform_many(many), np.tile(expected.to_numpy(dtype=float), (4, 1)))
+
+
+def test_training_column_order_is_followed(fitted):
+    feature_engineer, _, records, expected = fitted
+    columns = list(reversed(expected.columns))
+    plan = FeaturePlan.from_feature_engineer(feature_engineer, records[0], columns)
+    np.testing.assert_allclose(plan.transform_many(records * 4), np.tile(expected[columns].to_numpy(dtype=float), (4, 1)))
+
+
+def test_unknown_category_is_rejected_by_both_paths(fitted):
+    feature_engineer, plan, records, _ = fitted
+    record = dict(records[0], country='Atlantide')
+    
+    with pytest.raises(ValueError):
+        pandas_features(feature_engineer, pd.DataFrame([record]))
+    with pytest.raises(ValueError):
+        plan.transform(record)
+    with pytest.raises(ValueError):
+        plan.transform_many([records[1], record])
+    with pytest.raises(ValueError):
+        plan.transform_many(records * 4 + [record])
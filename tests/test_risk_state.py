@@ -0,0 +1,81 @@
+import math
+from datetime import datetime, timedelta
+
+import pytest
+
+from api.services.risk_state import SupplierRiskState, ROLLING_MIN_EVENTS
+from features.rolling_features import defect_rate_from_ppm
+
+# quality_defect_rate range of each tier in src/data/generate_data.py, low to critical
+TIER_DEFECT_RATES = [(0.1, 1.5), (1, 3), (2, 5), (4, 10)]
+TIER_PPM_MEANS = [5, 6, 7, 8]
+
+START = datetime(2026, 1, 5)
+
+
+def deliveries(supplier_id, n, delay_days=0.0, quantity=1000, defective_units=0):
+    return [
+        {
+            'supplier_id': supplier_id,
+            'event_type': 'delivery',
+            'timestamp': START + timedelta(days=i),
+            'delay_days': delay_days,
+            'quantity': quantity,
+            'defective_units': defective_units
+        }
+        for i in range(n)
+    ]
+
+
+def scoring_input(state, supplier_id):
+    inputs, _ = state.scoring_inputs([supplier_id])
+    return inputs[0]
+
+
+def test_single_late_delivery_keeps_the_profile_rates():
+    state = SupplierRiskState()
+    state.apply(deliveries('S1', 1, delay_days=4, defective_units=50))
+    
+    supplier_data = scoring_input(state, 'S1')
+    profile = state.profile_rows(['S1'])[0]
+    
+    assert supplier_data['on_time_delivery_rate'] == profile['on_time_delivery_rate']
+    assert supplier_data['quality_defect_rate'] == profile['quality_defect_rate']
+    assert 'otd_3m' not in supplier_data
+
+
+def test_rolling_window_replaces_the_profile_once_full():
+    state = SupplierRiskState()
+    state.apply(deliveries('S1', ROLLING_MIN_EVENTS - 1, delay_days=3))
+    assert 'otd_3m' not in scoring_input(state, 'S1')
+    
+    state.apply(deliveries('S1', 1, delay_days=0))
+    supplier_data = scoring_input(state, 'S1')
+    
+    assert supplier_data['otd_3m'] == pytest.approx(100.0 / ROLLING_MIN_EVENTS)
+    assert supplier_data['on_time_delivery_rate'] == supplier_data['otd_3m']
+
+
+def test_window_ppm_is_mapped_onto_the_defect_rate_scale():
+    state = SupplierRiskState()
+    # 3000 ppm, about the critical tier's mean
+    state.apply(deliveries('S1', ROLLING_MIN_EVENTS, quantity=1000, defective_units=3))
+    supplier_data = scoring_input(state, 'S1')
+    
+    assert supplier_data['ppm_3m'] == pytest.approx(3000)
+    assert supplier_data['quality_defect_rate'] == pytest.approx(defect_rate_from_ppm(3000))
+    assert 4 <= supplier_data['quality_defect_rate'] <= 10
+    assert supplier_data['defect_rate_3m'] == supplier_data['quality_defect_rate']
+
+
+@pytest.mark.parametrize("tier", range(4))
+def test_tier_mean_ppm_maps_into_the_tier_defect_range(tier):
+    low, high = TIER_DEFECT_RATES[tier]
+    assert low <= defect_rate_from_ppm(math.exp(TIER_PPM_MEANS[tier])) <= high
+
+
+def test_ppm_mapping_is_monotonic_and_clamped():
+    rates = [defect_rate_from_ppm(ppm) for ppm in [0, 10, 100, 300, 1000, 3000, 10_000, 1e6]]
+    assert rates == sorted(rates)
+    assert rates[0] == pytest.approx(0.1)
+    assert rates[-1] == pytest.approx(10.0)